@@ -0,0 +1,291 @@
+import sys
+
+import numpy as np
+
+from .engines import count_live_neighbors
+from .enginemanager import register_engine
+from .rulesmanager import rule_table
+
+DEFAULT_TILE_SIZE = 32
+
+# Above this fraction of tiles to recompute, one full sweep is cheaper
+DEFAULT_DENSE_FRACTION = 0.5
+
+# More in-place edits than this between two steps mark the whole board
+MAX_TRACKED_EDITS = 64
+
+def _dilate(mask):
+    """
+    Grows a boolean tile mask by one tile in all eight directions.
+    """
+    grown = mask.copy()
+    grown[1:, :] |= mask[:-1, :]
+    grown[:-1, :] |= mask[1:, :]
+    vertical = grown.copy()
+    grown[:, 1:] |= vertical[:, :-1]
+    grown[:, :-1] |= vertical[:, 1:]
+    return grown
+
+def _runs(flags):
+    """
+    (start, stop) pairs of consecutive True entries in a 1-D boolean array.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], flags.astype(np.int8), [0]))))
+    return zip(edges[::2], edges[1::2])
+
+def _unshared_refcount():
+    """
+    sys.getrefcount() of an object held by nothing but one local variable.
+    """
+    board = object()
+    return sys.getrefcount(board)
+
+UNSHARED_REFCOUNT = _unshared_refcount()
+
+# numpy functions that write into their first argument
+_WRITING_FUNCTIONS = {np.copyto, np.put, np.place, np.putmask, np.fill_diagonal}
+
+def _plain(array):
+    return array.view(np.ndarray) if isinstance(array, _Board) else array
+
+class _Board(np.ndarray):
+    """
+    A board returned by the active engine. Writes through indexing,
+    in-place arithmetic, fill/put or functions such as np.copyto are
+    recorded on the board that owns the memory, so the engine sees where a
+    board it returned was edited without comparing the whole board.
+    """
+    def __array_finalize__(self, obj):
+        self.edits = []
+
+    def _mark(self, key=Ellipsis):
+        owner = self
+        while isinstance(owner.base, _Board):
+            owner = owner.base
+        if owner is not self:
+            # An index into a view does not index the owning board
+            key = Ellipsis
+        if key is Ellipsis or len(owner.edits) >= MAX_TRACKED_EDITS:
+            owner.edits[:] = [Ellipsis]
+        elif not (owner.edits and owner.edits[0] is Ellipsis):
+            owner.edits.append(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._mark(key)
+
+    def fill(self, value):
+        super().fill(value)
+        self._mark()
+
+    def put(self, *args, **kwargs):
+        super().put(*args, **kwargs)
+        self._mark()
+
+    def __array_ufunc__(self, ufunc, method, *inputs, out=None, **kwargs):
+        if out is not None:
+            kwargs['out'] = tuple(_plain(array) for array in out)
+        result = getattr(ufunc, method)(*(_plain(array) for array in inputs), **kwargs)
+        written = (out or ()) + (inputs[:1] if method == 'at' else ())
+        for array in written:
+            if isinstance(array, _Board):
+                array._mark()
+        if out is not None:
+            return out[0] if len(out) == 1 else out
+        return result
+
+    def __array_function__(self, func, types, args, kwargs):
+        result = super().__array_function__(func, types, args, kwargs)
+        if func in _WRITING_FUNCTIONS and isinstance(args[0], _Board):
+            args[0]._mark()
+        return result
+
+@register_engine('active')
+class ActiveRegionEngine:
+    """
+    Change-tracking engine: the board is split into tiles, and a step only
+    recomputes the tiles that changed in the previous step plus their
+    neighbours. Stable tiles are skipped entirely, so the time per generation
+    follows the activity instead of the board area.
+
+    A skipped tile did not change in the last step, so the board of the
+    generation before holds the right cells for it: each step writes into
+    that older board when nothing but the engine still references it, and
+    into a fresh copy otherwise. Returned boards are therefore never
+    overwritten while the caller keeps them. When most tiles are active, a
+    plain full sweep is used instead.
+
+    Boards returned by advance() record their in-place edits, so passing
+    the last result back costs nothing to check and only the edited tiles
+    become active. Any other board starts tracking with a full sweep.
+    """
+    def __init__(self, game, tile_size=DEFAULT_TILE_SIZE, dense_fraction=DEFAULT_DENSE_FRACTION):
+        self.game = game
+        self.tile_size = tile_size
+        self.dense_fraction = dense_fraction
+        self.active = None
+        self._result = None
+        self._older = None
+        self._restored = None
+        self._table_key = None
+        self._table = None
+        self.full_sweeps = 0
+        self.tiles_computed = 0
+
+    def _tile_shape(self, grid):
+        t = self.tile_size
+        return (-(-grid.shape[0] // t), -(-grid.shape[1] // t))
+
+    def _tiles_of(self, cells):
+        """
+        Per-tile "is any cell set" of a boolean board.
+        """
+        t = self.tile_size
+        rows, cols = cells.shape
+        tile_rows, tile_cols = self._tile_shape(cells)
+        padded = np.zeros((tile_rows * t, tile_cols * t), dtype=bool)
+        padded[:rows, :cols] = cells
+        return padded.reshape(tile_rows, t, tile_cols, t).any(axis=(1, 3))
+
+    def _changed_tiles(self, before, after):
+        """
+        Per-tile "did anything change" from one diff of the whole board.
+        """
+        return self._tiles_of(before != after)
+
+    def _full_sweep(self, current, out, table):
+        np.take(table, current * 9 + count_live_neighbors(current), out=out)
+        self.full_sweeps += 1
+        self.tiles_computed += self.active.size
+        self.active = self._changed_tiles(current, out)
+
+    def _sparse_sweep(self, current, out, table, todo):
+        t = self.tile_size
+        rows, cols = current.shape
+        changed = np.zeros_like(todo)
+
+        for tile_row in np.flatnonzero(todo.any(axis=1)):
+            r0 = tile_row * t
+            r1 = min(r0 + t, rows)
+            for first, last in _runs(todo[tile_row]):
+                c0 = first * t
+                c1 = min(last * t, cols)
+
+                # Window with a one-cell halo; beyond the board is dead
+                h0, h1 = max(r0 - 1, 0), min(r1 + 1, rows)
+                w0, w1 = max(c0 - 1, 0), min(c1 + 1, cols)
+                counts = count_live_neighbors(current[h0:h1, w0:w1])
+                counts = counts[r0 - h0:r0 - h0 + (r1 - r0), c0 - w0:c0 - w0 + (c1 - c0)]
+
+                old = current[r0:r1, c0:c1]
+                new = table[old * 9 + counts]
+                out[r0:r1, c0:c1] = new
+
+                # Which tiles of this run changed
+                column_changed = (new != old).any(axis=0)
+                starts = np.arange(0, c1 - c0, t)
+                changed[tile_row, first:last] = np.logical_or.reduceat(column_changed, starts)
+                self.tiles_computed += last - first
+
+        self.active = changed
+
+    def step(self, current, out, table):
+        """
+        Writes the next generation of `current` into `out`.
+        """
+        if self.active is None:
+            self.active = np.ones(self._tile_shape(current), dtype=bool)
+            self._full_sweep(current, out, table)
+            return
+
+        todo = _dilate(self.active)
+        if todo.mean() > self.dense_fraction:
+            self._full_sweep(current, out, table)
+        else:
+            self._sparse_sweep(current, out, table, todo)
+
+    def reset(self):
+        """
+        Forgets the tracked activity; the next step is a full sweep.
+        """
+        self.active = None
+        self._result = None
+        self._older = None
+        self._restored = None
+
+    def checkpoint_state(self):
+        """
+        The active-tile mask, so a resumed run continues tracking (None before the first step).
+        """
+        return self.active
+
+    def restore_state(self, grid, active):
+        """
+        Continues tracking on `grid` with a mask from checkpoint_state(). The
+        grid was not returned by this engine, so a copy is kept to find edits
+        made to it before the next step.
+        """
+        if active.shape != self._tile_shape(grid):
+            self.reset()
+            return
+        self.reset()
+        self.active = active
+        self._result = grid
+        self._restored = grid.copy()
+
+    def _rule_table(self, dtype):
+        """
+        The lookup table of the current rule in `dtype`, cast once per rule.
+        """
+        key = (self.game.current_rule_set, dtype)
+        if key != self._table_key:
+            self._table = rule_table(self.game.current_rule_set).astype(dtype).ravel()
+            self._table_key = key
+        return self._table
+
+    def _take_edits(self, grid):
+        """
+        Marks the tiles edited in place since `grid` was returned as active.
+        """
+        if grid is not self._result:
+            # A board the engine did not hand out: start from scratch
+            self.reset()
+        elif self._restored is not None:
+            self.active |= self._changed_tiles(self._restored, grid)
+        elif grid.edits:
+            touched = np.zeros(grid.shape, dtype=bool)
+            for key in grid.edits:
+                touched[key] = True
+            self.active |= self._tiles_of(touched)
+        self._restored = None
+        if isinstance(grid, _Board):
+            grid.edits.clear()
+
+    def _output_for(self, current):
+        """
+        A board to write the generation after `current` into: the board of
+        the generation before when only the engine still references it,
+        otherwise a new one (a copy of `current` unless a full sweep follows).
+        """
+        older, self._older = self._older, None
+        if (isinstance(older, _Board) and not older.edits and older.shape == current.shape
+                and older.dtype == current.dtype and sys.getrefcount(older) <= UNSHARED_REFCOUNT):
+            return older
+        board = _Board(current.shape, dtype=current.dtype)
+        if self.active is not None:
+            np.copyto(board.view(np.ndarray), current)
+        return board
+
+    def advance(self, grid, generations):
+        table = self._rule_table(grid.dtype)
+        self._take_edits(grid)
+
+        current = grid
+        for _ in range(generations):
+            out = self._output_for(current)
+            self.step(current.view(np.ndarray), out.view(np.ndarray), table)
+            self._older, current = current, out
+
+        # Plain arrays cannot report edits, so they are not remembered
+        self._result = current if isinstance(current, _Board) else None
+        return current
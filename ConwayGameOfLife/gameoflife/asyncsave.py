@@ -0,0 +1,179 @@
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from .save import format_grid_text
+
+DEFAULT_MAX_PENDING = 8
+DEFAULT_FILENAME = "grid_state_gen{generation}.{extension}"
+
+PACKED_MAGIC = b'GOLPACK1'
+PACKED_HEADER = struct.Struct('<8sQQ')
+
+# --------------------------------------------------------------
+# Encoders
+# --------------------------------------------------------------
+def encode_text(grid):
+    """
+    Same text as save_grid_to_file: '1' for live and '0' for dead cells.
+    """
+    return format_grid_text(grid).encode('ascii')
+
+def encode_packed(grid):
+    """
+    Header (magic, rows, cols) followed by the cells packed 8 per byte, row-major.
+    """
+    rows, cols = grid.shape
+    return PACKED_HEADER.pack(PACKED_MAGIC, rows, cols) + np.packbits(grid != 0, bitorder='little').tobytes()
+
+def decode_packed(data):
+    magic, rows, cols = PACKED_HEADER.unpack_from(data, 0)
+    if magic != PACKED_MAGIC:
+        raise ValueError("Not a packed Game of Life grid.")
+    cells = np.unpackbits(np.frombuffer(data, dtype=np.uint8, offset=PACKED_HEADER.size),
+                          count=rows * cols, bitorder='little')
+    return cells.reshape(rows, cols)
+
+def _png_chunk(tag, data):
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+def encode_png(grid):
+    """
+    1-bit greyscale PNG with one pixel per cell: live cells black, dead cells white.
+    """
+    rows, cols = grid.shape
+    # Each scanline is a filter byte (0, none) followed by the packed pixels
+    scanlines = np.zeros((rows, 1 + (cols + 7) // 8), dtype=np.uint8)
+    scanlines[:, 1:] = np.packbits(grid == 0, axis=1)
+    return (b'\x89PNG\r\n\x1a\n'
+            + _png_chunk(b'IHDR', struct.pack('>IIBBBBB', cols, rows, 1, 0, 0, 0, 0))
+            + _png_chunk(b'IDAT', zlib.compress(scanlines.tobytes(), 6))
+            + _png_chunk(b'IEND', b''))
+
+# Encoding name -> (encoder, file extension)
+ENCODERS = {
+    'text': (encode_text, 'txt'),
+    'packed': (encode_packed, 'golgrid'),
+    'png': (encode_png, 'png'),
+}
+
+# --------------------------------------------------------------
+# Background writer
+# --------------------------------------------------------------
+class SnapshotWriteError(Exception):
+    """
+    A background write failed; the original exception is the __cause__.
+    """
+
+class AsyncSnapshotWriter:
+    """
+    Encodes and writes grids on a background thread while the simulation goes on.
+
+    submit() copies the grid into a read-only snapshot and puts it on a
+    queue of at most `max_pending` snapshots; when the disk falls behind,
+    submit() blocks until there is room again (the time spent waiting is
+    added to `stalled_seconds`). Each snapshot is written to
+    `directory`/`filename`, formatted with its generation and the
+    encoding's file extension.
+
+    The first failed write stops all further writes, and the error is
+    raised as SnapshotWriteError from the next submit(), flush() or close().
+    close() writes everything still queued before returning. An instance is
+    also a pipeline stage: stage(generation, board) submits the board.
+    """
+    def __init__(self, directory='.', encoding='text', filename=DEFAULT_FILENAME, max_pending=DEFAULT_MAX_PENDING):
+        if encoding not in ENCODERS:
+            raise ValueError(f"Unknown encoding: {encoding}. Available encodings: {list(ENCODERS)}")
+        if max_pending < 1:
+            raise ValueError("max_pending must be a positive integer.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.encoding = encoding
+        self.filename = filename
+        self.written = 0
+        self.stalled_seconds = 0.0
+        self._encode, self._extension = ENCODERS[encoding]
+        self._queue = queue.Queue(max_pending)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def path_for(self, generation):
+        return os.path.join(self.directory, self.filename.format(generation=generation, extension=self._extension))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    generation, snapshot = item
+                    try:
+                        data = self._encode(snapshot)
+                        with open(self.path_for(generation), 'wb') as f:
+                            f.write(data)
+                        self.written += 1
+                    except Exception as e:
+                        self._error = (generation, e)
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            generation, error = self._error
+            raise SnapshotWriteError(f"Writing generation {generation} to {self.path_for(generation)} failed: {error}") from error
+
+    def submit(self, generation, grid):
+        """
+        Queues a copy of the grid for writing; blocks while the queue is full.
+        """
+        if self._closed:
+            raise ValueError("The snapshot writer is closed.")
+        self._raise_error()
+        snapshot = np.array(grid, dtype=np.uint8)
+        snapshot.flags.writeable = False
+        try:
+            self._queue.put_nowait((generation, snapshot))
+        except queue.Full:
+            start = time.perf_counter()
+            self._queue.put((generation, snapshot))
+            self.stalled_seconds += time.perf_counter() - start
+
+    __call__ = submit
+
+    def flush(self):
+        """
+        Waits until every queued snapshot is written.
+        """
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """
+        Writes the remaining snapshots and stops the thread.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Do not hide the original exception behind a write error
+            try:
+                self.close()
+            except SnapshotWriteError:
+                pass
@@ -0,0 +1,274 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .gol import GameOfLife
+from .enginemanager import ENGINES
+from .explore import rulestring_from_index
+from .rulesmanager import get_rule_set, is_life_like
+from . import rules  # registers the built-in rule sets
+
+DEFAULT_SIZES = [64, 256, 1024, 4096]
+DEFAULT_DENSITIES = [0.1, 0.35]
+DEFAULT_GENERATIONS = 16
+
+# The reference engine is too slow for big boards; it is skipped above this many cells
+PYTHON_MAX_CELLS = 256 * 256
+
+PATTERNS = ('soup', 'gliders', 'still')
+
+_GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+_BLOCK = np.array([[1, 1], [1, 1]])
+
+# --------------------------------------------------------------
+# Boards
+# --------------------------------------------------------------
+def _tile(shape, motif, spacing):
+    """
+    Copies of `motif` every `spacing` cells; partial copies at the edges are left out.
+    """
+    cell = np.zeros((spacing, spacing), dtype=int)
+    cell[1:1 + motif.shape[0], 1:1 + motif.shape[1]] = motif
+    rows, cols = shape
+    grid = np.tile(cell, (-(-rows // spacing), -(-cols // spacing)))[:rows, :cols]
+    grid[rows // spacing * spacing:, :] = 0
+    grid[:, cols // spacing * spacing:] = 0
+    return grid
+
+def make_board(pattern, rows, cols, density=0.35, seed=0):
+    """
+    Benchmark board: 'soup' (random cells at `density`), 'gliders'
+    (a sparse lattice of gliders, mostly empty space) or 'still' (a lattice
+    of blocks that never changes).
+    """
+    if pattern == 'soup':
+        rng = np.random.default_rng(seed)
+        return (rng.random((rows, cols)) < density).astype(int)
+    if pattern == 'gliders':
+        return _tile((rows, cols), _GLIDER, 32)
+    if pattern == 'still':
+        return _tile((rows, cols), _BLOCK, 4)
+    raise ValueError(f"Unknown benchmark pattern: {pattern}. Expected 'soup', 'gliders' or 'still'.")
+
+# --------------------------------------------------------------
+# Timing
+# --------------------------------------------------------------
+def benchmark_case(engine, rule, rows, cols, pattern='soup', density=0.35, generations=DEFAULT_GENERATIONS,
+                   repeat=3, seed=0):
+    """
+    Times `generations` generations of one engine/rule/board and returns a
+    result dict with the best time of `repeat` runs, the cell-updates per
+    second and the peak memory traced during one run. Memory that numpy does
+    not allocate itself (such as the parallel engine's shared memory) is not
+    included.
+    """
+    board = make_board(pattern, rows, cols, density, seed)
+    game = GameOfLife(rows, cols, rule_set_name=rule, engine=engine, verbose=False)
+    try:
+        # Warm-up: engine set-up (buffers, worker processes) is not timed
+        game.grid = board.copy()
+        game.advance(1)
+
+        best = float('inf')
+        for _ in range(repeat):
+            game.grid = board.copy()
+            game._grid_edited()
+            start = time.perf_counter()
+            game.advance(generations)
+            best = min(best, time.perf_counter() - start)
+
+        game.grid = board.copy()
+        game._grid_edited()
+        tracemalloc.start()
+        game.advance(generations)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        close = getattr(game.engine, 'close', None)
+        if close is not None:
+            close()
+
+    return {
+        'engine': engine,
+        'rule': rule,
+        'rows': rows,
+        'cols': cols,
+        'pattern': pattern,
+        'density': float(board.mean()),
+        'generations': generations,
+        'seconds': best,
+        'cell_updates_per_second': rows * cols * generations / best if best > 0 else float('inf'),
+        'peak_memory_bytes': peak,
+    }
+
+def engine_supports(engine, rule):
+    """
+    True if `engine` can run the rule set (only engines marked
+    any_neighbourhood run Larger than Life rules).
+    """
+    return is_life_like(get_rule_set(rule)) or getattr(ENGINES[engine], 'any_neighbourhood', False)
+
+def benchmark_cases(engines, rule_names, sizes, patterns, densities):
+    """
+    Every (engine, rule, size, pattern, density) combination to time.
+    Density only varies for soups, 'python' is limited to PYTHON_MAX_CELLS,
+    and engines are skipped for rules they cannot run.
+    """
+    for size in sizes:
+        for engine in engines:
+            if engine == 'python' and size * size > PYTHON_MAX_CELLS:
+                continue
+            for rule in rule_names:
+                if not engine_supports(engine, rule):
+                    continue
+                for pattern in patterns:
+                    for density in (densities if pattern == 'soup' else densities[:1]):
+                        yield engine, rule, size, pattern, density
+
+def run_benchmarks(engines=None, rule_names=('conway',), sizes=DEFAULT_SIZES, patterns=PATTERNS,
+                   densities=DEFAULT_DENSITIES, generations=DEFAULT_GENERATIONS, repeat=3, progress=None):
+    """
+    Runs all benchmark cases; `progress`, if given, is called with each result.
+    Returns the results as a JSON-ready dict including the environment.
+    """
+    engines = list(engines or ENGINES)
+    results = []
+    for engine, rule, size, pattern, density in benchmark_cases(engines, rule_names, sizes, patterns, densities):
+        result = benchmark_case(engine, rule, size, size, pattern, density, generations, repeat)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+def _case_key(result):
+    return (result['engine'], result['rule'], result['rows'], result['cols'], result['pattern'],
+            round(result['density'], 3), result['generations'])
+
+def compare_results(old, new):
+    """
+    (case, old rate, new rate, new / old) for every case present in both result sets.
+    """
+    old_rates = {_case_key(r): r['cell_updates_per_second'] for r in old['results']}
+    rows = []
+    for result in new['results']:
+        key = _case_key(result)
+        if key in old_rates:
+            ratio = result['cell_updates_per_second'] / old_rates[key]
+            rows.append((key, old_rates[key], result['cell_updates_per_second'], ratio))
+    return rows
+
+# --------------------------------------------------------------
+# Differential check
+# --------------------------------------------------------------
+def differential_check(engines=None, cases=20, generations=24, max_size=40, seed=0):
+    """
+    Runs random boards under random B/S rules with every engine and with the
+    reference update_grid, generation by generation. Returns a list of
+    mismatches as (engine, rule, shape, generation) tuples; empty means all
+    engines agree.
+    """
+    rng = np.random.default_rng(seed)
+    engines = [engine for engine in (engines or ENGINES) if engine != 'python']
+    mismatches = []
+    for _ in range(cases):
+        shape = (int(rng.integers(1, max_size + 1)), int(rng.integers(1, max_size + 1)))
+        rule = rulestring_from_index(int(rng.integers(0, 1 << 18)))
+        board = (rng.random(shape) < rng.uniform(0.05, 0.6)).astype(int)
+
+        reference = GameOfLife(*shape, rule_set_name=rule, verbose=False)
+        reference.grid = board.copy()
+        expected = []
+        for _ in range(generations):
+            reference.update_grid()
+            expected.append(reference.grid.copy())
+
+        for engine in engines:
+            game = GameOfLife(*shape, rule_set_name=rule, engine=engine, verbose=False)
+            game.grid = board.copy()
+            try:
+                # Mixed step sizes also exercise engines that fuse generations
+                done = 0
+                while done < generations:
+                    step = int(rng.integers(1, 6))
+                    step = min(step, generations - done)
+                    game.advance(step)
+                    done += step
+                    if not np.array_equal(game.grid, expected[done - 1]):
+                        mismatches.append((engine, rule, shape, done))
+                        break
+            finally:
+                close = getattr(game.engine, 'close', None)
+                if close is not None:
+                    close()
+    return mismatches
+
+# --------------------------------------------------------------
+# Command line
+# --------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Game of Life engines and check them against each other.")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), help="Engines to time (default: all)")
+    parser.add_argument("--rules", nargs="+", default=["conway"], help="Rule sets or B/S rulestrings (default: conway)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+                        help=f"Square board sizes (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--patterns", nargs="+", choices=PATTERNS, default=list(PATTERNS))
+    parser.add_argument("--densities", nargs="+", type=float, default=DEFAULT_DENSITIES)
+    parser.add_argument("--generations", type=int, default=DEFAULT_GENERATIONS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench.json", help="JSON results file (default: bench.json)")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="Print the speed ratio against an earlier results file")
+    parser.add_argument("--check", action="store_true", help="Run the differential check instead of timing")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        mismatches = differential_check(args.engines)
+        for engine, rule, shape, generation in mismatches:
+            print(f"MISMATCH: engine {engine}, rule {rule}, shape {shape}, generation {generation}")
+        print("All engines agree with the reference." if not mismatches else f"{len(mismatches)} mismatch(es).")
+        return 1 if mismatches else 0
+
+    def progress(result):
+        print(f"{result['engine']:<9} {result['rule']:<10} {result['rows']}x{result['cols']:<6} "
+              f"{result['pattern']:<8} density {result['density']:.2f}  "
+              f"{result['cell_updates_per_second'] / 1e6:10.1f} Mcells/s  "
+              f"peak {result['peak_memory_bytes'] / 2**20:8.1f} MiB")
+
+    unknown = []
+    for rule in args.rules:
+        try:
+            get_rule_set(rule)
+        except KeyError:
+            unknown.append(rule)
+    if unknown:
+        parser.error(f"Unknown rule set(s): {', '.join(unknown)}")
+    report = run_benchmarks(args.engines, args.rules, args.sizes, args.patterns, args.densities,
+                            args.generations, args.repeat, progress)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        for key, old_rate, new_rate, ratio in compare_results(old, report):
+            print(f"{' '.join(map(str, key)):<60} {ratio:6.2f}x")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
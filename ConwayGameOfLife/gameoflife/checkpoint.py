@@ -0,0 +1,220 @@
+import glob
+import os
+import re
+import struct
+import zlib
+
+import numpy as np
+
+from .gol import GameOfLife
+
+# File layout:
+#   header  : magic, generation, rows, cols, engine state shape, name lengths
+#   names   : rule set name, engine name (UTF-8)
+#   payload : zlib(bit-packed grid + bit-packed engine state)
+#   trailer : CRC-32 of everything before it
+MAGIC = b'GOLCKPT1'
+HEADER = struct.Struct('<8sQQQIIHH')
+TRAILER = struct.Struct('<I')
+
+DEFAULT_INTERVAL = 1000
+DEFAULT_KEEP = 3
+EXTENSION = '.golckpt'
+
+class CheckpointError(Exception):
+    """
+    A checkpoint file is missing, truncated, corrupt or cannot be restored.
+    """
+
+def _pack(cells):
+    return np.packbits(np.asarray(cells) != 0, bitorder='little').tobytes()
+
+def _unpack(data, shape):
+    count = shape[0] * shape[1]
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=count, bitorder='little').reshape(shape)
+
+def encode_checkpoint(game):
+    """
+    The checkpoint of a game as bytes: grid, generation, rule set name and
+    engine state (engines with checkpoint_state() return a boolean array,
+    such as the active engine's tile mask).
+    """
+    get_state = getattr(game.engine, 'checkpoint_state', None)
+    state = get_state() if get_state is not None else None
+    state_shape = state.shape if state is not None else (0, 0)
+    rule = game.rule_set_name.encode('utf-8')
+    engine = game.engine_name.encode('utf-8')
+    packed_grid = _pack(game.grid)
+    payload = zlib.compress(packed_grid + (_pack(state) if state is not None else b''), 1)
+    data = (HEADER.pack(MAGIC, game.generation, game.rows, game.cols, *state_shape, len(rule), len(engine))
+            + rule + engine + payload)
+    return data + TRAILER.pack(zlib.crc32(data))
+
+def decode_checkpoint(data):
+    """
+    Parses and validates checkpoint bytes. Returns a dict with generation,
+    rule_set_name, engine, grid and engine_state (None if not recorded).
+    Raises CheckpointError if the data is damaged.
+    """
+    if len(data) < HEADER.size + TRAILER.size:
+        raise CheckpointError("Checkpoint is truncated.")
+    (crc,) = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+    if zlib.crc32(data[:-TRAILER.size]) != crc:
+        raise CheckpointError("Checkpoint checksum does not match (truncated or corrupt file).")
+    magic, generation, rows, cols, state_rows, state_cols, rule_length, engine_length = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise CheckpointError("Not a Game of Life checkpoint.")
+
+    offset = HEADER.size
+    rule = data[offset:offset + rule_length].decode('utf-8')
+    offset += rule_length
+    engine = data[offset:offset + engine_length].decode('utf-8')
+    offset += engine_length
+    try:
+        payload = zlib.decompress(data[offset:-TRAILER.size])
+    except zlib.error as e:
+        raise CheckpointError(f"Checkpoint payload cannot be decompressed: {e}") from e
+    grid_bytes = (rows * cols + 7) // 8
+    state_bytes = (state_rows * state_cols + 7) // 8
+    if len(payload) != grid_bytes + state_bytes:
+        raise CheckpointError("Checkpoint payload has the wrong size.")
+
+    state = _unpack(payload[grid_bytes:], (state_rows, state_cols)).astype(bool) if state_rows else None
+    return {
+        'generation': generation,
+        'rule_set_name': rule,
+        'engine': engine,
+        'grid': _unpack(payload[:grid_bytes], (rows, cols)),
+        'engine_state': state,
+    }
+
+def _sync_directory(directory):
+    """
+    Syncs a directory entry to disk, so a rename inside it survives a crash.
+    Windows cannot open directories and does not need it.
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def save_checkpoint(game, filepath):
+    """
+    Writes a checkpoint atomically: the data goes to a temporary file in the
+    same directory, is synced to disk, and only then renamed over `filepath`;
+    the directory is synced after the rename. A crash leaves either the old
+    file or the complete new one.
+    """
+    temporary = f"{filepath}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(encode_checkpoint(game))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, filepath)
+    _sync_directory(os.path.dirname(os.path.abspath(filepath)))
+
+def load_checkpoint(filepath, verbose=True):
+    """
+    Rebuilds the GameOfLife instance stored in a checkpoint file, with its
+    rule set, engine and engine state. Custom rule sets must be registered
+    before loading. Raises CheckpointError if the file cannot be used.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        raise CheckpointError(f"Cannot read checkpoint {filepath}: {e}") from e
+    try:
+        record = decode_checkpoint(data)
+    except CheckpointError as e:
+        raise CheckpointError(f"{filepath}: {e}") from e
+
+    rows, cols = record['grid'].shape
+    try:
+        game = GameOfLife(rows, cols, rule_set_name=record['rule_set_name'], engine=record['engine'],
+                          verbose=verbose)
+    except ValueError as e:
+        raise CheckpointError(f"Cannot restore checkpoint {filepath}: {e}") from e
+    game.grid = record['grid'].astype(game.grid.dtype)
+    game.generation = record['generation']
+    restore = getattr(game.engine, 'restore_state', None)
+    if restore is not None and record['engine_state'] is not None:
+        restore(game.grid, record['engine_state'])
+    return game
+
+class Checkpointer:
+    """
+    Periodic, rotating checkpoints of one run in `directory`.
+
+    maybe_save(game) writes a checkpoint whenever the generation is a
+    multiple of `every`; only the `keep` most recently written checkpoints
+    are kept. Files are named <prefix>_<generation>.golckpt and ordered by
+    modification time, so files left by an earlier run with higher
+    generations are rotated out first instead of being resumed from.
+    """
+    def __init__(self, directory, every=DEFAULT_INTERVAL, keep=DEFAULT_KEEP, prefix='checkpoint'):
+        if every < 1:
+            raise ValueError("every must be a positive integer.")
+        if keep < 1:
+            raise ValueError("keep must be a positive integer.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.prefix = prefix
+        self._pattern = re.compile(rf'^{re.escape(prefix)}_(\d+){re.escape(EXTENSION)}$')
+
+    def path_for(self, generation):
+        return os.path.join(self.directory, f"{self.prefix}_{generation:012d}{EXTENSION}")
+
+    def checkpoints(self):
+        """
+        (generation, path) of the checkpoint files present, in the order they
+        were written (oldest first).
+        """
+        found = []
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(self.prefix)}_*{EXTENSION}")):
+            match = self._pattern.match(os.path.basename(path))
+            if not match:
+                continue
+            try:
+                written = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            found.append((written, int(match.group(1)), path))
+        return [(generation, path) for _, generation, path in sorted(found)]
+
+    def save(self, game):
+        """
+        Writes a checkpoint of the game now and rotates out the oldest ones.
+        """
+        path = self.path_for(game.generation)
+        save_checkpoint(game, path)
+        for _, old in self.checkpoints()[:-self.keep]:
+            if old != path:
+                os.remove(old)
+        return path
+
+    def maybe_save(self, game):
+        """
+        Saves if the game's generation is due for a checkpoint; returns the path or None.
+        """
+        if game.generation % self.every == 0:
+            return self.save(game)
+        return None
+
+    def resume(self, verbose=True):
+        """
+        The game from the newest checkpoint that loads, or None if there is none.
+        Damaged checkpoints (e.g. from a crash during the copy to another disk) are skipped.
+        """
+        for _, path in reversed(self.checkpoints()):
+            try:
+                return load_checkpoint(path, verbose=verbose)
+            except CheckpointError as e:
+                if verbose:
+                    print(f"Warning: skipping checkpoint: {e}")
+        return None
@@ -0,0 +1,178 @@
+import re
+
+import numpy as np
+
+from .engines import sum_neighbors
+from .rulesmanager import RULE_SETS, get_rule_set, is_life_like, rule_table
+
+DEFAULT_CHUNK_SIZE = 64
+
+# Neighbouring chunk offsets (dy, dx)
+_NEIGHBOURS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dy, dx) != (0, 0)]
+
+class ChunkedUniverse:
+    """
+    Unbounded Game of Life plane stored as a hash map of fixed-size chunks.
+
+    Only chunks containing live cells are kept. A chunk is allocated when
+    activity reaches its border and freed as soon as it is empty, so memory
+    follows the live area rather than the bounding box. Every step stacks
+    the affected chunks (each with a one-cell border copied from its
+    neighbours) and runs the same vectorised kernel as the numpy engine
+    over the whole stack.
+    """
+    def __init__(self, rule_set_name='conway', chunk_size=DEFAULT_CHUNK_SIZE):
+        try:
+            rule = get_rule_set(rule_set_name)
+        except KeyError:
+            raise ValueError(f"Unknown rule set: {rule_set_name}. Available rule sets: {list(RULE_SETS.keys())}") from None
+        if not is_life_like(rule):
+            raise ValueError(f"{rule_set_name} is not a radius-1 Moore rule; only GameOfLife runs Larger than Life rules.")
+        table = rule_table(rule)
+        if table[0, 0]:
+            raise ValueError("An unbounded universe needs a dead background: rules with birth on 0 neighbors (B0) are not supported.")
+
+        self.rule_set_name = rule_set_name
+        self.table = table.ravel()
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.generation = 0
+
+    # --------------------------------------------------------------
+    # Cells
+    # --------------------------------------------------------------
+    def set_cells(self, rows, cols):
+        """
+        Sets the cells (rows[i], cols[i]) live; coordinates may be negative.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        size = self.chunk_size
+        keys = np.stack((rows // size, cols // size), axis=1)
+        for key in np.unique(keys, axis=0):
+            selected = (keys[:, 0] == key[0]) & (keys[:, 1] == key[1])
+            key = (int(key[0]), int(key[1]))
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.chunks[key] = np.zeros((size, size), dtype=np.uint8)
+            chunk[rows[selected] % size, cols[selected] % size] = 1
+
+    def load_pattern_from_string(self, pattern_data_string, top=0, left=0):
+        """
+        Loads '(row,col) (row,col) ...' coordinates. Nothing is out of bounds here,
+        and negative coordinates are allowed.
+        """
+        coordinates = re.findall(r'\((-?\d+),(-?\d+)\)', pattern_data_string)
+        if coordinates:
+            cells = np.array(coordinates, dtype=np.int64)
+            self.set_cells(cells[:, 0] + top, cells[:, 1] + left)
+
+    @classmethod
+    def from_grid(cls, grid, rule_set_name='conway', top=0, left=0, **kwargs):
+        universe = cls(rule_set_name, **kwargs)
+        rows, cols = np.nonzero(grid)
+        universe.set_cells(rows + top, cols + left)
+        return universe
+
+    @classmethod
+    def from_game(cls, game, **kwargs):
+        return cls.from_grid(game.grid, game.rule_set_name, **kwargs)
+
+    def to_grid(self, rows, cols, top=0, left=0, dtype=int):
+        """
+        Dense (rows, cols) window of the plane starting at (top, left).
+        """
+        grid = np.zeros((rows, cols), dtype=dtype)
+        size = self.chunk_size
+        for (cy, cx), chunk in self.chunks.items():
+            r0, c0 = cy * size - top, cx * size - left
+            a0, a1 = max(r0, 0), min(r0 + size, rows)
+            b0, b1 = max(c0, 0), min(c0 + size, cols)
+            if a0 < a1 and b0 < b1:
+                grid[a0:a1, b0:b1] = chunk[a0 - r0:a1 - r0, b0 - c0:b1 - c0]
+        return grid
+
+    @property
+    def population(self):
+        return int(sum(int(chunk.sum()) for chunk in self.chunks.values()))
+
+    def bounding_box(self):
+        """
+        (top, left, bottom, right) of the live cells (inclusive), or None if empty.
+        """
+        if not self.chunks:
+            return None
+        size = self.chunk_size
+        top = left = None
+        bottom = right = None
+        for (cy, cx), chunk in self.chunks.items():
+            live_rows = np.flatnonzero(chunk.any(axis=1))
+            live_cols = np.flatnonzero(chunk.any(axis=0))
+            r0, r1 = cy * size + live_rows[0], cy * size + live_rows[-1]
+            c0, c1 = cx * size + live_cols[0], cx * size + live_cols[-1]
+            top = r0 if top is None else min(top, r0)
+            bottom = r1 if bottom is None else max(bottom, r1)
+            left = c0 if left is None else min(left, c0)
+            right = c1 if right is None else max(right, c1)
+        return (int(top), int(left), int(bottom), int(right))
+
+    def memory_bytes(self):
+        return len(self.chunks) * self.chunk_size * self.chunk_size
+
+    # --------------------------------------------------------------
+    # Evolution
+    # --------------------------------------------------------------
+    def _candidates(self):
+        """
+        Existing chunks plus the neighbours that live cells on a chunk border can reach.
+        """
+        keys = set(self.chunks)
+        for (cy, cx), chunk in self.chunks.items():
+            top, bottom = chunk[0].any(), chunk[-1].any()
+            left, right = chunk[:, 0].any(), chunk[:, -1].any()
+            edges = {
+                (-1, 0): top, (1, 0): bottom, (0, -1): left, (0, 1): right,
+                (-1, -1): chunk[0, 0], (-1, 1): chunk[0, -1],
+                (1, -1): chunk[-1, 0], (1, 1): chunk[-1, -1],
+            }
+            for (dy, dx), reached in edges.items():
+                if reached:
+                    keys.add((cy + dy, cx + dx))
+        return sorted(keys)
+
+    def step(self):
+        size = self.chunk_size
+        keys = self._candidates()
+        if not keys:
+            self.generation += 1
+            return
+
+        chunks = self.chunks
+        padded = np.zeros((len(keys), size + 2, size + 2), dtype=np.uint8)
+        for i, (cy, cx) in enumerate(keys):
+            board = padded[i]
+            own = chunks.get((cy, cx))
+            if own is not None:
+                board[1:-1, 1:-1] = own
+            for dy, dx in _NEIGHBOURS:
+                other = chunks.get((cy + dy, cx + dx))
+                if other is None:
+                    continue
+                # Border row/column/corner copied from the neighbouring chunk
+                rows = slice(1, -1) if dy == 0 else (0 if dy < 0 else size + 1)
+                cols = slice(1, -1) if dx == 0 else (0 if dx < 0 else size + 1)
+                src_rows = slice(None) if dy == 0 else (-1 if dy < 0 else 0)
+                src_cols = slice(None) if dx == 0 else (-1 if dx < 0 else 0)
+                board[rows, cols] = other[src_rows, src_cols]
+
+        state = padded[:, 1:-1, 1:-1]
+        new = self.table[state * 9 + sum_neighbors(padded)]
+
+        # Keep only chunks that still have live cells
+        alive = new.reshape(len(keys), -1).any(axis=1)
+        self.chunks = {key: new[i] for i, key in enumerate(keys) if alive[i]}
+        self.generation += 1
+
+    def advance(self, generations):
+        for _ in range(generations):
+            self.step()
@@ -0,0 +1,241 @@
+import argparse
+import os
+import sys
+import time
+
+from .gol import GameOfLife
+from .cycles import CycleDetector
+from .enginemanager import ENGINES
+from .snapshot import SnapshotWriter, DEFAULT_KEYFRAME_INTERVAL
+from .stats import CSVSink, JSONLinesSink
+from .checkpoint import Checkpointer, DEFAULT_INTERVAL, DEFAULT_KEEP
+from .asyncsave import AsyncSnapshotWriter, SnapshotWriteError, ENCODERS
+from .rulesmanager import get_rule_set, is_life_like
+from . import rules  # registers the built-in rule sets
+
+DEFAULT_SNAPSHOT_FILE = "grid_states.golsnap"
+
+# Generations between steady-state checks when nothing is printed per generation
+DEFAULT_CYCLE_CHECK = 64
+
+class ProgressBar:
+    """
+    Single-line progress bar on stderr, redrawn at most `updates` times per run.
+    """
+    def __init__(self, total, width=40, updates=100, stream=None):
+        self.total = max(total, 1)
+        self.width = width
+        self.tick = max(1, total // updates)
+        self.stream = stream or sys.stderr
+        self._start = time.perf_counter()
+
+    def update(self, done, population):
+        filled = self.width * done // self.total
+        elapsed = time.perf_counter() - self._start
+        self.stream.write(f"\r[{'#' * filled}{'.' * (self.width - filled)}] "
+                          f"{done}/{self.total} gen, population {population}, {elapsed:.1f}s")
+        self.stream.flush()
+
+    def close(self):
+        self.stream.write("\n")
+        self.stream.flush()
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Run Conway's Game of Life (and other life-like rules) without prompts.")
+    parser.add_argument("--rows", type=int, required=True, help="Grid height")
+    parser.add_argument("--cols", type=int, required=True, help="Grid width")
+    parser.add_argument("--rule", default="conway",
+                        help="Registered rule set name or a B/S rulestring such as B36/S23 (default: conway)")
+    parser.add_argument("--pattern", default="pattern.txt", help="Pattern file (default: pattern.txt)")
+    parser.add_argument("--pattern-format", choices=["coordinates", "rle", "cells"],
+                        help="Pattern file format (default: from the file extension)")
+    parser.add_argument("--generations", type=int, required=True, help="Number of generations to run (a resumed run continues up to this generation)")
+    parser.add_argument("--engine", choices=sorted(ENGINES),
+                        help="Stepping engine (default: numpy, or ltl for Larger than Life rules)")
+    parser.add_argument("--snapshot-every", type=int, default=0, metavar="K",
+                        help="Store every K-th generation in the snapshot file (default: 0, no snapshots)")
+    parser.add_argument("--snapshot-file", default=DEFAULT_SNAPSHOT_FILE,
+                        help=f"Snapshot file (default: {DEFAULT_SNAPSHOT_FILE})")
+    parser.add_argument("--keyframe-interval", type=int, default=DEFAULT_KEYFRAME_INTERVAL,
+                        help="Snapshots between two full keyframes in the snapshot file")
+    parser.add_argument("--save-every", type=int, default=0, metavar="K",
+                        help="Also write every K-th generation to its own file, in the background (default: 0, off)")
+    parser.add_argument("--save-format", choices=sorted(ENCODERS), default="text",
+                        help="Format of the --save-every files (default: text)")
+    parser.add_argument("--save-dir", default="outputs", help="Directory for the --save-every files (default: outputs)")
+    parser.add_argument("--checkpoint-dir", metavar="DIR",
+                        help="Write rotating checkpoints to DIR so the run can be resumed")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_INTERVAL, metavar="K",
+                        help=f"Generations between checkpoints (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--keep-checkpoints", type=int, default=DEFAULT_KEEP, metavar="N",
+                        help=f"Checkpoints kept on disk (default: {DEFAULT_KEEP})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the latest valid checkpoint in --checkpoint-dir; grid size, "
+                             "rule and engine then come from the checkpoint")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="Write per-generation statistics to FILE (.csv, otherwise JSON lines)")
+    parser.add_argument("--no-early-stop", action="store_true",
+                        help="Keep running after the board dies out, settles or starts repeating")
+    parser.add_argument("--cycle-check-every", type=int, default=DEFAULT_CYCLE_CHECK, metavar="K",
+                        help="Without per-generation output, look for a steady state only every K generations "
+                             "(and at snapshot, checkpoint and progress steps), so the engine can advance "
+                             "several generations per call; the run then stops up to K generations late "
+                             f"(default: {DEFAULT_CYCLE_CHECK})")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--quiet", action="store_true", help="Print nothing except errors")
+    output.add_argument("--progress", action="store_true", help="Show a progress bar instead of per-generation lines")
+    parser.add_argument("--print-grid", action="store_true", help="Print the whole grid after every generation")
+    return parser
+
+def default_engine(rule_set_name):
+    """
+    The engine used when none is given: numpy for radius-1 rules, ltl for
+    Larger than Life rules, which the radius-1 engines cannot run.
+    """
+    try:
+        rule = get_rule_set(rule_set_name)
+    except KeyError:
+        return 'numpy'  # GameOfLife reports the unknown rule set
+    return 'numpy' if is_life_like(rule) else 'ltl'
+
+def run(args):
+    """
+    Runs one simulation as described by the parsed arguments.
+    Returns the finished GameOfLife instance.
+    """
+    log_generations = not (args.quiet or args.progress)
+    checkpointer = None
+    game = None
+    if args.checkpoint_dir:
+        checkpointer = Checkpointer(args.checkpoint_dir, args.checkpoint_every, args.keep_checkpoints)
+        if args.resume:
+            game = checkpointer.resume(verbose=not args.quiet)
+            if game is not None:
+                game.verbose = log_generations
+                if not args.quiet:
+                    print(f"Resuming from the checkpoint of generation {game.generation}.")
+    if game is None:
+        game = GameOfLife(args.rows, args.cols, rule_set_name=args.rule,
+                          engine=args.engine or default_engine(args.rule),
+                          verbose=log_generations)
+        game.load_pattern_from_file(args.pattern, args.pattern_format)
+    first = game.generation
+
+    stats_sink = None
+    if args.stats:
+        sink_class = CSVSink if args.stats.lower().endswith('.csv') else JSONLinesSink
+        stats_sink = game.add_stats_sink(sink_class(args.stats))
+
+    detector = None
+    if not args.no_early_stop:
+        detector = CycleDetector()
+        detector.observe(first, game.grid)
+    snapshots = None
+    if args.snapshot_every > 0:
+        snapshots = SnapshotWriter(args.snapshot_file, game.rows, game.cols, args.keyframe_interval)
+        snapshots.append(game.grid, generation=first)
+    saver = None
+    if args.save_every > 0:
+        saver = AsyncSnapshotWriter(args.save_dir, args.save_format)
+        saver.submit(first, game.grid)
+    progress = ProgressBar(args.generations) if args.progress else None
+    # Per-generation output forces single steps; otherwise the engine
+    # advances straight to the next snapshot, checkpoint, progress update or
+    # steady-state check
+    single_steps = log_generations or args.print_grid
+    confirming = False
+
+    start = time.perf_counter()
+    try:
+        while game.generation < args.generations:
+            gen = game.generation
+            if single_steps or confirming:
+                step = 1
+            else:
+                stops = [args.generations]
+                if snapshots is not None:
+                    stops.append(gen + args.snapshot_every - gen % args.snapshot_every)
+                if saver is not None:
+                    stops.append(gen + args.save_every - gen % args.save_every)
+                if checkpointer is not None:
+                    stops.append(gen + checkpointer.every - gen % checkpointer.every)
+                if progress is not None:
+                    stops.append(gen + progress.tick - gen % progress.tick)
+                if detector is not None:
+                    stops.append(gen + args.cycle_check_every - gen % args.cycle_check_every)
+                step = min(stops) - gen
+            game.advance(step)
+            gen = game.generation
+
+            if snapshots is not None and gen % args.snapshot_every == 0:
+                snapshots.append(game.grid, generation=gen)
+            if saver is not None and gen % args.save_every == 0:
+                saver.submit(gen, game.grid)
+            if checkpointer is not None:
+                checkpointer.maybe_save(game)
+            if log_generations:
+                print(f"Generation {gen}: population {int(game.grid.sum())}")
+            if args.print_grid:
+                print(f"\nGrid State after {gen} update(s):\n", game.grid)
+            if progress is not None and (gen % progress.tick == 0 or gen == args.generations):
+                progress.update(gen, int(game.grid.sum()))
+            if detector is not None and detector.observe(gen, game.grid):
+                if not (single_steps or confirming or detector.extinct or detector.period == 1):
+                    # Checks several generations apart only show that the
+                    # board repeats; single steps from here find the period
+                    detector = CycleDetector()
+                    detector.observe(gen, game.grid)
+                    confirming = True
+                    continue
+                game.steady_state = detector
+                if not args.quiet:
+                    print(f"\nSteady state reached: {detector.description}. "
+                          f"Stopping after {gen} of {args.generations} generations.")
+                break
+    finally:
+        if progress is not None:
+            progress.close()
+        if snapshots is not None:
+            snapshots.close()
+        if stats_sink is not None:
+            stats_sink.close()
+        if saver is not None:
+            saver.close()
+
+    if not args.quiet:
+        print(f"Finished {game.generation - first} generation(s) in {time.perf_counter() - start:.2f}s, "
+              f"population {int(game.grid.sum())}.")
+        if snapshots is not None:
+            print(f"Grid states saved to snapshot file: {args.snapshot_file}")
+        if saver is not None:
+            print(f"{saver.written} grid state(s) saved to {args.save_dir} "
+                  f"(waited {saver.stalled_seconds:.2f}s for the disk).")
+    return game
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.rows <= 0 or args.cols <= 0:
+        parser.error("--rows and --cols must be positive integers")
+    if args.generations < 0:
+        parser.error("--generations must be non-negative")
+    if args.snapshot_every < 0:
+        parser.error("--snapshot-every must be non-negative")
+    if args.save_every < 0:
+        parser.error("--save-every must be non-negative")
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume needs --checkpoint-dir")
+    if args.checkpoint_every < 1 or args.keep_checkpoints < 1:
+        parser.error("--checkpoint-every and --keep-checkpoints must be positive integers")
+    if args.cycle_check_every < 1:
+        parser.error("--cycle-check-every must be a positive integer")
+    if not os.path.isfile(args.pattern) and not args.resume:
+        parser.error(f"pattern file not found: {args.pattern}")
+    try:
+        run(args)
+    except ValueError as e:
+        parser.error(str(e))
+    except SnapshotWriteError as e:
+        parser.exit(1, f"error: {e}\n")
+    return 0
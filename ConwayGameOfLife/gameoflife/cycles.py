@@ -0,0 +1,67 @@
+import hashlib
+from collections import deque
+
+import numpy as np
+
+# Generations remembered when looking for a repeat
+DEFAULT_HISTORY = 256
+
+def grid_digest(grid):
+    """
+    128-bit digest of a 0/1 grid, taken over its bit-packed form (1 bit per cell).
+    """
+    packed = np.packbits(np.asarray(grid) != 0)
+    return hashlib.blake2b(packed.tobytes(), digest_size=16).digest()
+
+class CycleDetector:
+    """
+    Detects extinction, still lifes and period-p cycles from one digest per
+    generation. Only the last `history` digests are kept, so cycles longer
+    than the history window are not detected.
+    """
+    def __init__(self, history=DEFAULT_HISTORY):
+        self.history = history
+        self._seen = {}
+        self._order = deque()
+        self.extinct = False
+        self.period = None
+        self.start = None
+        self.detected_at = None
+
+    def observe(self, generation, grid):
+        """
+        Records the grid of `generation`. Returns True once a steady state is found.
+        """
+        if self.period is not None:
+            return True
+
+        if not np.any(grid):
+            self.extinct = True
+            self.period = 1
+            self.start = generation
+            self.detected_at = generation
+            return True
+
+        digest = grid_digest(grid)
+        first = self._seen.get(digest)
+        if first is not None:
+            self.period = generation - first
+            self.start = first
+            self.detected_at = generation
+            return True
+
+        self._seen[digest] = generation
+        self._order.append(digest)
+        if len(self._order) > self.history:
+            del self._seen[self._order.popleft()]
+        return False
+
+    @property
+    def description(self):
+        if self.period is None:
+            return "no steady state detected"
+        if self.extinct:
+            return f"extinct at generation {self.start}"
+        if self.period == 1:
+            return f"still life from generation {self.start}"
+        return f"period-{self.period} oscillator from generation {self.start}"
@@ -0,0 +1,12 @@
+ENGINES = {}
+
+def register_engine(name):
+    """
+    A decorator to register a stepping engine class.
+    The class is created with the GameOfLife instance it steps and must provide
+    advance(grid, generations) -> new grid.
+    """
+    def decorator(cls):
+        ENGINES[name] = cls
+        return cls
+    return decorator
@@ -0,0 +1,236 @@
+import multiprocessing
+
+import numpy as np
+
+from .cycles import DEFAULT_HISTORY
+from .rulesmanager import RULE_SETS, get_rule_set, is_life_like, rule_table
+from . import rules  # registers the built-in rule sets, also in spawned workers
+
+# Boards per chunk are chosen so one chunk's working set stays about this size
+DEFAULT_CHUNK_BYTES = 1 << 21
+
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+
+def _mix(z):
+    """
+    splitmix64 finaliser on a uint64 array (wrapping arithmetic).
+    """
+    z = (z ^ (z >> np.uint64(30))) * _M1
+    z = (z ^ (z >> np.uint64(27))) * _M2
+    return z ^ (z >> np.uint64(31))
+
+def board_hashes(boards, keys):
+    """
+    128-bit hash of every board of a (B, rows, cols) 0/1 stack, as a (B, 2)
+    uint64 array. `keys` is a (2, words) uint64 array of per-word salts.
+    """
+    count = boards.shape[0]
+    packed = np.packbits(boards.reshape(count, -1) != 0, axis=1)
+    words = keys.shape[1]
+    if packed.shape[1] != words * 8:
+        packed = np.pad(packed, ((0, 0), (0, words * 8 - packed.shape[1])))
+    words = packed.view(np.uint64)
+    return np.stack([np.bitwise_xor.reduce(_mix(words ^ salt), axis=1) for salt in keys], axis=1)
+
+class Ensemble:
+    """
+    Many boards of the same size and rule, stored as one (B, rows, cols)
+    uint8 array and stepped together with the numpy kernel.
+
+    Boards are processed in chunks that fit in cache. Per-board statistics
+    (population, cells changed by the last step, extinction, period and start
+    of the steady state) are updated every generation from a 128-bit hash per board and a ring of the
+    last `history` hashes, the batched counterpart of CycleDetector. A board
+    that has settled is no longer stepped: boards[i] then holds its state at
+    generation detected_at[i].
+    """
+    def __init__(self, boards, rule_set_name='conway', history=DEFAULT_HISTORY, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                 generation=0):
+        try:
+            rule = get_rule_set(rule_set_name)
+        except KeyError:
+            raise ValueError(f"Unknown rule set: {rule_set_name}. Available rule sets: {list(RULE_SETS.keys())}") from None
+        boards = np.asarray(boards)
+        if boards.ndim != 3:
+            raise ValueError("Boards must be a (count, rows, cols) array.")
+
+        self.rule_set_name = rule_set_name
+        if not is_life_like(rule):
+            raise ValueError(f"{rule_set_name} is not a radius-1 Moore rule; only GameOfLife runs Larger than Life rules.")
+        self.table = rule_table(rule).ravel()
+        self.boards = (boards != 0).astype(np.uint8)
+        self.history = history
+        self.chunk_bytes = chunk_bytes
+        self.generation = generation
+
+        count, rows, cols = self.boards.shape
+        # Working set per board: padded copy, counts and the next state
+        board_bytes = (rows + 2) * (cols + 2) + 2 * rows * cols
+        self.chunk_boards = max(1, min(count, chunk_bytes // board_bytes))
+        self._padded = np.zeros((self.chunk_boards, rows + 2, cols + 2), dtype=np.uint8)
+        self._counts = np.empty((self.chunk_boards, rows, cols), dtype=np.uint8)
+        self._next = np.empty((self.chunk_boards, rows, cols), dtype=np.uint8)
+
+        words = -(-rows * cols // 64)
+        self._keys = np.random.default_rng(0x6F1).integers(0, 2**64, size=(2, words), dtype=np.uint64)
+
+        self.population = self.boards.reshape(count, -1).sum(axis=1)
+        self.activity = np.zeros(count, dtype=np.int64)
+        self.period = np.zeros(count, dtype=np.int64)
+        self.start = np.full(count, -1, dtype=np.int64)
+        self.detected_at = np.full(count, -1, dtype=np.int64)
+        self.extinct = np.zeros(count, dtype=bool)
+        self._reset_history()
+        self._observe(np.arange(count), self.boards, self.population)
+
+    @classmethod
+    def random(cls, count, rows, cols, density=0.35, seed=None, **kwargs):
+        """
+        Ensemble of `count` random soups with the given live-cell density.
+        """
+        rng = np.random.default_rng(seed)
+        return cls(rng.random((count, rows, cols)) < density, **kwargs)
+
+    def __len__(self):
+        return self.boards.shape[0]
+
+    @property
+    def settled(self):
+        return self.detected_at >= 0
+
+    def _reset_history(self):
+        # One (board, slot) array per hash half: a board's history is contiguous
+        self._hashes = np.zeros((2, len(self), self.history), dtype=np.uint64)
+        self._slot_generation = np.full(self.history, -1, dtype=np.int64)
+
+    def _observe(self, ids, boards, population):
+        """
+        Updates the statistics of boards `ids`, whose current states are `boards`.
+        """
+        gen = self.generation
+        self.population[ids] = population
+
+        empty = population == 0
+        if empty.any():
+            dead = ids[empty]
+            self.extinct[dead] = True
+            self.period[dead] = 1
+            self.start[dead] = gen
+            self.detected_at[dead] = gen
+
+        hashes = board_hashes(boards, self._keys)
+        valid = self._slot_generation >= 0
+        if valid.any():
+            # Second half only checked where the first one matches
+            match = (self._hashes[0, ids] == hashes[:, 0, None]) & valid
+            match[empty] = False
+            repeated = match.any(axis=1)
+            if repeated.any():
+                candidates = np.flatnonzero(repeated)
+                match[candidates] &= self._hashes[1, ids[candidates]] == hashes[candidates, 1, None]
+                repeated = match.any(axis=1)
+                first = self._slot_generation[match.argmax(axis=1)]
+                ids_repeated = ids[repeated]
+                self.start[ids_repeated] = first[repeated]
+                self.period[ids_repeated] = gen - first[repeated]
+                self.detected_at[ids_repeated] = gen
+
+        slot = gen % self.history
+        self._slot_generation[slot] = gen
+        self._hashes[:, ids, slot] = hashes.T
+
+    def _step_chunk(self, current, n):
+        p = self._padded[:n]
+        c = self._counts[:n]
+        out = self._next[:n]
+        p[:, 1:-1, 1:-1] = current
+        np.add(p[:, :-2, :-2], p[:, :-2, 1:-1], out=c)
+        for view in (p[:, :-2, 2:], p[:, 1:-1, :-2], p[:, 1:-1, 2:], p[:, 2:, :-2], p[:, 2:, 1:-1], p[:, 2:, 2:]):
+            np.add(c, view, out=c)
+        # Table index state * 9 + count fits in a byte
+        np.multiply(current, 9, out=out)
+        np.add(c, out, out=c)
+        np.take(self.table, c, out=out)
+        return out
+
+    def step(self):
+        """
+        Advances every board that has not settled by one generation.
+        """
+        active = np.flatnonzero(~self.settled)
+        self.generation += 1
+        for first in range(0, active.size, self.chunk_boards):
+            ids = active[first:first + self.chunk_boards]
+            n = ids.size
+            if ids[-1] - ids[0] + 1 == n:
+                # Contiguous boards: work on a view instead of a gathered copy
+                rows = slice(ids[0], ids[-1] + 1)
+                current = self.boards[rows]
+                out = self._step_chunk(current, n)
+                self.activity[ids] = np.count_nonzero((out != current).reshape(n, -1), axis=1)
+                self.boards[rows] = out
+            else:
+                current = self.boards[ids]
+                out = self._step_chunk(current, n)
+                self.activity[ids] = np.count_nonzero((out != current).reshape(n, -1), axis=1)
+                self.boards[ids] = out
+            self._observe(ids, out, np.count_nonzero(out.reshape(n, -1), axis=1))
+
+    def run(self, generations, processes=1):
+        """
+        Steps up to `generations` generations, stopping early once every board
+        has settled. With processes > 1 the boards are split between worker
+        processes, each running its share independently.
+        """
+        if processes > 1 and len(self) > 1:
+            return self._run_parallel(generations, processes)
+        for _ in range(generations):
+            if self.settled.all():
+                break
+            self.step()
+        return self
+
+    def _run_parallel(self, generations, processes):
+        active = np.flatnonzero(~self.settled)
+        if not active.size:
+            return self
+        parts = np.array_split(active, min(processes, active.size))
+        jobs = [(self.boards[ids], self.rule_set_name, self.history, self.chunk_bytes,
+                 self.generation, generations) for ids in parts]
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        with context.Pool(len(parts)) as pool:
+            results = pool.map(_run_part, jobs)
+
+        target = self.generation + generations
+        for ids, part in zip(parts, results):
+            for name in ('boards', 'population', 'activity', 'period', 'start', 'detected_at', 'extinct'):
+                getattr(self, name)[ids] = part[name]
+        self.generation = min(target, max(part['generation'] for part in results))
+        # Hash history is per process; repeats are found again within one period
+        self._reset_history()
+        return self
+
+    def results(self):
+        """
+        Per-board statistics as a structured array: final population, cells
+        changed by the last step (activity), extinct, period (0 if none
+        detected), start of the steady state ("lifetime", -1 if none) and the
+        generation it was detected at.
+        """
+        table = np.zeros(len(self), dtype=[('population', np.int64), ('activity', np.int64),
+                                           ('extinct', bool), ('period', np.int64),
+                                           ('start', np.int64), ('detected_at', np.int64)])
+        for name in table.dtype.names:
+            table[name] = getattr(self, name)
+        return table
+
+def _run_part(job):
+    boards, rule_set_name, history, chunk_bytes, generation, generations = job
+    part = Ensemble(boards, rule_set_name, history=history, chunk_bytes=chunk_bytes, generation=generation)
+    part.run(generations)
+    return {'boards': part.boards, 'population': part.population, 'activity': part.activity, 'period': part.period,
+            'start': part.start, 'detected_at': part.detected_at, 'extinct': part.extinct,
+            'generation': part.generation}
@@ -0,0 +1,250 @@
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from .ensemble import Ensemble
+from .rulesmanager import canonical_rulestring, parse_rulestring
+
+# Columns of the results table, in order
+RESULT_COLUMNS = ["rule", "score", "longevity", "survival", "settled", "mean_period", "max_period",
+                  "final_density", "peak_density", "mean_activity", "generations"]
+
+DEFAULT_SETTINGS = {
+    'soups': 32,
+    'rows': 32,
+    'cols': 32,
+    'density': 0.35,
+    'generations': 300,
+    'seed': 1,
+}
+
+# --------------------------------------------------------------
+# Rule space
+# --------------------------------------------------------------
+def rulestring_from_index(index):
+    """
+    Outer-totalistic rule number (bits 0-8 birth counts, bits 9-17 survival
+    counts) as a canonical 'B../S..' rulestring.
+    """
+    birth = [n for n in range(9) if index >> n & 1]
+    survival = [n for n in range(9) if index >> (9 + n) & 1]
+    return canonical_rulestring(birth, survival)
+
+def all_rulestrings(allow_b0=False):
+    """
+    Every outer-totalistic rule (2^18), or the 2^17 without birth on 0 neighbors.
+    """
+    for index in range(1 << 18):
+        if allow_b0 or not index & 1:
+            yield rulestring_from_index(index)
+
+def random_rulestrings(count, seed=0, allow_b0=False):
+    """
+    `count` distinct random rules, always the same for the same seed.
+    """
+    rng = np.random.default_rng(seed)
+    space = (1 << 18) if allow_b0 else (1 << 17)
+    picks = rng.choice(space, size=min(count, space), replace=False)
+    if not allow_b0:
+        picks = picks << 1
+    return [rulestring_from_index(int(index)) for index in picks]
+
+# --------------------------------------------------------------
+# Evaluation
+# --------------------------------------------------------------
+def interest_score(result):
+    """
+    Ranks rules that stay active for long without dying out or filling the
+    board: longevity x survival x (1 - final density / 0.5, clipped to 0).
+    """
+    boundedness = max(0.0, 1.0 - result['final_density'] / 0.5)
+    return result['longevity'] * result['survival'] * boundedness
+
+def evaluate_rule(rulestring, soups=32, rows=32, cols=32, density=0.35, generations=300, seed=1):
+    """
+    Runs one rule over the standard seeded set of soups and returns its
+    classifiers: how long boards take to settle (longevity, as a fraction of
+    the run), survival, period statistics, population trajectory and mean
+    fraction of cells changing per generation.
+    """
+    ensemble = Ensemble.random(soups, rows, cols, density=density, seed=seed, rule_set_name=rulestring)
+    cells = rows * cols
+    history = ensemble.history
+    peak_density = ensemble.population.mean() / cells
+    # Cells changed per board: summed while running, and per generation of
+    # the cycle once settled (0 for extinct boards and still lifes)
+    activity = np.zeros(soups)
+    steady = np.zeros(soups)
+    recent = np.zeros((history, soups))
+    steps = 0
+    while steps < generations and not ensemble.settled.all():
+        running = ~ensemble.settled
+        ensemble.step()
+        steps += 1
+        peak_density = max(peak_density, ensemble.population.mean() / cells)
+        activity[running] += ensemble.activity[running]
+        recent[ensemble.generation % history] = ensemble.activity
+
+        # Boards that just repeated a state: mean over the period that closed
+        ids = np.flatnonzero(running & ensemble.settled & ~ensemble.extinct)
+        if ids.size:
+            periods = ensemble.period[ids]
+            back = np.arange(history)[:, None]
+            window = recent[(ensemble.generation - back) % history, ids]
+            steady[ids] = np.where(back < periods, window, 0).sum(axis=0) / periods
+    # Settled boards repeat their cycle for the rest of the run
+    settled = ensemble.settled
+    activity[settled] += (generations - ensemble.detected_at[settled]) * steady[settled]
+
+    oscillating = settled & ~ensemble.extinct
+    lifetime = np.where(settled, ensemble.start, generations)
+    result = {
+        'rule': canonical_rulestring(*parse_rulestring(rulestring)),
+        'longevity': float(lifetime.mean() / max(generations, 1)),
+        'survival': float(1.0 - ensemble.extinct.mean()),
+        'settled': float(settled.mean()),
+        'mean_period': float(ensemble.period[oscillating].mean()) if oscillating.any() else 0.0,
+        'max_period': int(ensemble.period.max()),
+        'final_density': float(ensemble.population.mean() / cells),
+        'peak_density': float(peak_density),
+        'mean_activity': float(activity.mean() / cells / max(generations, 1)),
+        'generations': steps,
+    }
+    result['score'] = interest_score(result)
+    return result
+
+def _evaluate(job):
+    rulestring, settings = job
+    return evaluate_rule(rulestring, **settings)
+
+# --------------------------------------------------------------
+# Results table
+# --------------------------------------------------------------
+def _format_row(result):
+    return [f"{result[name]:.6g}" if isinstance(result[name], float) else result[name] for name in RESULT_COLUMNS]
+
+def _intact(row):
+    """
+    True if a table row has every column and its values parse.
+    """
+    if None in row or any(row.get(name) is None for name in RESULT_COLUMNS):
+        return False
+    try:
+        if canonical_rulestring(*parse_rulestring(row['rule'])) != row['rule']:
+            return False
+        for name in RESULT_COLUMNS[1:]:
+            float(row[name])
+    except ValueError:
+        return False
+    return True
+
+def read_results(filepath):
+    """
+    Rows of an existing results table as dicts of strings (empty if there is none).
+
+    A crash can leave the last row half written: text after the last line
+    break and rows with missing or unparsable columns are dropped, so
+    those rules count as not evaluated.
+    """
+    if not os.path.isfile(filepath):
+        return []
+    with open(filepath, newline='') as f:
+        text = f.read()
+    text = text[:text.rfind('\n') + 1]
+    return [row for row in csv.DictReader(io.StringIO(text, newline='')) if _intact(row)]
+
+def _write_table(filepath, rows):
+    """
+    Replaces the table with `rows` atomically (header first).
+    """
+    temporary = filepath + '.tmp'
+    with open(temporary, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(temporary, filepath)
+
+def explore(rulestrings, output, processes=1, resume=True, **settings):
+    """
+    Evaluates every rule and writes the table to `output`, ranked by score.
+
+    Each result is appended to `output` as soon as it is ready, so an
+    interrupted survey loses at most the rules in flight. With resume,
+    rules already in the table are skipped; a resumed run must use the same
+    settings as the original one. Returns the ranked rows.
+    """
+    settings = {**DEFAULT_SETTINGS, **settings}
+    existing = read_results(output) if resume else []
+    done = {row['rule'] for row in existing}
+    todo = []
+    for rulestring in rulestrings:
+        rule = canonical_rulestring(*parse_rulestring(rulestring))
+        if rule not in done:
+            done.add(rule)
+            todo.append(rule)
+
+    # Start from the intact rows only, so new rows begin on a fresh line
+    _write_table(output, existing)
+    with open(output, 'a', newline='') as f:
+        writer = csv.writer(f)
+        jobs = [(rule, settings) for rule in todo]
+        if processes > 1 and len(jobs) > 1:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+            with context.Pool(processes) as pool:
+                for result in pool.imap_unordered(_evaluate, jobs, chunksize=4):
+                    writer.writerow(_format_row(result))
+                    f.flush()
+        else:
+            for job in jobs:
+                writer.writerow(_format_row(_evaluate(job)))
+                f.flush()
+
+    # Rank: rewrite the table sorted by score, replacing the file atomically
+    rows = sorted(read_results(output), key=lambda row: float(row['score']), reverse=True)
+    _write_table(output, rows)
+    return rows
+
+# --------------------------------------------------------------
+# Command line
+# --------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Survey outer-totalistic (B/S) rules over seeded random soups.")
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument("--rules", nargs="+", metavar="RULE", help="Rulestrings to evaluate, e.g. B3/S23 B36/S23")
+    which.add_argument("--sample", type=int, metavar="N", help="Evaluate N random rules")
+    which.add_argument("--all", action="store_true", help="Evaluate the whole rule space")
+    parser.add_argument("--allow-b0", action="store_true", help="Include rules with birth on 0 neighbors")
+    parser.add_argument("--output", default="rules.csv", help="Results table (default: rules.csv)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--restart", action="store_true", help="Start a new table instead of resuming")
+    parser.add_argument("--top", type=int, default=10, help="Rules to print at the end")
+    for name, value in DEFAULT_SETTINGS.items():
+        parser.add_argument(f"--{name}", type=type(value), default=value, help=f"(default: {value})")
+    args = parser.parse_args(argv)
+
+    if args.rules:
+        rulestrings = args.rules
+    elif args.sample:
+        rulestrings = random_rulestrings(args.sample, args.seed, args.allow_b0)
+    else:
+        rulestrings = all_rulestrings(args.allow_b0)
+    settings = {name: getattr(args, name) for name in DEFAULT_SETTINGS}
+    try:
+        rows = explore(rulestrings, args.output, args.processes, resume=not args.restart, **settings)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"{len(rows)} rules ranked in {args.output}")
+    for row in rows[:args.top]:
+        print(f"{row['rule']:<24} score {row['score']:<10} longevity {row['longevity']:<10} "
+              f"density {row['final_density']}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
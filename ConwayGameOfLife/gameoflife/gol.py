@@ -1,15 +1,33 @@
+import time
+
 import numpy as np
 
 # Import the new modules
 from gameoflife.patterns import load_pattern_from_string, load_pattern_from_file
-from gameoflife.save import save_grid_to_file
-from gameoflife.rulesmanager import RULE_SETS
+from gameoflife.save import save_grid_to_file, save_grid_to_rle
+from gameoflife.rulesmanager import RULE_SETS, get_rule_set, rule_table, rule_neighbourhood, is_life_like
+from gameoflife.enginemanager import ENGINES
+from gameoflife.cycles import CycleDetector, DEFAULT_HISTORY
+from gameoflife.stats import StatsRecorder
+from gameoflife.engines import StepBuffers, rule_bitmask
+# Engine modules register themselves on import
+import gameoflife.engines
+import gameoflife.bitboard
+import gameoflife.activeregion
+import gameoflife.parallel
+import gameoflife.ltl
+
+# Engines whose steps the in-place kernel of generations() reproduces
+IN_PLACE_ENGINES = ('python', 'numpy')
 
 class GameOfLife:
-    def __init__(self, rows, cols, rule_set_name='conway'):
+    def __init__(self, rows, cols, rule_set_name='conway', engine='python', verbose=True):
         """
         Initializes the Game of Life grid with specified dimensions.
         All cells are initially dead.
+        The engine ('python' reference loop, 'numpy' vectorised, ...) decides
+        how update_grid computes the next generation.
+        With verbose=False, progress messages are not printed.
         """
         # Add validation for rows and cols (Instruction 1)
         if not isinstance(rows, int) or not isinstance(cols, int) or rows <= 0 or cols <= 0:
@@ -17,24 +35,72 @@ class GameOfLife:
 
         self.rows = rows
         self.cols = cols
+        self.verbose = verbose
         self.grid = np.zeros((rows, cols), dtype=int)
-        print(f"Game of Life grid initialized with dimensions {self.rows}x{self.cols}.")
-        if rule_set_name in RULE_SETS:
-            self.current_rule_set = RULE_SETS[rule_set_name]
-            print(f"Game of Life grid initialized with dimensions {self.rows}x{self.cols} using '{rule_set_name}' rules.")
-        else:
-            raise ValueError(f"Unknown rule set: {rule_set_name}. Available rule sets: {list(RULE_SETS.keys())}")
+        self.generation = 0
+        self.steady_state = None
+        # Statistics recorder; None while no sink is attached
+        self.stats = None
+        self.log(f"Game of Life grid initialized with dimensions {self.rows}x{self.cols}.")
+        self.set_rule_set(rule_set_name)
+        self.log(f"Game of Life grid initialized with dimensions {self.rows}x{self.cols} using '{rule_set_name}' rules.")
+        self.set_engine(engine)
+
+    def log(self, message):
+        """
+        Prints a progress message unless the instance was created with verbose=False.
+        """
+        if self.verbose:
+            print(message)
+
+    def set_rule_set(self, rule_set_name):
+        """
+        Selects the rule set by name; registered names and B/S rulestrings
+        such as 'B36/S23' are accepted.
+        """
+        try:
+            rule = get_rule_set(rule_set_name)
+        except KeyError:
+            raise ValueError(f"Unknown rule set: {rule_set_name}. Available rule sets: {list(RULE_SETS.keys())}") from None
+        # Check before installing, so a rejected rule leaves the old one in place
+        if hasattr(self, 'engine_name'):
+            self._check_engine(self.engine_name, rule, rule_set_name)
+        self.current_rule_set = rule
+        self.rule_set_name = rule_set_name
+
+    def set_engine(self, engine):
+        """
+        Selects the stepping engine used by this instance.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}. Available engines: {list(ENGINES.keys())}")
+        self._check_engine(engine)
+        self.engine_name = engine
+        self.engine = ENGINES[engine](self)
+
+    def _check_engine(self, engine, rule=None, rule_set_name=None):
+        # Only engines marked any_neighbourhood count more than the 8 cells around a cell
+        if rule is None:
+            rule, rule_set_name = self.current_rule_set, self.rule_set_name
+        if not is_life_like(rule) and not getattr(ENGINES[engine], 'any_neighbourhood', False):
+            raise ValueError(f"The '{engine}' engine only supports radius-1 Moore rules; "
+                             f"use the 'ltl' or 'python' engine for {rule_set_name}.")
 
     def _count_live_neighbors(self, row, col):
         """
         Counts the number of live neighbors for a given cell.
         Handles boundary conditions.
+        The neighbourhood (radius-1 Moore unless the rule set says otherwise)
+        comes from the current rule set.
         """
+        kind, radius, include_center = rule_neighbourhood(self.current_rule_set)
         live_neighbors = 0
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if i == 0 and j == 0:
+        for i in range(-radius, radius + 1):
+            for j in range(-radius, radius + 1):
+                if i == 0 and j == 0 and not include_center:
                     continue # Don't count the cell itself
+                if kind == 'vonneumann' and abs(i) + abs(j) > radius:
+                    continue
 
                 neighbor_row, neighbor_col = row + i, col + j
 
@@ -45,7 +111,54 @@ class GameOfLife:
 
     def update_grid(self):
         """
-        Updates the grid to the next generation based on Game of Life rules.
+        Updates the grid to the next generation based on Game of Life rules,
+        using the selected engine.
+        """
+        self.advance(1)
+        self.log("Grid updated to the next generation.")
+
+    def advance(self, generations):
+        """
+        Advances the grid by several generations in one engine call, without
+        printing. Engines that fuse generations (bitboard, parallel) run faster
+        this way than through repeated update_grid calls.
+        While statistics sinks are attached, the engine is called once per
+        generation so that every step is timed and recorded.
+        """
+        if self.stats is None:
+            self.grid = self.engine.advance(self.grid, generations)
+            self.generation += generations
+            return
+        for _ in range(generations):
+            old = self.grid
+            start = time.perf_counter()
+            self.grid = self.engine.advance(old, 1)
+            seconds = time.perf_counter() - start
+            self.generation += 1
+            self.stats.record(self.generation, old, self.grid, seconds)
+
+    def add_stats_sink(self, sink):
+        """
+        Attaches a statistics sink (MemorySink, CSVSink, JSONLinesSink or any
+        object with write(record)). Every following generation produces one
+        record with population, births, deaths, bounding box and step time.
+        """
+        if self.stats is None:
+            self.stats = StatsRecorder(self.grid)
+        self.stats.sinks.append(sink)
+        return sink
+
+    def remove_stats_sink(self, sink):
+        """
+        Detaches a sink; with no sinks left, statistics cost nothing again.
+        """
+        self.stats.sinks.remove(sink)
+        if not self.stats.sinks:
+            self.stats = None
+
+    def _reference_step(self):
+        """
+        Computes the next generation cell by cell (the 'python' engine).
         A new grid is created to avoid affecting neighbor counts for the current generation.
         """
         new_grid = np.copy(self.grid) # Create a copy to store the next state
@@ -56,20 +169,32 @@ class GameOfLife:
                 current_state = self.grid[r, c]
                 # Use the imported apply_conway_rules function
                 new_grid[r, c] = self.current_rule_set(current_state, live_neighbors)
-        self.grid = new_grid
-        print("Grid updated to the next generation.")
+        return new_grid
+
+    def _grid_edited(self):
+        """
+        Tells engines that track state between steps that the grid was changed in place.
+        """
+        reset = getattr(self.engine, 'reset', None)
+        if reset is not None:
+            reset()
+        if self.stats is not None:
+            self.stats.resync(self.grid)
 
     def load_pattern_from_string(self, pattern_data_string):
         """
         Wrapper for the external load_pattern_from_string function.
         """
         load_pattern_from_string(self, pattern_data_string)
+        self._grid_edited()
 
-    def load_pattern_from_file(self, filepath):
+    def load_pattern_from_file(self, filepath, pattern_format=None):
         """
         Wrapper for the external load_pattern_from_file function.
+        RLE (.rle) and plaintext (.cells) files are recognised by their extension.
         """
-        load_pattern_from_file(self, filepath)
+        load_pattern_from_file(self, filepath, pattern_format)
+        self._grid_edited()
 
     def save_grid_to_file(self, filepath):
         """
@@ -77,7 +202,126 @@ class GameOfLife:
         """
         save_grid_to_file(self, filepath)
 
-    def run_simulation(self, num_generations):
-        # Simplified run_simulation for testing, focusing on state changes
-        for gen in range(num_generations):
+    def save_grid_to_rle(self, filepath):
+        """
+        Wrapper for the external save_grid_to_rle function.
+        """
+        save_grid_to_rle(self, filepath)
+
+    def run_simulation(self, num_generations, detect_cycles=False, history=DEFAULT_HISTORY, checkpointer=None):
+        """
+        Advances num_generations generations. Quiet games (verbose=False)
+        without cycle detection advance in as few engine calls as the
+        checkpoints allow.
+
+        With a checkpointer (gameoflife.checkpoint.Checkpointer), a checkpoint
+        is written whenever a generation is due for one, so the run can be
+        resumed with checkpointer.resume() after a crash.
+
+        With detect_cycles, every generation is digested and the run stops as
+        soon as the board dies out, becomes a still life or repeats with some
+        period p (within the last `history` generations). The remaining
+        generations are then skipped analytically: only (remaining % p) more
+        steps are computed, so the final grid is the same as for a full run.
+        Returns the CycleDetector (also stored as self.steady_state).
+        """
+        if not detect_cycles:
+            if not self.verbose:
+                # Nothing to print per generation: hand whole stretches up to
+                # the next checkpoint to the engine, so fusing engines
+                # (bitboard, parallel) step several generations per call
+                end = self.generation + num_generations
+                while self.generation < end:
+                    chunk = end - self.generation
+                    if checkpointer is not None:
+                        chunk = min(chunk, checkpointer.every - self.generation % checkpointer.every)
+                    self.advance(chunk)
+                    if checkpointer is not None:
+                        checkpointer.maybe_save(self)
+                return None
+            # Simplified run_simulation for testing, focusing on state changes
+            for gen in range(num_generations):
+                self.update_grid()
+                if checkpointer is not None:
+                    checkpointer.maybe_save(self)
+            return None
+
+        detector = CycleDetector(history)
+        self.steady_state = detector
+        detector.observe(0, self.grid)
+
+        for gen in range(1, num_generations + 1):
             self.update_grid()
+            if checkpointer is not None:
+                checkpointer.maybe_save(self)
+            if detector.observe(gen, self.grid):
+                remaining = num_generations - gen
+                for _ in range(remaining % detector.period):
+                    self.update_grid()
+                self.generation += remaining - remaining % detector.period
+                self.log(f"Steady state after {gen} generation(s): {detector.description}.")
+                break
+        return detector
+
+    def generations(self, num_generations, every=1):
+        """
+        Lazily advances num_generations generations, yielding
+        (generation, board) after every generation whose number is divisible
+        by `every`. The number is the game's absolute generation, not the
+        count since the call: a game at generation 5 with every=3 yields
+        6, 9, ... (so stages keep their cadence across calls).
+
+        Radius-1 rules on the 'python' and 'numpy' engines are stepped in
+        place between two preallocated uint8 buffers with the numpy kernel,
+        so no array is allocated per generation. Each yielded board is a
+        read-only view that is overwritten two generations later: copy it to
+        keep it. self.grid is only brought up to date when the iteration ends
+        (or the generator is closed).
+
+        Every other engine (bitboard, parallel, active, ltl, ...) is advanced
+        with one engine call per yielded generation, so engines that fuse
+        generations keep their speed-up and Larger than Life rules work; the
+        boards are then read-only views of self.grid.
+        """
+        if every < 1:
+            raise ValueError("every must be a positive integer.")
+        if self.engine_name in IN_PLACE_ENGINES and is_life_like(self.current_rule_set):
+            return self._generations_in_place(num_generations, every)
+        return self._generations_by_engine(num_generations, every)
+
+    def _generations_by_engine(self, num_generations, every):
+        end = self.generation + num_generations
+        while self.generation < end:
+            self.advance(min(end - self.generation, every - self.generation % every))
+            if self.generation % every == 0:
+                board = self.grid.view()
+                board.flags.writeable = False
+                yield self.generation, board
+
+    def _generations_in_place(self, num_generations, every):
+        mask = rule_bitmask(rule_table(self.current_rule_set))
+        buffers = StepBuffers(self.grid.shape)
+        current = (self.grid != 0).astype(np.uint8)
+        out = np.empty_like(current)
+        views = {}
+        for buffer in (current, out):
+            view = buffer.view()
+            view.flags.writeable = False
+            views[id(buffer)] = view
+
+        end = self.generation + num_generations
+        if self.stats is not None:
+            self.stats.resync(current)
+        try:
+            while self.generation < end:
+                start = time.perf_counter() if self.stats is not None else 0.0
+                buffers.step(current, out, mask)
+                self.generation += 1
+                if self.stats is not None:
+                    self.stats.record(self.generation, current, out, time.perf_counter() - start)
+                current, out = out, current
+                if self.generation % every == 0:
+                    yield self.generation, views[id(current)]
+        finally:
+            self.grid = current.astype(self.grid.dtype)
+            self._grid_edited()
@@ -0,0 +1,290 @@
+import numpy as np
+
+from .rulesmanager import RULE_SETS, get_rule_set, is_life_like, rule_table
+
+# Above this many canonical nodes, unreachable nodes and cached results are dropped
+DEFAULT_MAX_NODES = 2_000_000
+
+class Node:
+    """
+    Quadtree node of level k, covering a 2^k x 2^k square.
+    Level-0 nodes are single cells. Nodes are canonical: equal squares are
+    the same object, so they can be compared and hashed by identity.
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+class HashLife:
+    """
+    HashLife universe on the unbounded plane (every cell outside the pattern is dead).
+
+    The pattern is a canonical quadtree, and the centre of a level-k node
+    after 2^j generations (j <= k - 2) is memoised. Repeated structure in
+    space and time is therefore computed once, which allows jumps of
+    millions to trillions of generations for regular patterns.
+
+    Unlike GameOfLife, there are no dead walls: use from_grid()/to_grid()
+    to move between the two representations.
+    """
+    def __init__(self, rule_set_name='conway', max_nodes=DEFAULT_MAX_NODES):
+        try:
+            rule = get_rule_set(rule_set_name)
+        except KeyError:
+            raise ValueError(f"Unknown rule set: {rule_set_name}. Available rule sets: {list(RULE_SETS.keys())}") from None
+        if not is_life_like(rule):
+            raise ValueError(f"{rule_set_name} is not a radius-1 Moore rule; only GameOfLife runs Larger than Life rules.")
+        self.table = rule_table(rule)
+        if self.table[0, 0]:
+            raise ValueError("HashLife needs a dead background: rules with birth on 0 neighbors (B0) are not supported.")
+
+        self.rule_set_name = rule_set_name
+        self.max_nodes = max_nodes
+        self.off = Node(0, None, None, None, None, 0)
+        self.on = Node(0, None, None, None, None, 1)
+        self._nodes = {}
+        self._results = {}
+        self._empty = {0: self.off}
+
+        self.root = self.empty(3)
+        # Plane coordinates (row, col) of the root's top-left cell
+        self.origin = (0, 0)
+        self.generation = 0
+
+    # --------------------------------------------------------------
+    # Canonical nodes
+    # --------------------------------------------------------------
+    def join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.level + 1, nw, ne, sw, se,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level):
+        node = self._empty.get(level)
+        if node is None:
+            child = self.empty(level - 1)
+            node = self.join(child, child, child, child)
+            self._empty[level] = node
+        return node
+
+    def _centre(self, node):
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _expand(self):
+        """
+        Doubles the root, keeping the current root in the centre.
+        """
+        root = self.root
+        e = self.empty(root.level - 1)
+        self.root = self.join(
+            self.join(e, e, e, root.nw),
+            self.join(e, e, root.ne, e),
+            self.join(e, root.sw, e, e),
+            self.join(root.se, e, e, e),
+        )
+        half = 1 << (root.level - 1)
+        self.origin = (self.origin[0] - half, self.origin[1] - half)
+
+    # --------------------------------------------------------------
+    # Evolution
+    # --------------------------------------------------------------
+    def _base_step(self, node):
+        """
+        Level-2 node (4x4 cells): centre 2x2 after one generation.
+        """
+        cells = np.zeros((4, 4), dtype=np.uint8)
+        for r0, c0, quad in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            cells[r0, c0] = quad.nw.population
+            cells[r0, c0 + 1] = quad.ne.population
+            cells[r0 + 1, c0] = quad.sw.population
+            cells[r0 + 1, c0 + 1] = quad.se.population
+
+        leaves = []
+        for r in (1, 2):
+            for c in (1, 2):
+                live_neighbors = int(cells[r - 1:r + 2, c - 1:c + 2].sum()) - int(cells[r, c])
+                leaves.append(self.on if self.table[cells[r, c], live_neighbors] else self.off)
+        nw, ne, sw, se = leaves
+        return self.join(nw, ne, sw, se)
+
+    def _successor(self, node, j):
+        """
+        Centre (level k - 1) of a level-k node after 2^j generations, j <= k - 2.
+        """
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.population == 0:
+            result = node.nw
+        elif node.level == 2:
+            result = self._base_step(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # Nine overlapping sub-squares of level k - 1
+            n00 = nw
+            n01 = self.join(nw.ne, ne.nw, nw.se, ne.sw)
+            n02 = ne
+            n10 = self.join(nw.sw, nw.se, sw.nw, sw.ne)
+            n11 = self.join(nw.se, ne.sw, sw.ne, se.nw)
+            n12 = self.join(ne.sw, ne.se, se.nw, se.ne)
+            n20 = sw
+            n21 = self.join(sw.ne, se.nw, sw.se, se.sw)
+            n22 = se
+
+            if j == node.level - 2:
+                # Full speed: two half-steps of 2^(j-1) generations each
+                second = j - 1
+
+                def step(n):
+                    return self._successor(n, second)
+            else:
+                # Slower: no time in the first half, 2^j in the second
+                second = j
+                step = self._centre
+
+            r00, r01, r02 = step(n00), step(n01), step(n02)
+            r10, r11, r12 = step(n10), step(n11), step(n12)
+            r20, r21, r22 = step(n20), step(n21), step(n22)
+
+            result = self.join(
+                self._successor(self.join(r00, r01, r10, r11), second),
+                self._successor(self.join(r01, r02, r11, r12), second),
+                self._successor(self.join(r10, r11, r20, r21), second),
+                self._successor(self.join(r11, r12, r21, r22), second),
+            )
+
+        self._results[key] = result
+        return result
+
+    def _is_padded(self):
+        # All live cells lie in the central half of the root
+        return self._centre(self.root).population == self.root.population
+
+    def _step_pow2(self, j):
+        while self.root.level < j + 2 or not self._is_padded():
+            self._expand()
+        # One more ring so growth at light speed stays inside the result
+        self._expand()
+
+        level = self.root.level
+        self.root = self._successor(self.root, j)
+        quarter = 1 << (level - 2)
+        self.origin = (self.origin[0] + quarter, self.origin[1] + quarter)
+        self.generation += 1 << j
+
+    def advance(self, generations):
+        """
+        Jumps forward by any number of generations (as a sum of powers of two).
+        """
+        if generations < 0:
+            raise ValueError("Number of generations must be non-negative.")
+        j = 0
+        while generations:
+            if generations & 1:
+                self._step_pow2(j)
+                if len(self._nodes) > self.max_nodes:
+                    self.collect()
+            generations >>= 1
+            j += 1
+
+    def jump_to(self, generation):
+        """
+        Advances to an absolute generation number.
+        """
+        if generation < self.generation:
+            raise ValueError(f"Cannot go back from generation {self.generation} to {generation}.")
+        self.advance(generation - self.generation)
+
+    def collect(self):
+        """
+        Garbage collection: keeps only the nodes reachable from the root and
+        drops all memoised results.
+        """
+        live = {}
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in live:
+                continue
+            live[key] = node
+            stack.extend(key)
+        self._nodes = live
+        self._results = {}
+        self._empty = {0: self.off}
+
+    @property
+    def population(self):
+        return self.root.population
+
+    # --------------------------------------------------------------
+    # Dense grid import/export
+    # --------------------------------------------------------------
+    def _build(self, cells, level):
+        if level == 0:
+            return self.on if cells[0, 0] else self.off
+        if not cells.any():
+            return self.empty(level)
+        half = 1 << (level - 1)
+        return self.join(
+            self._build(cells[:half, :half], level - 1),
+            self._build(cells[:half, half:], level - 1),
+            self._build(cells[half:, :half], level - 1),
+            self._build(cells[half:, half:], level - 1),
+        )
+
+    @classmethod
+    def from_grid(cls, grid, rule_set_name='conway', top=0, left=0, **kwargs):
+        """
+        Builds a universe whose cell (top + r, left + c) is grid[r, c].
+        """
+        universe = cls(rule_set_name, **kwargs)
+        rows, cols = grid.shape
+        level = max(3, int(np.ceil(np.log2(max(rows, cols, 1)))))
+        size = 1 << level
+        cells = np.zeros((size, size), dtype=np.uint8)
+        cells[:rows, :cols] = grid != 0
+        universe.root = universe._build(cells, level)
+        universe.origin = (top, left)
+        return universe
+
+    @classmethod
+    def from_game(cls, game, **kwargs):
+        return cls.from_grid(game.grid, game.rule_set_name, **kwargs)
+
+    def to_grid(self, rows, cols, top=0, left=0, dtype=int):
+        """
+        Dense (rows, cols) window of the plane starting at (top, left).
+        """
+        grid = np.zeros((rows, cols), dtype=dtype)
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            node, r0, c0 = stack.pop()
+            size = 1 << node.level
+            if (node.population == 0 or r0 >= top + rows or c0 >= left + cols
+                    or r0 + size <= top or c0 + size <= left):
+                continue
+            if node.level == 0:
+                grid[r0 - top, c0 - left] = 1
+                continue
+            half = size >> 1
+            stack.append((node.nw, r0, c0))
+            stack.append((node.ne, r0, c0 + half))
+            stack.append((node.sw, r0 + half, c0))
+            stack.append((node.se, r0 + half, c0 + half))
+        return grid
+
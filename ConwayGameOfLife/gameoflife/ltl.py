@@ -0,0 +1,126 @@
+import numpy as np
+
+from .enginemanager import register_engine
+from .rulesmanager import rule_neighbourhood, rule_table
+
+class IntegralCounter:
+    """
+    Radius-r neighbour counts of a board of fixed shape from prefix sums, so
+    every count costs a fixed number of lookups whatever the radius.
+
+    Moore neighbourhoods are squares: box sums of a summed-area table
+    (integral image) of the zero-padded board, four lookups per cell.
+
+    A von Neumann neighbourhood (|dy| + |dx| <= r) is a diamond: the sum over
+    its rows of row-prefix differences P[y + dy, x + w + 1] - P[y + dy, x - w]
+    with w = r - |dy|. The end points of those rows lie on the four diagonal
+    edges of the diamond, so cumulative sums of P along both diagonal
+    directions give each edge in two lookups, eight per cell.
+    """
+    def __init__(self, shape, kind, radius, include_center=False):
+        rows, cols = shape
+        self.shape = shape
+        self.neighbourhood = (kind, radius, include_center)
+        self.include_center = include_center
+        self.radius = radius
+        if kind == 'moore':
+            # Board at (r, r); table[i, j] is the sum of padded[:i, :j]
+            self._offset = radius
+            self.padded = np.zeros((rows + 2 * radius, cols + 2 * radius), dtype=np.uint8)
+            table_shape = (rows + 2 * radius + 1, cols + 2 * radius + 1)
+        else:
+            # Board at (r + 1, r + 1); table[i, j] is the sum of padded[i, :j]
+            self._offset = radius + 1
+            self.padded = np.zeros((rows + 2 * radius + 1, cols + 2 * radius + 2), dtype=np.uint8)
+            table_shape = (rows + 2 * radius + 1, cols + 2 * radius + 3)
+        dtype = np.int32 if self.padded.size < 2**31 else np.int64
+        self.table = np.zeros(table_shape, dtype=dtype)
+        if kind != 'moore':
+            self._main = np.empty(table_shape, dtype=dtype)
+            self._anti = np.empty(table_shape, dtype=dtype)
+        self.counts = np.empty(shape, dtype=dtype)
+
+    def _window(self, array, dy, dx):
+        """
+        Entries of `array` at offset (dy, dx) from every cell of the board.
+        """
+        rows, cols = self.shape
+        y, x = self._offset + dy, self._offset + dx
+        return array[y:y + rows, x:x + cols]
+
+    def count(self, board):
+        """
+        Neighbour counts of the 0/1 uint8 board (cells outside it are dead).
+        The returned array is reused by the next call.
+        """
+        r = self.radius
+        table = self.table
+        counts = self.counts
+        win = self._window
+        win(self.padded, 0, 0)[:] = board
+
+        if self.neighbourhood[0] == 'moore':
+            inner = table[1:, 1:]
+            np.cumsum(self.padded, axis=1, dtype=table.dtype, out=inner)
+            np.cumsum(inner, axis=0, out=inner)
+            # Box sum: S[y + r + 1, x + r + 1] - S[y - r, x + r + 1] - S[y + r + 1, x - r] + S[y - r, x - r]
+            np.subtract(win(table, r + 1, r + 1), win(table, -r, r + 1), out=counts)
+            counts -= win(table, r + 1, -r)
+            counts += win(table, -r, -r)
+        else:
+            np.cumsum(self.padded, axis=1, dtype=table.dtype, out=table[:, 1:])
+            main, anti = self._main, self._anti
+            main[:] = table
+            anti[:] = table
+            # main[i, j] = P[i, j] + main[i - 1, j - 1]; anti[i, j] = P[i, j] + anti[i - 1, j + 1]
+            for i in range(1, table.shape[0]):
+                main[i, 1:] += main[i - 1, :-1]
+                anti[i, :-1] += anti[i - 1, 1:]
+            # Lower half (dy = 0..r): right ends on an anti-diagonal, left ends on a main diagonal
+            np.subtract(win(anti, r, 1), win(anti, -1, r + 2), out=counts)
+            counts -= win(main, r, 0)
+            counts += win(main, -1, -r - 1)
+            # Upper half (dy = -r..-1): right ends on a main diagonal, left ends on an anti-diagonal
+            counts += win(main, -1, r)
+            counts -= win(main, -r - 1, 0)
+            counts -= win(anti, -1, 1 - r)
+            counts += win(anti, -r - 1, 1)
+        if not self.include_center:
+            counts -= board
+        return counts
+
+@register_engine('ltl')
+class LargerThanLifeEngine:
+    """
+    Engine for Larger than Life rules (radius-r Moore or von Neumann
+    neighbourhoods with count ranges): counts come from IntegralCounter and
+    the rule is applied as one table lookup per cell. Classic rules are the
+    radius-1 Moore case and run unchanged.
+    """
+    any_neighbourhood = True
+
+    def __init__(self, game):
+        self.game = game
+        self._counter = None
+        self._rule = None
+
+    def advance(self, grid, generations):
+        rule = self.game.current_rule_set
+        neighbourhood = rule_neighbourhood(rule)
+        counter = self._counter
+        if counter is None or counter.shape != grid.shape or counter.neighbourhood != neighbourhood:
+            counter = self._counter = IntegralCounter(grid.shape, *neighbourhood)
+        if self._rule is not rule:
+            self._rule = rule
+            self._table = rule_table(rule)
+        table = self._table.ravel()
+        index = np.empty(grid.shape, dtype=counter.counts.dtype)
+        width = index.dtype.type(self._table.shape[1])
+
+        board = (grid != 0).astype(np.uint8)
+        for _ in range(generations):
+            counts = counter.count(board)
+            np.multiply(board, width, out=index)
+            index += counts
+            np.take(table, index, out=board)
+        return board.astype(grid.dtype)
@@ -0,0 +1,177 @@
+import numpy as np
+
+from .engines import StepBuffers, rule_bitmask
+from .rulesmanager import RULE_SETS, get_rule_set, is_life_like, rule_table
+
+# Generations computed per pass over the files (and halo rows read per band side)
+DEFAULT_FUSE = 8
+DEFAULT_MEMORY_BUDGET = 256 * 2**20
+
+# Scratch bytes per window cell: current and next band, padded copy and
+# neighbour counts (one byte each) plus the uint32 rule index
+BYTES_PER_CELL = 8
+
+def band_rows_for_budget(cols, memory_budget=DEFAULT_MEMORY_BUDGET, fuse=DEFAULT_FUSE):
+    """
+    Largest band height whose stepping window (band plus `fuse` halo rows
+    per side) fits in `memory_budget` bytes of scratch arrays.
+    """
+    rows = memory_budget // (BYTES_PER_CELL * cols) - 2 * fuse
+    if rows < 1:
+        raise ValueError(f"A memory budget of {memory_budget} bytes is too small for {cols} columns "
+                         f"with {fuse} fused generations.")
+    return int(rows)
+
+class OutOfCoreGrid:
+    """
+    Bounded board kept in two memory-mapped files instead of RAM.
+
+    The current and next generations are uint8 files `path`.0 and `path`.1.
+    A pass streams through the current file in row bands: each band is read
+    with `fuse` extra rows on each side, stepped `fuse` generations in
+    memory, and its own rows are written to the other file. Rows near the
+    window edge go wrong by one row per generation, so after `fuse` steps
+    exactly the halo is wrong and the band itself is exact (with fuse=1 this
+    is the plain one-row overlap). Fusing generations divides the file I/O
+    per generation by `fuse`, at the cost of recomputing the halo rows.
+
+    Only one band window is in memory at a time: band_rows defaults to what
+    fits in `memory_budget`. Like a GameOfLife instance, the board has
+    rows, cols, grid (the current file), current_rule_set, set_rule_set and
+    log, so the pattern loaders, save_grid_to_file, save_grid_to_rle and
+    SnapshotWriter.append accept it or its grid.
+    """
+    def __init__(self, path, rows, cols, rule_set_name='conway', band_rows=None,
+                 memory_budget=DEFAULT_MEMORY_BUDGET, fuse=DEFAULT_FUSE, verbose=True):
+        if not isinstance(rows, int) or not isinstance(cols, int) or rows <= 0 or cols <= 0:
+            raise ValueError("Grid dimensions (rows, cols) must be positive integers.")
+        if fuse < 1:
+            raise ValueError("fuse must be a positive integer.")
+        if band_rows is None:
+            band_rows = band_rows_for_budget(cols, memory_budget, fuse)
+        elif band_rows < 1:
+            raise ValueError("band_rows must be a positive integer.")
+
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.band_rows = min(band_rows, rows)
+        self.fuse = fuse
+        self.verbose = verbose
+        self.generation = 0
+        self.set_rule_set(rule_set_name)
+
+        # New files are zero-filled (sparse on most file systems): all cells dead
+        self.paths = [f"{path}.0", f"{path}.1"]
+        self._buffers = [np.memmap(filepath, dtype=np.uint8, mode='w+', shape=(rows, cols))
+                         for filepath in self.paths]
+        self._current = 0
+        self._scratch = None
+        self.log(f"Out-of-core grid initialized with dimensions {rows}x{cols} "
+                 f"({self.band_rows} rows per band, {fuse} generations per pass).")
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def set_rule_set(self, rule_set_name):
+        try:
+            self.current_rule_set = get_rule_set(rule_set_name)
+        except KeyError:
+            raise ValueError(f"Unknown rule set: {rule_set_name}. Available rule sets: {list(RULE_SETS.keys())}") from None
+        if not is_life_like(self.current_rule_set):
+            raise ValueError(f"{rule_set_name} is not a radius-1 Moore rule; only GameOfLife runs Larger than Life rules.")
+        self.rule_set_name = rule_set_name
+
+    @property
+    def grid(self):
+        """
+        The current generation as a writable memory-mapped array.
+        """
+        return self._buffers[self._current]
+
+    @property
+    def grid_path(self):
+        """
+        File holding the current generation.
+        """
+        return self.paths[self._current]
+
+    def bands(self):
+        """
+        (start, stop) row ranges of the bands, in order.
+        """
+        for lo in range(0, self.rows, self.band_rows):
+            yield lo, min(lo + self.band_rows, self.rows)
+
+    @property
+    def population(self):
+        grid = self.grid
+        return sum(int(np.count_nonzero(grid[lo:hi])) for lo, hi in self.bands())
+
+    # --------------------------------------------------------------
+    # Evolution
+    # --------------------------------------------------------------
+    def _window_buffers(self, shape):
+        # Every window has the same shape, so one set lasts for the whole run
+        if self._scratch is None or self._scratch[0].shape != shape:
+            self._scratch = (StepBuffers(shape), np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8))
+        return self._scratch
+
+    def _pass(self, generations, mask):
+        src = self._buffers[self._current]
+        dst = self._buffers[1 - self._current]
+        # Windows are band_rows + 2 * fuse rows, shifted inwards at the board
+        # edges: a window only has to reach `generations` rows past its band
+        height = min(self.band_rows + 2 * self.fuse, self.rows)
+        step_buffers, current, out = self._window_buffers((height, self.cols))
+        for lo, hi in self.bands():
+            w0 = min(max(lo - generations, 0), self.rows - height)
+            w1 = w0 + height
+            np.not_equal(src[w0:w1], 0, out=current, casting='unsafe')
+            for _ in range(generations):
+                step_buffers.step(current, out, mask)
+                current, out = out, current
+            dst[lo:hi] = current[lo - w0:hi - w0]
+        self._current = 1 - self._current
+
+    def advance(self, generations):
+        """
+        Advances the board, `fuse` generations per pass over the files.
+        """
+        mask = rule_bitmask(rule_table(self.current_rule_set))
+        remaining = generations
+        while remaining:
+            chunk = min(self.fuse, remaining)
+            self._pass(chunk, mask)
+            self.generation += chunk
+            remaining -= chunk
+
+    def update_grid(self):
+        self.advance(1)
+        self.log("Grid updated to the next generation.")
+
+    # --------------------------------------------------------------
+    # Files
+    # --------------------------------------------------------------
+    def flush(self):
+        """
+        Writes the current generation through to its file.
+        """
+        self.grid.flush()
+
+    def close(self):
+        """
+        Flushes and unmaps both files; the current generation stays in grid_path.
+        """
+        if self._buffers is None:
+            return
+        self.flush()
+        self._buffers = None
+        self._scratch = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
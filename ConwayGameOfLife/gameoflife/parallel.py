@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .engines import StepBuffers, rule_bitmask
+from .enginemanager import register_engine
+from .rulesmanager import rule_table
+
+# Generations computed per synchronisation (and halo rows read per side)
+DEFAULT_HALO = 4
+
+# Buffers handed to forked workers through inheritance instead of pickling
+_INHERITED = {}
+
+def _worker(conn, buffers, shape, lo, hi):
+    """
+    Worker process: owns rows [lo, hi) of the board.
+
+    For each request (src, generations, mask) it copies its band plus
+    `generations` halo rows per side from buffer `src`, steps that window
+    locally, and writes its own rows into the other buffer. Rows near the
+    window edge go wrong by one row per generation, so after `generations`
+    steps exactly the halo is wrong and the band itself is exact.
+    """
+    blocks = []
+    if isinstance(buffers, str):
+        # Forked worker: the mapped buffers were inherited from the parent
+        buffers = _INHERITED[buffers]
+    else:
+        # Spawned worker: attach to the shared blocks by name
+        blocks = [shared_memory.SharedMemory(name=name) for name in buffers]
+        buffers = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf) for block in blocks]
+
+    rows = shape[0]
+    scratch = {}
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            src, generations, mask = message
+
+            w0 = max(lo - generations, 0)
+            w1 = min(hi + generations, rows)
+            window = (w1 - w0, shape[1])
+            if window not in scratch:
+                scratch[window] = (StepBuffers(window), np.empty(window, dtype=np.uint8),
+                                   np.empty(window, dtype=np.uint8))
+            step_buffers, current, out = scratch[window]
+
+            current[:] = buffers[src][w0:w1]
+            for _ in range(generations):
+                step_buffers.step(current, out, mask)
+                current, out = out, current
+            buffers[1 - src][lo:hi] = current[lo - w0:hi - w0]
+            conn.send(True)
+    finally:
+        del buffers
+        for block in blocks:
+            block.close()
+
+def _shutdown(processes, connections, blocks):
+    for conn in connections:
+        try:
+            conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # Views still exist in this process; the mapping goes away with them
+            pass
+        block.unlink()
+
+@register_engine('parallel')
+class ParallelEngine:
+    """
+    Multi-core engine: the board is split into row bands, one persistent
+    worker process per band. Both generations live in shared memory
+    (double buffer), so workers exchange halo rows by reading their
+    neighbours' rows directly; the parent only sends one small message per
+    worker per synchronisation.
+
+    With halo h, each worker advances h generations per synchronisation
+    using h extra rows on each side. Results match the single-threaded
+    engines bit for bit.
+
+    Fusion only happens within one call: advance(grid, n) synchronises
+    once per `halo` generations, while update_grid() (one generation per
+    call) synchronises every generation. GameOfLife.advance(n), and
+    run_simulation on quiet games, pass many generations at once.
+    """
+    def __init__(self, game, workers=None, halo=DEFAULT_HALO):
+        self.game = game
+        self.workers = workers or os.cpu_count() or 1
+        self.halo = halo
+        self._shape = None
+        self._finalizer = None
+
+    def _start(self, shape):
+        self.close()
+        rows, cols = shape
+        workers = max(1, min(self.workers, rows))
+
+        self._blocks = [shared_memory.SharedMemory(create=True, size=rows * cols) for _ in range(2)]
+        self._buffers = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf) for block in self._blocks]
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        # Forked workers inherit the mapped buffers; spawned ones attach by name
+        if context.get_start_method() == 'fork':
+            shared = f"{os.getpid()}-{id(self)}"
+            _INHERITED[shared] = self._buffers
+        else:
+            shared = [block.name for block in self._blocks]
+
+        bounds = np.linspace(0, rows, workers + 1).astype(int)
+        self._connections = []
+        self._processes = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_worker,
+                                      args=(child_conn, shared, shape, int(lo), int(hi)),
+                                      daemon=True)
+            process.start()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+        if isinstance(shared, str):
+            del _INHERITED[shared]
+
+        self._shape = shape
+        self._finalizer = weakref.finalize(self, _shutdown, self._processes, self._connections, self._blocks)
+
+    def close(self):
+        """
+        Stops the worker processes and frees the shared memory.
+        """
+        if self._finalizer is not None:
+            self._buffers = None
+            self._finalizer()
+            self._finalizer = None
+            self._shape = None
+
+    def advance(self, grid, generations):
+        if self._shape != grid.shape:
+            self._start(grid.shape)
+        mask = rule_bitmask(rule_table(self.game.current_rule_set))
+
+        src = 0
+        self._buffers[src][:] = grid
+        remaining = generations
+        while remaining:
+            chunk = min(self.halo, remaining)
+            for conn in self._connections:
+                conn.send((src, chunk, mask))
+            for conn in self._connections:
+                conn.recv()
+            src = 1 - src
+            remaining -= chunk
+
+        return self._buffers[src].astype(grid.dtype)
@@ -1,5 +1,34 @@
+import os
 import re
 
+import numpy as np
+
+from .rulesmanager import canonical_rulestring, is_life_like, rule_table
+
+# Bytes read per parsing step of the streaming RLE and .cells readers
+CHUNK_SIZE = 1 << 20
+
+# Maximum line length of exported RLE files (the format's convention)
+RLE_LINE_LENGTH = 70
+
+# File extensions recognised by load_pattern_from_file
+PATTERN_FORMATS = {'.rle': 'rle', '.cells': 'cells'}
+
+_RLE_HEADER = re.compile(r'^\s*x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)\s*(?:,\s*rule\s*=\s*(\S+))?', re.IGNORECASE)
+_WHITESPACE = np.frombuffer(b' \t\r\n', dtype=np.uint8)
+
+def _as_bytes(data):
+    return data.encode('ascii') if isinstance(data, str) else data
+
+def _place_cells(game_instance, rows, cols):
+    """
+    Sets the given cells live in one vectorised assignment.
+    Returns the number of cells that fell outside the grid.
+    """
+    inside = (rows >= 0) & (rows < game_instance.rows) & (cols >= 0) & (cols < game_instance.cols)
+    game_instance.grid[rows[inside], cols[inside]] = 1
+    return int(inside.size - np.count_nonzero(inside))
+
 def load_pattern_from_string(game_instance, pattern_data_string):
     """
     Parses a string containing coordinate pairs and sets the corresponding cells to live
@@ -7,26 +36,264 @@ def load_pattern_from_string(game_instance, pattern_data_string):
     Expected format: '(row,col) (row,col) ...'
     """
     coordinates = re.findall(r'\((\d+),(\d+)\)', pattern_data_string)
+    cells = np.array(coordinates, dtype=np.int64).reshape(-1, 2)
+    rows, cols = cells[:, 0], cells[:, 1]
 
-    for row_str, col_str in coordinates:
-        row, col = int(row_str), int(col_str)
-        if 0 <= row < game_instance.rows and 0 <= col < game_instance.cols:
-            game_instance.grid[row, col] = 1
-        else:
-            print(f"Warning: Coordinate ({row},{col}) is out of grid bounds for {game_instance.rows}x{game_instance.cols} grid.")
-    print(f"Pattern loaded from string: {pattern_data_string}")
+    inside = (rows < game_instance.rows) & (cols < game_instance.cols)
+    for row, col in cells[~inside]:
+        print(f"Warning: Coordinate ({row},{col}) is out of grid bounds for {game_instance.rows}x{game_instance.cols} grid.")
+    game_instance.grid[rows[inside], cols[inside]] = 1
+    game_instance.log(f"Pattern loaded from string: {pattern_data_string}")
+
+# --------------------------------------------------------------
+# RLE
+# --------------------------------------------------------------
+def rle_rulestring(rule):
+    """
+    Normalises the rule of an RLE header to a rulestring get_rule_set accepts:
+    'B3/S23' stays as is, the old '23/3' (survival/birth) becomes 'S23/B3',
+    and a bounded-grid suffix such as ':T100,100' is dropped.
+    """
+    rule = rule.split(':')[0]
+    match = re.match(r'^(\d*)/(\d*)$', rule)
+    if match:
+        return f"S{match.group(1)}/B{match.group(2)}"
+    return rule
+
+def _rle_token_counts(data, tags):
+    """
+    Run count of every tag: the decimal number in front of it, or 1.
+    """
+    digits = np.flatnonzero((data >= ord('0')) & (data <= ord('9')))
+    owner = np.searchsorted(tags, digits)
+    power = tags[owner] - digits - 1
+    values = np.bincount(owner, weights=(data[digits] - ord('0')) * 10.0 ** power, minlength=tags.size)
+    has_count = np.bincount(owner, minlength=tags.size) > 0
+    return np.where(has_count, values.astype(np.int64), 1)
+
+class RLEReader:
+    """
+    Streaming reader for Life RLE files.
+
+    The '#' comment lines and the 'x = .., y = .., rule = ..' header are read
+    on construction. Iterating then parses the body CHUNK_SIZE bytes at a
+    time and yields (rows, cols) arrays of the live cells in each chunk;
+    tokens are decoded with array operations rather than one at a time.
+    """
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.width = None
+        self.height = None
+        self.rule = None
+        self.comments = []
+        self._pending = b''
+
+        while True:
+            line = _as_bytes(stream.readline())
+            if not line:
+                break
+            text = line.decode('ascii', 'replace').strip()
+            if not text:
+                continue
+            if text.startswith('#'):
+                self.comments.append(text)
+                continue
+            match = _RLE_HEADER.match(text)
+            if match:
+                self.width, self.height = int(match.group(1)), int(match.group(2))
+                self.rule = match.group(3)
+            else:
+                # No header: this line is already pattern data
+                self._pending = line
+            break
+
+    def __iter__(self):
+        row = col = 0
+        carry = self._pending
+        done = False
+        while not done:
+            chunk = _as_bytes(self.stream.read(self.chunk_size))
+            data = carry + chunk
+            done = not chunk
+            end = data.find(b'!')
+            if end >= 0:
+                data = data[:end]
+                done = True
+
+            data = np.frombuffer(data, dtype=np.uint8)
+            data = data[~np.isin(data, _WHITESPACE)]
+            tags = np.flatnonzero((data < ord('0')) | (data > ord('9')))
+            # A run count may continue in the next chunk
+            cut = tags[-1] + 1 if tags.size else 0
+            carry = b'' if done else data[cut:].tobytes()
+            if not tags.size:
+                continue
+            data = data[:cut]
 
-def load_pattern_from_file(game_instance, filepath):
+            counts = _rle_token_counts(data, tags)
+            kinds = data[tags]
+            newline = kinds == ord('$')
+            advance = np.where(newline, 0, counts)
+            row_step = np.where(newline, counts, 0)
+
+            # Position of every token: rows from the '$' counts, columns from
+            # the runs since the last '$' (or the carried column before it)
+            token_rows = row + np.cumsum(row_step) - row_step
+            end_cols = np.cumsum(advance)
+            line_start = np.maximum.accumulate(np.where(newline, end_cols, 0))
+            token_cols = end_cols - advance - line_start
+            token_cols[:np.argmax(newline) if newline.any() else tags.size] += col
+
+            live = ~newline & (kinds != ord('b')) & (kinds != ord('.'))
+            if live.any():
+                lengths = counts[live]
+                offsets = np.cumsum(lengths) - lengths
+                yield (np.repeat(token_rows[live], lengths),
+                       np.arange(lengths.sum()) + np.repeat(token_cols[live] - offsets, lengths))
+
+            row = int(token_rows[-1] + row_step[-1])
+            col = int(token_cols[-1] + advance[-1])
+
+def load_rle(game_instance, stream, top=0, left=0, apply_rule=True, chunk_size=CHUNK_SIZE):
+    """
+    Loads an RLE pattern from an open file (binary or text) into the grid,
+    with its top-left corner at (top, left). With apply_rule, the rule from
+    the header (if any) becomes the game's rule set. Returns the RLEReader.
+    """
+    reader = RLEReader(stream, chunk_size)
+    if apply_rule and reader.rule:
+        game_instance.set_rule_set(rle_rulestring(reader.rule))
+    dropped = 0
+    for rows, cols in reader:
+        dropped += _place_cells(game_instance, rows + top, cols + left)
+    if dropped:
+        print(f"Warning: {dropped} cells of the pattern are out of grid bounds for {game_instance.rows}x{game_instance.cols} grid.")
+    return reader
+
+def grid_to_rle(grid, rule=None, line_length=RLE_LINE_LENGTH):
+    """
+    Formats a grid as RLE text. The header covers the whole grid, so the
+    pattern keeps its position when loaded back at (0, 0).
+    """
+    rows, cols = grid.shape
+    header = f"x = {cols}, y = {rows}"
+    if rule is not None and not is_life_like(rule):
+        header += f", rule = {rule.rulestring}"
+    elif rule is not None:
+        table = rule_table(rule)
+        header += f", rule = {canonical_rulestring(np.flatnonzero(table[0]), np.flatnonzero(table[1]))}"
+
+    # Live runs as (row, start, stop) from the edges of each padded row
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = grid != 0
+    edges = np.diff(padded, axis=1)
+    run_rows, starts = np.nonzero(edges == 1)
+    stops = np.nonzero(edges == -1)[1]
+
+    previous_rows = np.concatenate(([0], run_rows[:-1]))
+    previous_stops = np.concatenate(([0], stops[:-1]))
+    new_line = run_rows != previous_rows
+    line_breaks = run_rows - previous_rows
+    gaps = np.where(new_line, starts, starts - previous_stops)
+
+    def token(count, tag):
+        return tag if count == 1 else f"{count}{tag}"
+
+    tokens = []
+    for breaks, gap, length in zip(line_breaks.tolist(), gaps.tolist(), (stops - starts).tolist()):
+        if breaks:
+            tokens.append(token(breaks, '$'))
+        if gap:
+            tokens.append(token(gap, 'b'))
+        tokens.append(token(length, 'o'))
+    tokens.append('!')
+
+    lines, current = [], ''
+    for item in tokens:
+        if len(current) + len(item) > line_length:
+            lines.append(current)
+            current = ''
+        current += item
+    lines.append(current)
+    return header + '\n' + '\n'.join(lines) + '\n'
+
+# --------------------------------------------------------------
+# Plaintext (.cells)
+# --------------------------------------------------------------
+def iter_plaintext_cells(stream, chunk_size=CHUNK_SIZE):
+    """
+    Streams a plaintext (.cells) pattern: '!' lines are comments, 'O' (or '*')
+    is a live cell and any other character is dead. Yields (rows, cols)
+    arrays of the live cells, one pair per chunk of complete lines.
+    """
+    row = 0
+    carry = b''
+    done = False
+    while not done:
+        chunk = _as_bytes(stream.read(chunk_size))
+        data = carry + chunk
+        done = not chunk
+        if done:
+            if not data:
+                break
+            if not data.endswith(b'\n'):
+                data += b'\n'
+        cut = data.rfind(b'\n') + 1
+        data, carry = data[:cut], data[cut:]
+        if not data:
+            continue
+
+        data = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(data == ord('\n'))
+        line_starts = np.concatenate(([0], newlines[:-1] + 1))
+        pattern_line = data[line_starts] != ord('!')
+        line_rows = row + np.cumsum(pattern_line) - 1
+
+        live = np.flatnonzero((data == ord('O')) | (data == ord('*')))
+        lines = np.searchsorted(newlines, live)
+        keep = pattern_line[lines]
+        lines = lines[keep]
+        yield line_rows[lines], live[keep] - line_starts[lines]
+        row += int(np.count_nonzero(pattern_line))
+
+def load_plaintext(game_instance, stream, top=0, left=0, chunk_size=CHUNK_SIZE):
+    """
+    Loads a plaintext (.cells) pattern into the grid with its top-left corner at (top, left).
+    """
+    dropped = 0
+    for rows, cols in iter_plaintext_cells(stream, chunk_size):
+        dropped += _place_cells(game_instance, rows + top, cols + left)
+    if dropped:
+        print(f"Warning: {dropped} cells of the pattern are out of grid bounds for {game_instance.rows}x{game_instance.cols} grid.")
+
+# --------------------------------------------------------------
+# Files
+# --------------------------------------------------------------
+def load_pattern_from_file(game_instance, filepath, pattern_format=None):
     """
     Loads a pattern from a specified file and applies it to the game_instance's grid.
-    The file content is expected to be in the format parsable by load_pattern_from_string.
+    The format ('coordinates', 'rle' or 'cells') defaults to the one implied by
+    the file extension: .rle and .cells files are standard Life patterns, anything
+    else is expected in the format parsable by load_pattern_from_string.
     """
+    if pattern_format is None:
+        pattern_format = PATTERN_FORMATS.get(os.path.splitext(filepath)[1].lower(), 'coordinates')
     try:
-        with open(filepath, 'r') as f:
-            pattern_string = f.read().strip()
-        load_pattern_from_string(game_instance, pattern_string)
-        print(f"Pattern successfully loaded from file: {filepath}")
+        if pattern_format == 'rle':
+            with open(filepath, 'rb') as f:
+                load_rle(game_instance, f)
+        elif pattern_format == 'cells':
+            with open(filepath, 'rb') as f:
+                load_plaintext(game_instance, f)
+        elif pattern_format == 'coordinates':
+            with open(filepath, 'r') as f:
+                pattern_string = f.read().strip()
+            load_pattern_from_string(game_instance, pattern_string)
+        else:
+            raise ValueError(f"Unknown pattern format: {pattern_format}. Expected 'coordinates', 'rle' or 'cells'.")
+        game_instance.log(f"Pattern successfully loaded from file: {filepath}")
     except FileNotFoundError:
         print(f"Error: File not found at {filepath}")
     except Exception as e:
-        print(f"An error occurred while loading pattern from file {filepath}: {e}")
\ No newline at end of file
+        print(f"An error occurred while loading pattern from file {filepath}: {e}")
@@ -0,0 +1,86 @@
+from math import gcd
+
+import numpy as np
+
+class Pipeline:
+    """
+    Runs a game through GameOfLife.generations() and hands boards to
+    subscribed stages.
+
+    A stage is any callable stage(generation, board), subscribed with an
+    interval: it only sees generations divisible by `every`. The iterator
+    only stops for generations some stage wants, and boards are passed as
+    read-only views, so nothing is copied unless a stage copies it itself.
+    Stages with a close() method are closed when the run ends.
+    """
+    def __init__(self):
+        self.stages = []
+
+    def add(self, stage, every=1):
+        if every < 1:
+            raise ValueError("every must be a positive integer.")
+        self.stages.append((every, stage))
+        return stage
+
+    def stage(self, every=1):
+        """
+        Decorator form of add().
+        """
+        def decorator(func):
+            return self.add(func, every)
+        return decorator
+
+    def run(self, game, num_generations):
+        every = 0
+        for interval, _ in self.stages:
+            every = gcd(every, interval)
+        # With no stages, `every` is past the last generation: nothing is yielded
+        every = every or game.generation + num_generations + 1
+        try:
+            for generation, board in game.generations(num_generations, every=every):
+                for interval, stage in self.stages:
+                    if generation % interval == 0:
+                        stage(generation, board)
+        finally:
+            for _, stage in self.stages:
+                close = getattr(stage, 'close', None)
+                if close is not None:
+                    close()
+        return game
+
+# --------------------------------------------------------------
+# Stages
+# --------------------------------------------------------------
+class SnapshotStage:
+    """
+    Appends boards to a SnapshotWriter (which packs them, without a copy of the board).
+    """
+    def __init__(self, writer, close_writer=True):
+        self.writer = writer
+        self.close_writer = close_writer
+
+    def __call__(self, generation, board):
+        self.writer.append(board, generation=generation)
+
+    def close(self):
+        if self.close_writer:
+            self.writer.close()
+
+class PopulationTrace:
+    """
+    Records (generation, population) pairs.
+    """
+    def __init__(self):
+        self.generations = []
+        self.populations = []
+
+    def __call__(self, generation, board):
+        self.generations.append(generation)
+        self.populations.append(int(np.count_nonzero(board)))
+
+class PrintStage:
+    """
+    Prints each board it receives, like main.py does between generations.
+    """
+    def __call__(self, generation, board):
+        print(f"\nGrid State after {generation} update(s):\n", board)
@@ -48,4 +48,8 @@ def apply_superlife_rules(cell_state, live_neighbors):
         if live_neighbors in [3, 2, 4, 5, 8, 7, 6]:
             return 1  # Born
         else:
-            return 0  # Remains dead
\ No newline at end of file
+            return 0  # Remains dead
+
+# Larger than Life rules (radius-r neighbourhoods, run with the 'ltl' engine)
+register_rule_set('bosco', 'R5,C0,M1,S34..58,B34..45,NM')
+register_rule_set('majority', 'R4,C0,M1,S41..81,B41..81,NM')
@@ -1,10 +1,216 @@
+import functools
+import re
+
+import numpy as np
+
 RULE_SETS = {}
+RULE_TABLES = {}
+
+# Unregistered rulestrings kept compiled at a time
+RULESTRING_CACHE_SIZE = 256
+
+# B3/S23 (birth/survival) and the older S23/B3 order
+_BS_RULESTRING = re.compile(r'^\s*B([0-8]*)\s*/\s*S([0-8]*)\s*$', re.IGNORECASE)
+_SB_RULESTRING = re.compile(r'^\s*S([0-8]*)\s*/\s*B([0-8]*)\s*$', re.IGNORECASE)
+# Larger than Life: R5,C0,M1,S34..58,B34..45,NM (radius, states, middle cell
+# counted, survival and birth ranges, Moore or von Neumann neighbourhood)
+_LTL_RULESTRING = re.compile(r'^\s*R(\d+)\s*,\s*C([02])\s*,\s*M([01])\s*,\s*S(\d+)\.\.(\d+)\s*,'
+                             r'\s*B(\d+)\.\.(\d+)\s*,\s*N([MN])\s*$', re.IGNORECASE)
+
+NEIGHBOURHOODS = ('moore', 'vonneumann')
+# Neighbourhood of rule functions without neighbourhood attributes
+LIFE_NEIGHBOURHOOD = ('moore', 1, False)
+
+def rule_neighbourhood(rule):
+    """
+    (kind, radius, include_center) of a rule function. Classic rules count the
+    8 cells around a cell; Larger than Life rules carry neighbourhood,
+    radius and include_center attributes.
+    """
+    return (getattr(rule, 'neighbourhood', 'moore'), getattr(rule, 'radius', 1),
+            getattr(rule, 'include_center', False))
+
+def is_life_like(rule):
+    """
+    True if the rule counts the radius-1 Moore neighbourhood (0 to 8 neighbors).
+    """
+    return rule_neighbourhood(rule) == LIFE_NEIGHBOURHOOD
+
+def neighbourhood_size(kind, radius, include_center=False):
+    """
+    Number of cells a neighbourhood counts: (2r + 1)^2 for Moore and
+    2r(r + 1) + 1 for von Neumann, minus the cell itself unless included.
+    """
+    cells = (2 * radius + 1) ** 2 if kind == 'moore' else 2 * radius * (radius + 1) + 1
+    return cells if include_center else cells - 1
 
-def register_rule_set(name):
+def compile_rule(func, max_neighbors=None):
+    """
+    Tabulates a rule function over its whole finite domain.
+    Returns a (2, max_neighbors + 1) uint8 table where table[state, n] is the
+    next state of a cell in `state` with n live neighbors. max_neighbors
+    defaults to the size of the rule's neighbourhood (8 for classic rules).
+    """
+    if max_neighbors is None:
+        max_neighbors = neighbourhood_size(*rule_neighbourhood(func))
+    table = np.zeros((2, max_neighbors + 1), dtype=np.uint8)
+    for state in (0, 1):
+        for live_neighbors in range(max_neighbors + 1):
+            result = func(state, live_neighbors)
+            if result not in (0, 1):
+                raise ValueError(f"Rule {func.__name__} returned {result!r} for "
+                                 f"({state}, {live_neighbors}); rules must return 0 or 1.")
+            table[state, live_neighbors] = result
+    return table
+
+def parse_rulestring(rulestring):
+    """
+    Parses a 'B3/S23' (or 'S23/B3') rulestring.
+    Returns (birth, survival) as frozensets of neighbor counts.
+    """
+    match = _BS_RULESTRING.match(rulestring)
+    if match:
+        birth, survival = match.groups()
+    else:
+        match = _SB_RULESTRING.match(rulestring)
+        if not match:
+            raise ValueError(f"Invalid rulestring: {rulestring}. Expected the form 'B3/S23'.")
+        survival, birth = match.groups()
+    return frozenset(int(n) for n in birth), frozenset(int(n) for n in survival)
+
+def is_rulestring(text):
+    """
+    True if text is a B/S rulestring such as 'B36/S23'.
+    """
+    return bool(_BS_RULESTRING.match(text) or _SB_RULESTRING.match(text))
+
+def canonical_rulestring(birth, survival):
+    """
+    Formats birth/survival counts as 'B<digits>/S<digits>'.
+    """
+    return 'B' + ''.join(str(n) for n in sorted(birth)) + '/S' + ''.join(str(n) for n in sorted(survival))
+
+def parse_ltl_rulestring(rulestring):
+    """
+    Parses a Larger than Life rulestring such as 'R5,C0,M1,S34..58,B34..45,NM'.
+    Returns (radius, include_center, (birth low, high), (survival low, high), neighbourhood).
+    """
+    match = _LTL_RULESTRING.match(rulestring)
+    if not match:
+        raise ValueError(f"Invalid Larger than Life rulestring: {rulestring}. "
+                         f"Expected the form 'R5,C0,M1,S34..58,B34..45,NM'.")
+    radius, _, middle, s_low, s_high, b_low, b_high, kind = match.groups()
+    radius = int(radius)
+    if radius < 1:
+        raise ValueError("The neighbourhood radius must be at least 1.")
+    return (radius, middle == '1', (int(b_low), int(b_high)), (int(s_low), int(s_high)),
+            'moore' if kind.upper() == 'M' else 'vonneumann')
+
+def is_ltl_rulestring(text):
+    """
+    True if text is a Larger than Life rulestring such as 'R5,C0,M1,S34..58,B34..45,NM'.
+    """
+    return bool(_LTL_RULESTRING.match(text))
+
+def canonical_ltl_rulestring(radius, include_center, birth, survival, neighbourhood):
+    return (f"R{radius},C0,M{int(include_center)},S{survival[0]}..{survival[1]},"
+            f"B{birth[0]}..{birth[1]},N{'M' if neighbourhood == 'moore' else 'N'}")
+
+def rule_from_ltl_rulestring(rulestring):
+    """
+    Builds a Larger than Life rule function: a dead cell is born when its
+    count lies in the birth range, a live cell survives when its count lies
+    in the survival range. The neighbourhood is attached as attributes.
+    """
+    radius, include_center, birth, survival, neighbourhood = parse_ltl_rulestring(rulestring)
+
+    def apply_ltl(cell_state, live_neighbors):
+        low, high = survival if cell_state == 1 else birth
+        return 1 if low <= live_neighbors <= high else 0
+
+    apply_ltl.neighbourhood = neighbourhood
+    apply_ltl.radius = radius
+    apply_ltl.include_center = include_center
+    apply_ltl.rulestring = canonical_ltl_rulestring(radius, include_center, birth, survival, neighbourhood)
+    apply_ltl.__doc__ = f"Larger than Life rule {apply_ltl.rulestring}."
+    return apply_ltl
+
+def rule_from_rulestring(rulestring):
+    """
+    Builds a rule function (cell_state, live_neighbors) from a B/S rulestring
+    (or a Larger than Life rulestring).
+    """
+    if is_ltl_rulestring(rulestring):
+        return rule_from_ltl_rulestring(rulestring)
+    birth, survival = parse_rulestring(rulestring)
+
+    def apply_rulestring(cell_state, live_neighbors):
+        if cell_state == 1:
+            return 1 if live_neighbors in survival else 0
+        return 1 if live_neighbors in birth else 0
+
+    apply_rulestring.__doc__ = f"Outer-totalistic rule {canonical_rulestring(birth, survival)}."
+    return apply_rulestring
+
+def _register(name, func):
+    table = compile_rule(func)
+    RULE_SETS[name] = func
+    RULE_TABLES[name] = table
+    # Engines look the table up from the rule function itself
+    func.rule_table = table
+    return func
+
+def register_rule_set(name, rulestring=None):
     """
     A decorator to register a rule set function.
+    The rule is tabulated into RULE_TABLES at registration time.
+
+    With a rulestring, the rule is registered directly instead:
+        register_rule_set('highlife', 'B36/S23')
+        register_rule_set('bosco', 'R5,C0,M1,S34..58,B34..45,NM')
     """
+    if rulestring is not None:
+        return _register(name, rule_from_rulestring(rulestring))
+
     def decorator(func):
-        RULE_SETS[name] = func
-        return func
-    return decorator
\ No newline at end of file
+        return _register(name, func)
+    return decorator
+
+@functools.lru_cache(maxsize=RULESTRING_CACHE_SIZE)
+def _compiled_rulestring(canonical):
+    """
+    Rule function with its lookup table for a canonical rulestring. Cached
+    but not registered, so surveys over many rules keep RULE_SETS small.
+    """
+    func = rule_from_rulestring(canonical)
+    func.rule_table = compile_rule(func)
+    return func
+
+def get_rule_set(name):
+    """
+    Looks up a registered rule set. B/S and Larger than Life rulestrings
+    that are not registered are compiled on use (from a bounded cache keyed
+    by their canonical form) without being added to RULE_SETS.
+    Raises KeyError if the name is neither registered nor a rulestring.
+    """
+    if name in RULE_SETS:
+        return RULE_SETS[name]
+    if is_rulestring(name):
+        canonical = canonical_rulestring(*parse_rulestring(name))
+    elif is_ltl_rulestring(name):
+        canonical = canonical_ltl_rulestring(*parse_ltl_rulestring(name))
+    else:
+        raise KeyError(name)
+    if canonical in RULE_SETS:
+        return RULE_SETS[canonical]
+    return _compiled_rulestring(canonical)
+
+def rule_table(rule):
+    """
+    Lookup table for a rule function: the one compiled at registration,
+    or a freshly compiled one for unregistered functions.
+    """
+    table = getattr(rule, 'rule_table', None)
+    if table is None:
+        table = compile_rule(rule)
+    return table
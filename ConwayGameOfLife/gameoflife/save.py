@@ -1,16 +1,45 @@
-import os
-import glob
+import numpy as np
+
+from .patterns import grid_to_rle
+
+# Cells formatted per write by save_grid_to_file
+TEXT_BAND_CELLS = 1 << 22
+
+def format_grid_text(grid):
+    """
+    Formats a grid as text: one line per row, '1' for live and '0' for dead cells.
+    Built as one byte array instead of one Python string per cell.
+    """
+    rows, cols = grid.shape
+    text = np.full((rows, cols + 1), ord('\n'), dtype=np.uint8)
+    text[:, :cols] = np.where(grid == 1, ord('1'), ord('0'))
+    return text.tobytes().decode('ascii')
 
 def save_grid_to_file(game_instance, filepath):
     """
     Saves the current state of the grid to a file.
+    The text is formatted in bands of rows, so memory-mapped boards are
+    never converted as a whole.
     """
+    grid = game_instance.grid
+    band = max(1, TEXT_BAND_CELLS // grid.shape[1])
     # Now save normally
     try:
         with open(filepath, 'w') as f:
-            for r in range(game_instance.rows):
-                line = ''.join(['1' if cell == 1 else '0' for cell in game_instance.grid[r, :]])
-                f.write(line + '\n')
-        print(f"Grid state successfully saved to file: {filepath}")
-    except Exception as e:
+            for start in range(0, grid.shape[0], band):
+                f.write(format_grid_text(grid[start:start + band]))
+        game_instance.log(f"Grid state successfully saved to file: {filepath}")
+    except OSError as e:
         print(f"An error occurred while saving grid to file {filepath}: {e}")
+
+def save_grid_to_rle(game_instance, filepath):
+    """
+    Saves the current state of the grid to a file in Life RLE format,
+    with the game's rule in the header.
+    """
+    try:
+        with open(filepath, 'w') as f:
+            f.write(grid_to_rle(game_instance.grid, game_instance.current_rule_set))
+        game_instance.log(f"Grid state successfully saved to RLE file: {filepath}")
+    except OSError as e:
+        print(f"An error occurred while saving grid to RLE file {filepath}: {e}")
@@ -0,0 +1,247 @@
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+from .save import format_grid_text
+
+# File layout:
+#   header  : magic, rows, cols, keyframe interval, flags
+#   records : one per stored generation: a RECORD header (generation, payload
+#             length, kind, CRC-32 of the payload) and the payload (keyframe
+#             or delta), optionally zlib-compressed
+#   index   : one INDEX_DTYPE entry per record (offsets point at payloads)
+#   trailer : index offset, record count, magic
+# The index is only written by close(); without it (a crashed run) the
+# reader rebuilds it from the record headers. GOLSNAP1 files have no record
+# headers and need their index.
+MAGIC = b'GOLSNAP2'
+MAGIC_V1 = b'GOLSNAP1'
+INDEX_MAGIC = b'GOLINDEX'
+HEADER = struct.Struct('<8sQQII')
+RECORD = struct.Struct('<QQII')
+TRAILER = struct.Struct('<QQ8s')
+INDEX_DTYPE = np.dtype([('generation', '<u8'), ('offset', '<u8'), ('length', '<u8'), ('kind', '<u8')])
+
+FLAG_ZLIB = 1
+KEYFRAME = 0
+DELTA = 1
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+
+# Cells packed per slice by _pack
+PACK_CELLS = 1 << 24
+
+def _pack(grid):
+    # Packed in slices (a multiple of 8 cells), so memory-mapped boards are never converted as a whole
+    flat = np.asarray(grid).reshape(-1)
+    packed = np.empty((flat.size + 7) // 8, dtype=np.uint8)
+    for start in range(0, flat.size, PACK_CELLS):
+        packed[start // 8:(start + PACK_CELLS) // 8] = np.packbits(flat[start:start + PACK_CELLS] != 0,
+                                                                  bitorder='little')
+    return packed
+
+class SnapshotWriter:
+    """
+    Writes many generations of one board into a single file.
+
+    Every `keyframe_interval`-th record is a bit-packed keyframe; the
+    records in between store only the bytes that changed since the previous
+    generation (positions and XOR values of the packed board). With
+    compress=True every record is also zlib-compressed.
+    """
+    def __init__(self, filepath, rows, cols, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, compress=True):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be a positive integer.")
+        self.filepath = filepath
+        self.rows = rows
+        self.cols = cols
+        self.keyframe_interval = keyframe_interval
+        self.compress = compress
+        self._file = open(filepath, 'wb')
+        self._file.write(HEADER.pack(MAGIC, rows, cols, keyframe_interval, FLAG_ZLIB if compress else 0))
+        self._index = []
+        self._previous = None
+        # Delta positions are stored as uint32 unless the packed board is bigger
+        self._position_dtype = '<u4' if (rows * cols + 7) // 8 < 2**32 else '<u8'
+
+    def append(self, grid, generation=None):
+        """
+        Stores the grid. Generation numbers default to 0, 1, 2, ... and must increase.
+        """
+        if grid.shape != (self.rows, self.cols):
+            raise ValueError(f"Grid shape {grid.shape} does not match snapshot shape {(self.rows, self.cols)}.")
+        if generation is None:
+            generation = self._index[-1][0] + 1 if self._index else 0
+        elif self._index and generation <= self._index[-1][0]:
+            raise ValueError(f"Generation {generation} is not after generation {self._index[-1][0]}.")
+
+        packed = _pack(grid)
+        if self._previous is None or len(self._index) % self.keyframe_interval == 0:
+            kind = KEYFRAME
+            payload = packed.tobytes()
+        else:
+            kind = DELTA
+            changed = np.flatnonzero(packed != self._previous)
+            payload = (struct.pack('<Q', len(changed))
+                       + changed.astype(self._position_dtype).tobytes()
+                       + (packed[changed] ^ self._previous[changed]).tobytes())
+        self._previous = packed
+
+        if self.compress:
+            payload = zlib.compress(payload, 1)
+        self._file.write(RECORD.pack(generation, len(payload), kind, zlib.crc32(payload)))
+        offset = self._file.tell()
+        self._file.write(payload)
+        # Hand every record to the OS, so a crashed run keeps what it wrote
+        self._file.flush()
+        self._index.append((generation, offset, len(payload), kind))
+
+    def close(self):
+        """
+        Writes the index footer and closes the file.
+        """
+        if self._file is None:
+            return
+        index = np.array(self._index, dtype=INDEX_DTYPE)
+        index_offset = self._file.tell()
+        self._file.write(index.tobytes())
+        self._file.write(TRAILER.pack(index_offset, len(index), INDEX_MAGIC))
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class SnapshotReader:
+    """
+    Random access to a snapshot file. The file is memory-mapped, and reading
+    generation N decodes its keyframe plus at most keyframe_interval - 1 deltas.
+
+    If the index footer is missing or damaged (the writer was never closed),
+    the index is rebuilt by walking the record headers up to the first
+    incomplete or corrupt record; `recovered` is then True.
+    """
+    def __init__(self, filepath):
+        self._file = open(filepath, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{filepath} is empty, not a Game of Life snapshot file.") from None
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{filepath} is not a Game of Life snapshot file.")
+        magic, self.rows, self.cols, self.keyframe_interval, flags = HEADER.unpack_from(self._map, 0)
+        if magic not in (MAGIC, MAGIC_V1):
+            self.close()
+            raise ValueError(f"{filepath} is not a Game of Life snapshot file.")
+        self.compressed = bool(flags & FLAG_ZLIB)
+
+        self.recovered = False
+        self.index = self._read_footer()
+        if self.index is None:
+            if magic == MAGIC_V1:
+                self.close()
+                raise ValueError(f"{filepath} has no index footer (was the writer closed?).")
+            self.index = self._scan_records()
+            self.recovered = True
+        self._packed_size = (self.rows * self.cols + 7) // 8
+        self._position_dtype = '<u4' if self._packed_size < 2**32 else '<u8'
+
+    def _read_footer(self):
+        """
+        The index from the footer, or None if there is no intact footer.
+        """
+        size = len(self._map)
+        if size < HEADER.size + TRAILER.size:
+            return None
+        index_offset, count, index_magic = TRAILER.unpack_from(self._map, size - TRAILER.size)
+        if index_magic != INDEX_MAGIC or index_offset < HEADER.size:
+            return None
+        if index_offset + count * INDEX_DTYPE.itemsize + TRAILER.size != size:
+            return None
+        return np.frombuffer(self._map, dtype=INDEX_DTYPE, count=count, offset=index_offset).copy()
+
+    def _scan_records(self):
+        """
+        Rebuilds the index from the record headers. Stops at the first record
+        that is cut short, fails its checksum or breaks the generation order.
+        """
+        entries = []
+        offset = HEADER.size
+        end = len(self._map)
+        while offset + RECORD.size <= end:
+            generation, length, kind, crc = RECORD.unpack_from(self._map, offset)
+            start = offset + RECORD.size
+            if kind not in (KEYFRAME, DELTA) or start + length > end:
+                break
+            if entries and generation <= entries[-1][0]:
+                break
+            if not entries and kind != KEYFRAME:
+                break
+            if zlib.crc32(self._map[start:start + length]) != crc:
+                break
+            entries.append((generation, start, length, kind))
+            offset = start + length
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    @property
+    def generations(self):
+        return self.index['generation']
+
+    def __len__(self):
+        return len(self.index)
+
+    def _payload(self, i):
+        entry = self.index[i]
+        start = int(entry['offset'])
+        data = self._map[start:start + int(entry['length'])]
+        return zlib.decompress(data) if self.compressed else data
+
+    def _apply_delta(self, packed, payload):
+        (count,) = struct.unpack_from('<Q', payload, 0)
+        positions = np.frombuffer(payload, dtype=self._position_dtype, count=count, offset=8)
+        values = np.frombuffer(payload, dtype=np.uint8, count=count,
+                               offset=8 + count * np.dtype(self._position_dtype).itemsize)
+        packed[positions] ^= values
+
+    def read(self, generation, dtype=int):
+        """
+        Returns the grid stored for `generation`.
+        """
+        i = int(np.searchsorted(self.index['generation'], generation))
+        if i >= len(self.index) or self.index['generation'][i] != generation:
+            raise KeyError(f"Generation {generation} is not stored in this snapshot file.")
+
+        keyframes = np.flatnonzero(self.index['kind'][:i + 1] == KEYFRAME)
+        first = int(keyframes[-1])
+        packed = np.frombuffer(self._payload(first), dtype=np.uint8).copy()
+        for j in range(first + 1, i + 1):
+            self._apply_delta(packed, self._payload(j))
+
+        cells = np.unpackbits(packed, count=self.rows * self.cols, bitorder='little')
+        return cells.reshape(self.rows, self.cols).astype(dtype)
+
+    def export_text(self, generation, filepath):
+        """
+        Writes one generation in the same text format as save_grid_to_file.
+        """
+        with open(filepath, 'w') as f:
+            f.write(format_grid_text(self.read(generation)))
+
+    def close(self):
+        self.index = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,151 @@
+import csv
+import json
+
+import numpy as np
+
+# Fields of one per-generation record, in order
+STAT_FIELDS = ['generation', 'population', 'births', 'deaths', 'top', 'left', 'bottom', 'right', 'seconds']
+
+def bounding_box(grid):
+    """
+    (top, left, bottom, right) of the live cells (inclusive), or None if there are none.
+    """
+    live_rows = np.flatnonzero(grid.any(axis=1))
+    if not live_rows.size:
+        return None
+    live_cols = np.flatnonzero(grid.any(axis=0))
+    return (int(live_rows[0]), int(live_cols[0]), int(live_rows[-1]), int(live_cols[-1]))
+
+class StatsRecorder:
+    """
+    Per-generation statistics, kept up to date from each step's changes.
+
+    One comparison of the old and new board gives the changed cells; births
+    and deaths are counted among those, the population is updated by their
+    difference, and the bounding box grows by the births and only shrinks
+    (checking its edge rows and columns) when a death is on an edge.
+    A full scan only happens when the board was replaced between steps.
+    """
+    def __init__(self, grid):
+        self.sinks = []
+        self.resync(grid)
+
+    def resync(self, grid):
+        self._last = grid
+        self.population = int(np.count_nonzero(grid))
+        self.bbox = bounding_box(grid)
+
+    def _shrink(self, grid, top, left, bottom, right):
+        while not grid[top, left:right + 1].any():
+            top += 1
+        while not grid[bottom, left:right + 1].any():
+            bottom -= 1
+        while not grid[top:bottom + 1, left].any():
+            left += 1
+        while not grid[top:bottom + 1, right].any():
+            right -= 1
+        return (top, left, bottom, right)
+
+    def _update_bbox(self, new, born, died):
+        if self.population == 0:
+            self.bbox = None
+            return
+        cols = new.shape[1]
+        if self.bbox is None:
+            top, left, bottom, right = new.shape[0], cols, -1, -1
+        else:
+            top, left, bottom, right = self.bbox
+        if born.size:
+            rows, columns = np.divmod(born, cols)
+            top, bottom = min(top, int(rows.min())), max(bottom, int(rows.max()))
+            left, right = min(left, int(columns.min())), max(right, int(columns.max()))
+        if died.size:
+            rows, columns = np.divmod(died, cols)
+            if rows.min() == top or rows.max() == bottom or columns.min() == left or columns.max() == right:
+                top, left, bottom, right = self._shrink(new, top, left, bottom, right)
+        self.bbox = (top, left, bottom, right)
+
+    def record(self, generation, old, new, seconds):
+        """
+        Updates the statistics for the step old -> new and passes the record to every sink.
+        """
+        if old is not self._last:
+            self.resync(old)
+        changed = np.flatnonzero(new != old)
+        alive = np.ravel(new)[changed] != 0
+        born = changed[alive]
+        died = changed[~alive]
+        self.population += born.size - died.size
+        self._update_bbox(new, born, died)
+        self._last = new
+
+        top, left, bottom, right = self.bbox if self.bbox is not None else (None, None, None, None)
+        record = {
+            'generation': generation,
+            'population': self.population,
+            'births': int(born.size),
+            'deaths': int(died.size),
+            'top': top,
+            'left': left,
+            'bottom': bottom,
+            'right': right,
+            'seconds': seconds,
+        }
+        for sink in self.sinks:
+            sink.write(record)
+        return record
+
+# --------------------------------------------------------------
+# Sinks
+# --------------------------------------------------------------
+class MemorySink:
+    """
+    Keeps the records as an in-memory time series, one list per field.
+    """
+    def __init__(self):
+        self.series = {field: [] for field in STAT_FIELDS}
+
+    def write(self, record):
+        for field in STAT_FIELDS:
+            self.series[field].append(record[field])
+
+    def __len__(self):
+        return len(self.series['generation'])
+
+    def as_arrays(self):
+        """
+        The series as numpy arrays; missing bounding boxes (empty board) become -1.
+        """
+        return {field: np.array([-1 if value is None else value for value in values])
+                for field, values in self.series.items()}
+
+    def close(self):
+        pass
+
+class CSVSink:
+    """
+    Writes one CSV row per record; an empty board has empty bounding-box cells.
+    """
+    def __init__(self, filepath):
+        self._file = open(filepath, 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=STAT_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, record):
+        self._writer.writerow(record)
+
+    def close(self):
+        self._file.close()
+
+class JSONLinesSink:
+    """
+    Writes one JSON object per line and record.
+    """
+    def __init__(self, filepath):
+        self._file = open(filepath, 'w')
+
+    def write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+
+    def close(self):
+        self._file.close()
@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 import importlib
+import os
 
 from .gol import GameOfLife
 from .rules import apply_conway_rules, apply_highlife_rules
@@ -184,4 +185,985 @@ def test_run_simulation_output(capsys):
     # The console output is not captured or asserted here to simplify.
     # Verify grid state after simulation (blinker should return to initial state after 2 generations)
     expected_grid_after_2_gens = np.array([[0,0,0], [1,1,1], [0,0,0]])
-    assert np.array_equal(game.grid, expected_grid_after_2_gens)
\ No newline at end of file
+    assert np.array_equal(game.grid, expected_grid_after_2_gens)
+# Test engines
+def _random_grid(rows, cols, density=0.35, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.random((rows, cols)) < density).astype(int)
+
+def test_numpy_engine_matches_python_engine():
+    for rule_name in ['conway', 'highlife', 'superlife']:
+        for shape in [(1, 1), (1, 7), (6, 1), (9, 13)]:
+            reference = GameOfLife(*shape, rule_set_name=rule_name)
+            fast = GameOfLife(*shape, rule_set_name=rule_name, engine='numpy')
+            reference.grid = _random_grid(*shape, seed=shape[1])
+            fast.grid = reference.grid.copy()
+            for _ in range(6):
+                reference.update_grid()
+                fast.update_grid()
+                assert np.array_equal(reference.grid, fast.grid)
+            assert fast.grid.dtype == reference.grid.dtype
+
+def test_count_live_neighbors_vectorised():
+    from .engines import count_live_neighbors
+    game = GameOfLife(6, 7)
+    game.grid = _random_grid(6, 7, seed=3)
+    counts = count_live_neighbors(game.grid)
+    for r in range(6):
+        for c in range(7):
+            assert counts[r, c] == game._count_live_neighbors(r, c)
+
+def test_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        GameOfLife(5, 5, engine='warp_drive')
+
+def test_set_engine_per_instance():
+    game = GameOfLife(3, 3)
+    game.set_engine('numpy')
+    game.grid = np.array([[0,0,0], [1,1,1], [0,0,0]])
+    game.update_grid()
+    assert game.engine_name == 'numpy'
+    assert np.array_equal(game.grid, np.array([[0,1,0], [0,1,0], [0,1,0]]))
+
+# Test rule compiler
+def test_registered_rules_are_tabulated():
+    from .rulesmanager import RULE_SETS, RULE_TABLES, neighbourhood_size, rule_neighbourhood
+    for name, rule in RULE_SETS.items():
+        table = RULE_TABLES[name]
+        max_neighbors = neighbourhood_size(*rule_neighbourhood(rule))
+        assert table.shape == (2, max_neighbors + 1)
+        for state in (0, 1):
+            for n in range(max_neighbors + 1):
+                assert table[state, n] == rule(state, n)
+        assert rule.rule_table is table
+
+def test_rulestring_matches_named_rules():
+    from .rulesmanager import compile_rule, rule_from_rulestring, RULE_TABLES
+    assert np.array_equal(compile_rule(rule_from_rulestring('B3/S23')), RULE_TABLES['conway'])
+    assert np.array_equal(compile_rule(rule_from_rulestring('B36/S23')), RULE_TABLES['highlife'])
+    assert np.array_equal(compile_rule(rule_from_rulestring('S238/B2345678')), RULE_TABLES['superlife'])
+
+def test_register_rule_set_with_rulestring(monkeypatch):
+    from .rulesmanager import register_rule_set, RULE_SETS, RULE_TABLES
+    # Registered for this test only
+    monkeypatch.setitem(RULE_SETS, 'seeds', None)
+    monkeypatch.setitem(RULE_TABLES, 'seeds', None)
+    rule = register_rule_set('seeds', 'B2/S')
+    assert RULE_SETS['seeds'] is rule
+    assert list(RULE_TABLES['seeds'][0]) == [0, 0, 1, 0, 0, 0, 0, 0, 0]
+    assert not RULE_TABLES['seeds'][1].any()
+
+def test_rulestrings_are_cached_not_registered():
+    from .explore import rulestring_from_index
+    from .rulesmanager import get_rule_set, RULE_SETS, RULE_TABLES, RULESTRING_CACHE_SIZE, _compiled_rulestring
+    names = set(RULE_SETS)
+    rule = get_rule_set('S3/B245')
+    assert get_rule_set('B245/S3') is rule
+    assert list(rule.rule_table[0]) == [0, 0, 1, 0, 1, 1, 0, 0, 0]
+    for index in range(RULESTRING_CACHE_SIZE + 10):
+        get_rule_set(rulestring_from_index(index))
+    assert set(RULE_SETS) == names and set(RULE_TABLES) == names
+    assert _compiled_rulestring.cache_info().currsize <= RULESTRING_CACHE_SIZE
+
+def test_gameoflife_accepts_rulestring():
+    game = GameOfLife(3, 3, rule_set_name='b3/s23', engine='numpy')
+    game.grid = np.array([[0,0,0], [1,1,1], [0,0,0]])
+    game.update_grid()
+    assert np.array_equal(game.grid, np.array([[0,1,0], [0,1,0], [0,1,0]]))
+
+def test_invalid_rulestring():
+    from .rulesmanager import parse_rulestring
+    with pytest.raises(ValueError, match="Invalid rulestring"):
+        parse_rulestring('B9/S23')
+
+# Test bit-packed backend
+def test_bitboard_pack_roundtrip():
+    from .bitboard import BitGrid
+    for cols in [1, 7, 63, 64, 65, 130]:
+        grid = _random_grid(5, cols, seed=cols)
+        board = BitGrid.from_dense(grid)
+        assert board.words.dtype == np.uint64
+        assert board.words.shape == (5, (cols + 63) // 64)
+        assert np.array_equal(board.to_dense(), grid)
+        assert board.population() == grid.sum()
+
+def test_bitboard_engine_matches_numpy_engine():
+    from .rulesmanager import get_rule_set
+    get_rule_set('B0123/S45678')
+    for rule_name in ['conway', 'highlife', 'superlife', 'B0123/S45678']:
+        for shape in [(1, 1), (3, 64), (17, 65), (40, 129)]:
+            fast = GameOfLife(*shape, rule_set_name=rule_name, engine='numpy')
+            packed = GameOfLife(*shape, rule_set_name=rule_name, engine='bitboard')
+            fast.grid = _random_grid(*shape, seed=shape[0])
+            packed.grid = fast.grid.copy()
+            fast.run_simulation(5)
+            packed.run_simulation(5)
+            assert np.array_equal(fast.grid, packed.grid)
+
+def test_bitboard_engine_keeps_its_board_and_sees_in_place_edits():
+    fast = GameOfLife(30, 70, engine='numpy', verbose=False)
+    packed = GameOfLife(30, 70, engine='bitboard', verbose=False)
+    fast.grid = _random_grid(30, 70, seed=5)
+    packed.grid = fast.grid.copy()
+    fast.advance(4)
+    packed.advance(4)
+    board = packed.engine._board
+    for game in (fast, packed):
+        game.grid[20:23, 60] = 1
+        game.advance(3)
+    assert packed.engine._board is board
+    assert np.array_equal(packed.grid, fast.grid)
+
+def test_bitboard_bands_and_set_cells():
+    from .bitboard import BitGrid
+    from .rulesmanager import RULE_TABLES
+    grid = _random_grid(50, 100, seed=11)
+    whole = BitGrid.from_dense(grid)
+    banded = BitGrid.zeros(50, 100)
+    rows, cols = np.nonzero(grid)
+    banded.set_cells(rows, cols)
+    for _ in range(4):
+        whole.step(RULE_TABLES['conway'])
+        banded.step(RULE_TABLES['conway'], band_rows=7)
+    assert np.array_equal(whole.words, banded.words)
+
+# Test active-region engine
+def test_active_engine_matches_numpy_engine():
+    for rule_name in ['conway', 'highlife']:
+        for shape in [(5, 5), (40, 70), (65, 33)]:
+            fast = GameOfLife(*shape, rule_set_name=rule_name, engine='numpy')
+            tracked = GameOfLife(*shape, rule_set_name=rule_name, engine='active')
+            tracked.engine.tile_size = 8
+            fast.grid = _random_grid(*shape, density=0.2, seed=shape[1])
+            tracked.grid = fast.grid.copy()
+            fast.run_simulation(12)
+            tracked.run_simulation(12)
+            assert np.array_equal(fast.grid, tracked.grid)
+
+def test_active_engine_skips_stable_regions():
+    game = GameOfLife(128, 128, engine='active')
+    game.engine.tile_size = 16
+    game.grid[10, 10:13] = 1             # blinker
+    game.grid[100:102, 100:102] = 1      # block (still life)
+    game.run_simulation(10)
+    # Ten generations: the blinker is back in its starting phase
+    assert game.grid[10, 10:13].sum() == 3 and game.grid[9, 11] == 0 and game.grid[11, 11] == 0
+    assert game.grid[100:102, 100:102].sum() == 4
+    # Only the first step sweeps the whole board
+    assert game.engine.full_sweeps == 1
+    assert game.engine.tiles_computed < 64 + 9 * 9 * 9
+
+def test_active_engine_returns_owned_boards_and_sees_in_place_edits():
+    fast = GameOfLife(200, 200, engine='numpy', verbose=False)
+    tracked = GameOfLife(200, 200, engine='active', verbose=False)
+    for game in (fast, tracked):
+        game.load_pattern_from_string("(1,2) (2,3) (3,1) (3,2) (3,3)")    # glider
+        game.update_grid()
+
+    # An old board is not reused as a buffer by later steps
+    kept = tracked.grid
+    kept_copy = kept.copy()
+    for game in (fast, tracked):
+        game.update_grid()
+        game.update_grid()
+    assert np.array_equal(kept, kept_copy)
+
+    # In-place edits in an inactive tile are picked up by the next step
+    for game in (fast, tracked):
+        game.grid[150, 150:153] = 1
+    for _ in range(3):
+        fast.update_grid()
+        tracked.update_grid()
+        assert np.array_equal(tracked.grid, fast.grid)
+    assert tracked.engine.full_sweeps == 1
+
+@pytest.mark.parametrize("edit", [
+    lambda grid: grid[100:110][0, 100:103].fill(1),
+    lambda grid: np.copyto(grid[150:153, 60], 1),
+    lambda grid: np.add(grid[180:181, 150:153], 1, out=grid[180:181, 150:153]),
+])
+def test_active_engine_sees_edits_through_views_and_numpy_functions(edit):
+    fast = GameOfLife(200, 200, engine='numpy', verbose=False)
+    tracked = GameOfLife(200, 200, engine='active', verbose=False)
+    for game in (fast, tracked):
+        game.load_pattern_from_string("(1,2) (2,3) (3,1) (3,2) (3,3)")    # glider
+        game.update_grid()
+        edit(game.grid)
+    for _ in range(3):
+        fast.update_grid()
+        tracked.update_grid()
+        assert np.array_equal(tracked.grid, fast.grid)
+
+def test_active_engine_sees_loaded_pattern_between_steps():
+    game = GameOfLife(64, 64, engine='active')
+    game.engine.tile_size = 8
+    game.grid[5, 5:8] = 1
+    game.update_grid()
+    game.load_pattern_from_string("(40,40) (40,41) (40,42)")
+    game.update_grid()
+    assert game.grid[39:42, 41].sum() == 3
+
+# Test HashLife
+def test_hashlife_matches_numpy_engine():
+    from .hashlife import HashLife
+    for rule_name in ['conway', 'highlife']:
+        game = GameOfLife(96, 96, rule_set_name=rule_name, engine='numpy')
+        game.grid[40:52, 40:52] = _random_grid(12, 12, density=0.4, seed=5)
+        universe = HashLife.from_game(game)
+        for generations in [1, 2, 5, 8, 13]:
+            game.run_simulation(generations)
+            universe.advance(generations)
+            assert np.array_equal(universe.to_grid(96, 96), game.grid)
+        assert universe.generation == 29
+
+def test_hashlife_long_jump_glider():
+    from .hashlife import HashLife
+    glider = np.array([[0,1,0], [0,0,1], [1,1,1]])
+    universe = HashLife.from_grid(glider, 'conway')
+    universe.jump_to(4 * 10**12)
+    assert universe.population == 5
+    # A glider moves one cell down-right every 4 generations
+    shift = 10**12
+    assert np.array_equal(universe.to_grid(3, 3, top=shift, left=shift), glider)
+
+def test_hashlife_collect_keeps_results_correct():
+    from .hashlife import HashLife
+    soup = _random_grid(16, 16, density=0.4, seed=9)
+    small = HashLife.from_grid(soup, 'conway', top=40, left=40, max_nodes=50)
+    large = HashLife.from_grid(soup, 'conway', top=40, left=40)
+    for _ in range(10):
+        small.advance(3)
+        large.advance(3)
+    assert np.array_equal(small.to_grid(96, 96), large.to_grid(96, 96))
+
+def test_hashlife_rejects_b0_rules():
+    from .hashlife import HashLife
+    with pytest.raises(ValueError, match="dead background"):
+        HashLife('B0/S8')
+
+# Test unbounded chunked universe
+def test_chunked_universe_matches_hashlife():
+    from .chunked import ChunkedUniverse
+    from .hashlife import HashLife
+    soup = _random_grid(20, 20, density=0.45, seed=21)
+    chunked = ChunkedUniverse.from_grid(soup, 'conway', top=-10, left=-10, chunk_size=8)
+    universe = HashLife.from_grid(soup, 'conway', top=-10, left=-10)
+    for _ in range(6):
+        chunked.advance(10)
+        universe.advance(10)
+        assert np.array_equal(chunked.to_grid(200, 200, top=-100, left=-100),
+                              universe.to_grid(200, 200, top=-100, left=-100))
+    assert chunked.population == universe.population
+
+def test_chunked_universe_allocates_and_frees_chunks():
+    from .chunked import ChunkedUniverse
+    universe = ChunkedUniverse('conway', chunk_size=16)
+    universe.load_pattern_from_string("(0,1) (1,2) (2,0) (2,1) (2,2)")  # glider
+    universe.advance(4 * 100)
+    assert universe.population == 5
+    assert universe.bounding_box() == (100, 100, 102, 102)
+    # Only the chunks around the glider are kept, not the whole path
+    assert len(universe.chunks) <= 4
+
+def test_chunked_universe_blinker_at_negative_coordinates():
+    from .chunked import ChunkedUniverse
+    universe = ChunkedUniverse('conway', chunk_size=4)
+    universe.load_pattern_from_string("(-1,-2) (-1,-1) (-1,0)")
+    universe.step()
+    assert np.array_equal(universe.to_grid(3, 3, top=-2, left=-2),
+                          np.array([[0,1,0], [0,1,0], [0,1,0]]))
+
+# Test Larger than Life
+@pytest.mark.parametrize("rule", ['R2,C0,M0,S3..8,B4..6,NM', 'R3,C0,M1,S5..12,B6..9,NN',
+                                  'R1,C0,M0,S1..2,B2..2,NN', 'conway'])
+def test_ltl_engine_matches_python_engine(rule):
+    for shape in [(13, 17), (1, 9), (20, 3)]:
+        reference = GameOfLife(*shape, rule_set_name=rule)
+        fast = GameOfLife(*shape, rule_set_name=rule, engine='ltl')
+        reference.grid = _random_grid(*shape, density=0.45, seed=shape[1])
+        fast.grid = reference.grid.copy()
+        for generations in [1, 3]:
+            reference.advance(generations)
+            fast.advance(generations)
+            assert np.array_equal(fast.grid, reference.grid)
+
+def test_ltl_rulestrings_and_registry():
+    from .rulesmanager import get_rule_set, compile_rule, parse_ltl_rulestring, rule_neighbourhood
+    from .patterns import grid_to_rle
+    assert parse_ltl_rulestring('r5,c0,m1,s34..58,b34..45,nm') == (5, True, (34, 45), (34, 58), 'moore')
+    bosco = get_rule_set('bosco')
+    assert get_rule_set('R5,C0,M1,S34..58,B34..45,NM').rulestring == bosco.rulestring
+    assert rule_neighbourhood(get_rule_set('R2,C0,M0,S1..3,B2..2,NN')) == ('vonneumann', 2, False)
+    assert compile_rule(bosco).shape == (2, 122)
+    assert grid_to_rle(np.ones((1, 1)), bosco).startswith("x = 1, y = 1, rule = R5,C0,M1,S34..58,B34..45,NM\n")
+
+    # Radius-1 engines refuse wider neighbourhoods instead of miscounting
+    with pytest.raises(ValueError, match="'ltl' or 'python' engine"):
+        GameOfLife(10, 10, rule_set_name='bosco', engine='numpy')
+    for engine in ['bitboard', 'numpy', 'active']:
+        game = GameOfLife(10, 10, engine=engine)
+        reference = GameOfLife(10, 10)
+        with pytest.raises(ValueError, match="'ltl' or 'python' engine"):
+            game.set_rule_set('majority')
+        # The rejected rule is not installed; the game keeps running Conway
+        assert game.rule_set_name == 'conway' and game.current_rule_set is get_rule_set('conway')
+        game.grid = reference.grid = _random_grid(10, 10, seed=4)
+        game.update_grid()
+        reference.update_grid()
+        assert np.array_equal(game.grid, reference.grid)
+    game = GameOfLife(5, 5, rule_set_name='R1,C0,M1,S2..4,B3..3,NN')
+    game.grid[1:4, 2] = 1
+    assert game._count_live_neighbors(2, 2) == 3
+
+# Test multi-core engine
+def test_parallel_engine_matches_numpy_engine():
+    for rule_name, shape, halo in [('conway', (37, 41), 3), ('highlife', (9, 20), 1), ('conway', (3, 5), 4)]:
+        fast = GameOfLife(*shape, rule_set_name=rule_name, engine='numpy')
+        parallel = GameOfLife(*shape, rule_set_name=rule_name, engine='parallel')
+        parallel.engine.workers = 4
+        parallel.engine.halo = halo
+        fast.grid = _random_grid(*shape, seed=shape[0])
+        parallel.grid = fast.grid.copy()
+        for generations in [1, 7, 10]:
+            fast.run_simulation(generations)
+            parallel.grid = parallel.engine.advance(parallel.grid, generations)
+            assert np.array_equal(fast.grid, parallel.grid)
+        parallel.engine.close()
+
+def test_quiet_run_simulation_fuses_generations_up_to_checkpoints(tmp_path):
+    from .checkpoint import Checkpointer
+    game = GameOfLife(20, 20, engine='numpy', verbose=False)
+    reference = GameOfLife(20, 20, engine='numpy', verbose=False)
+    game.grid = reference.grid = _random_grid(20, 20, seed=8)
+    calls = []
+    advance = game.engine.advance
+    game.engine.advance = lambda grid, generations: calls.append(generations) or advance(grid, generations)
+    checkpointer = Checkpointer(str(tmp_path), every=10)
+    game.run_simulation(25, checkpointer=checkpointer)
+    for _ in range(25):
+        reference.update_grid()
+    assert calls == [10, 10, 5]
+    assert [generation for generation, _ in checkpointer.checkpoints()] == [10, 20]
+    assert np.array_equal(game.grid, reference.grid)
+
+# Test out-of-core grid
+@pytest.mark.parametrize("band_rows, fuse", [(5, 1), (7, 3), (2, 6), (64, 4)])
+def test_out_of_core_grid_matches_numpy_engine(tmp_path, band_rows, fuse):
+    from .outofcore import OutOfCoreGrid
+    fast = GameOfLife(29, 31, rule_set_name='highlife', engine='numpy', verbose=False)
+    fast.grid = _random_grid(29, 31, seed=band_rows)
+    with OutOfCoreGrid(str(tmp_path / "board"), 29, 31, rule_set_name='highlife', band_rows=band_rows,
+                       fuse=fuse, verbose=False) as board:
+        board.grid[:] = fast.grid
+        for generations in [1, 5, 11]:
+            fast.advance(generations)
+            board.advance(generations)
+            assert np.array_equal(board.grid, fast.grid)
+            # Scratch arrays are allocated once and kept between calls
+            scratch = board._scratch if generations == 1 else scratch
+            assert scratch is not None and board._scratch is scratch
+        assert board.generation == 17
+        assert board.population == int(fast.grid.sum())
+    # The result stays on disk after closing
+    stored = np.fromfile(board.grid_path, dtype=np.uint8).reshape(29, 31)
+    assert np.array_equal(stored, fast.grid)
+
+def test_out_of_core_grid_loads_patterns_and_saves(tmp_path):
+    from .outofcore import OutOfCoreGrid, band_rows_for_budget
+    from .patterns import load_pattern_from_string
+    from .save import save_grid_to_file
+    from .snapshot import SnapshotReader, SnapshotWriter
+    assert band_rows_for_budget(100, memory_budget=8 * 100 * 30, fuse=5) == 20
+    with pytest.raises(ValueError):
+        band_rows_for_budget(100, memory_budget=8 * 100 * 10, fuse=5)
+
+    board = OutOfCoreGrid(str(tmp_path / "board"), 5, 5, memory_budget=8 * 5 * 4, fuse=1, verbose=False)
+    assert board.band_rows == 2
+    load_pattern_from_string(board, "(2,1) (2,2) (2,3)")
+    with SnapshotWriter(tmp_path / "run.golsnap", 5, 5) as writer:
+        writer.append(board.grid)
+        board.advance(1)
+        writer.append(board.grid)
+    save_grid_to_file(board, tmp_path / "gen1.txt")
+    board.close()
+    assert (tmp_path / "gen1.txt").read_text() == "00000\n00100\n00100\n00100\n00000\n"
+    with SnapshotReader(tmp_path / "run.golsnap") as reader:
+        assert reader.read(0)[2].tolist() == [0, 1, 1, 1, 0]
+        assert reader.read(1)[:, 2].tolist() == [0, 1, 1, 1, 0]
+
+# Test cycle detection
+def test_run_simulation_detects_oscillator_and_skips_ahead():
+    game = GameOfLife(8, 8, engine='numpy')
+    game.grid[3, 2:5] = 1
+    expected = GameOfLife(8, 8, engine='numpy')
+    expected.grid = game.grid.copy()
+    expected.run_simulation(10001)
+
+    detector = game.run_simulation(10001, detect_cycles=True)
+    assert detector.period == 2
+    assert detector.detected_at == 2
+    assert game.generation == 10001
+    assert np.array_equal(game.grid, expected.grid)
+
+def test_run_simulation_detects_still_life_and_extinction():
+    game = GameOfLife(6, 6)
+    game.grid[1:3, 1:3] = 1
+    detector = game.run_simulation(50, detect_cycles=True)
+    assert detector.period == 1 and not detector.extinct
+    assert "still life" in detector.description
+
+    game = GameOfLife(6, 6)
+    game.grid[2, 2] = 1
+    detector = game.run_simulation(50, detect_cycles=True)
+    assert detector.extinct
+    assert detector.detected_at == 1
+    assert game.generation == 50
+
+def test_cycle_detector_history_window():
+    from .cycles import CycleDetector
+    detector = CycleDetector(history=1)
+    a = np.array([[1, 0], [0, 0]])
+    b = np.array([[0, 1], [0, 0]])
+    assert not detector.observe(0, a)
+    assert not detector.observe(1, b)
+    # 'a' fell out of the one-generation window
+    assert not detector.observe(2, a)
+    assert detector.observe(3, a)
+    assert detector.period == 1
+
+# Test snapshot files
+@pytest.mark.parametrize("compress", [True, False])
+def test_snapshot_round_trip_and_random_access(tmp_path, compress):
+    from .snapshot import SnapshotReader, SnapshotWriter
+    game = GameOfLife(23, 37, engine='numpy')
+    game.grid = _random_grid(23, 37, seed=7)
+    path = tmp_path / "run.golsnap"
+    history = []
+    with SnapshotWriter(path, 23, 37, keyframe_interval=5, compress=compress) as writer:
+        for gen in range(23):
+            history.append(game.grid.copy())
+            writer.append(game.grid)
+            game.run_simulation(1)
+
+    with SnapshotReader(path) as reader:
+        assert len(reader) == 23
+        assert list(reader.generations) == list(range(23))
+        for gen in [22, 0, 5, 4, 13, 6]:
+            assert np.array_equal(reader.read(gen), history[gen])
+        with pytest.raises(KeyError):
+            reader.read(23)
+
+def test_snapshot_sparse_generations_and_text_export(tmp_path):
+    from .snapshot import SnapshotReader, SnapshotWriter
+    game = GameOfLife(3, 3)
+    game.grid[0, 0] = game.grid[1, 1] = game.grid[2, 2] = 1
+    path = tmp_path / "run.golsnap"
+    with SnapshotWriter(path, 3, 3) as writer:
+        writer.append(np.zeros((3, 3), dtype=int), generation=10)
+        writer.append(game.grid, generation=20)
+        with pytest.raises(ValueError):
+            writer.append(game.grid, generation=20)
+        with pytest.raises(ValueError):
+            writer.append(np.zeros((4, 3), dtype=int))
+
+    with SnapshotReader(path) as reader:
+        with pytest.raises(KeyError):
+            reader.read(15)
+        reader.export_text(20, tmp_path / "gen20.txt")
+    assert (tmp_path / "gen20.txt").read_text() == "100\n010\n001\n"
+
+def test_snapshot_reader_recovers_index_after_crash(tmp_path):
+    from .snapshot import SnapshotReader, SnapshotWriter
+    game = GameOfLife(17, 19, engine='numpy')
+    game.grid = _random_grid(17, 19, seed=11)
+    path = tmp_path / "run.golsnap"
+    history = []
+    writer = SnapshotWriter(path, 17, 19, keyframe_interval=4)
+    for gen in range(10):
+        history.append(game.grid.copy())
+        writer.append(game.grid)
+        game.run_simulation(1)
+    # Crash: the footer is never written and the last record is cut short
+    writer._file.close()
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+
+    with SnapshotReader(path) as reader:
+        assert reader.recovered
+        assert list(reader.generations) == list(range(9))
+        for gen in [8, 0, 5]:
+            assert np.array_equal(reader.read(gen), history[gen])
+
+    # A cleanly closed file is read through its footer
+    with SnapshotWriter(path, 3, 3) as writer:
+        writer.append(np.eye(3, dtype=int))
+    with SnapshotReader(path) as reader:
+        assert not reader.recovered
+        assert len(reader) == 1
+
+# Test the background snapshot writer
+def test_async_writer_encodings(tmp_path):
+    import zlib
+    from .asyncsave import AsyncSnapshotWriter, decode_packed
+    grid = _random_grid(5, 11, seed=3)
+    for encoding in ['text', 'packed', 'png']:
+        board = grid.copy()
+        with AsyncSnapshotWriter(tmp_path, encoding, max_pending=1) as writer:
+            for gen in range(4):
+                writer.submit(gen, board)
+            board[:] = 0  # submitted snapshots are copies
+        assert writer.written == 4
+
+    assert (tmp_path / "grid_state_gen3.txt").read_text() == "".join(
+        "".join(map(str, row)) + "\n" for row in grid)
+    assert np.array_equal(decode_packed((tmp_path / "grid_state_gen3.golgrid").read_bytes()), grid)
+    png = (tmp_path / "grid_state_gen3.png").read_bytes()
+    assert png[:8] == b'\x89PNG\r\n\x1a\n'
+    idat = zlib.decompress(png[png.index(b'IDAT') + 4:png.index(b'IEND') - 8])
+    scanlines = np.frombuffer(idat, dtype=np.uint8).reshape(5, 3)
+    assert (scanlines[:, 0] == 0).all()
+    assert np.array_equal(np.unpackbits(scanlines[:, 1:], axis=1, count=11), 1 - grid)
+
+def test_async_writer_reports_errors_explicitly(tmp_path):
+    from .asyncsave import AsyncSnapshotWriter, SnapshotWriteError
+    writer = AsyncSnapshotWriter(tmp_path, filename="missing/gen{generation}.{extension}")
+    writer.submit(7, np.zeros((2, 2), dtype=int))
+    with pytest.raises(SnapshotWriteError, match="generation 7") as raised:
+        writer.flush()
+    assert isinstance(raised.value.__cause__, FileNotFoundError)
+    with pytest.raises(SnapshotWriteError):
+        writer.submit(8, np.zeros((2, 2), dtype=int))
+    with pytest.raises(SnapshotWriteError):
+        writer.close()
+    assert writer.written == 0
+
+# Test RLE and plaintext patterns
+def test_load_rle_glider_with_rule_header(tmp_path):
+    file_path = tmp_path / "glider.rle"
+    file_path.write_text("#N Glider\n#C A comment\nx = 3, y = 3, rule = B36/S23\nbo$2bo$3o!\n")
+    game = GameOfLife(5, 5)
+    game.load_pattern_from_file(str(file_path))
+    expected_grid = np.zeros((5, 5), dtype=int)
+    expected_grid[0, 1] = expected_grid[1, 2] = 1
+    expected_grid[2, 0:3] = 1
+    assert np.array_equal(game.grid, expected_grid)
+    assert game.rule_set_name == 'B36/S23'
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1 << 20])
+def test_rle_round_trip_across_chunk_boundaries(chunk_size):
+    import io
+    from .patterns import grid_to_rle, load_rle
+    grid = _random_grid(13, 41, density=0.4, seed=chunk_size)
+    grid[5] = 0  # an empty row inside the pattern
+    text = grid_to_rle(grid, apply_conway_rules, line_length=12)
+    assert text.startswith("x = 41, y = 13, rule = B3/S23\n")
+    assert all(len(line) <= 12 for line in text.splitlines()[1:])
+
+    game = GameOfLife(13, 41)
+    reader = load_rle(game, io.StringIO(text), chunk_size=chunk_size)
+    assert (reader.width, reader.height) == (41, 13)
+    assert np.array_equal(game.grid, grid)
+
+def test_load_rle_old_rule_format_and_out_of_bounds(capsys):
+    import io
+    from .patterns import load_rle
+    game = GameOfLife(2, 2)
+    load_rle(game, io.BytesIO(b"x = 3, y = 1, rule = 23/36\n3o!"), top=1)
+    assert game.rule_set_name == 'S23/B36'
+    assert np.array_equal(game.grid, np.array([[0, 0], [1, 1]]))
+    assert "1 cells of the pattern are out of grid bounds" in capsys.readouterr().out
+
+def test_load_plaintext_cells_file(tmp_path):
+    file_path = tmp_path / "glider.cells"
+    file_path.write_text("!Name: Glider\n!\n.O\n..O\nOOO")
+    game = GameOfLife(4, 4)
+    game.load_pattern_from_file(str(file_path))
+    expected_grid = np.zeros((4, 4), dtype=int)
+    expected_grid[0, 1] = expected_grid[1, 2] = 1
+    expected_grid[2, 0:3] = 1
+    assert np.array_equal(game.grid, expected_grid)
+
+def test_save_grid_to_rle(tmp_path):
+    game = GameOfLife(3, 4, rule_set_name='highlife')
+    game.grid[0, 0] = game.grid[2, 1:3] = 1
+    file_path = tmp_path / "saved.rle"
+    game.save_grid_to_rle(str(file_path))
+    assert file_path.read_text() == "x = 4, y = 3, rule = B36/S23\no2$b2o!\n"
+
+# Test checkpoints
+def test_checkpoint_round_trip_with_engine_state(tmp_path):
+    from .checkpoint import Checkpointer, load_checkpoint
+    game = GameOfLife(200, 200, rule_set_name='highlife', engine='active')
+    game.grid[5:8, 5] = 1
+    checkpointer = Checkpointer(str(tmp_path), every=4, keep=2)
+    game.run_simulation(10, checkpointer=checkpointer)
+    assert [gen for gen, _ in checkpointer.checkpoints()] == [4, 8]
+
+    resumed = load_checkpoint(checkpointer.path_for(8))
+    assert (resumed.generation, resumed.rule_set_name, resumed.engine_name) == (8, 'highlife', 'active')
+    # Tracking continues from the stored tile mask instead of a full sweep
+    assert resumed.engine.active is not None
+    expected = GameOfLife(200, 200, rule_set_name='highlife', engine='numpy')
+    expected.grid = resumed.grid.copy()
+    resumed.run_simulation(6)
+    expected.run_simulation(6)
+    assert np.array_equal(resumed.grid, expected.grid)
+    assert resumed.engine.full_sweeps == 0
+
+def test_resume_skips_damaged_checkpoints(tmp_path, capsys):
+    from .checkpoint import Checkpointer, CheckpointError, load_checkpoint
+    game = GameOfLife(6, 6)
+    game.grid[2, 1:4] = 1
+    checkpointer = Checkpointer(str(tmp_path), every=1, keep=5)
+    game.run_simulation(3, checkpointer=checkpointer)
+    assert checkpointer.resume().generation == 3
+
+    newest = checkpointer.path_for(3)
+    data = bytearray(open(newest, 'rb').read())
+    data[-10] ^= 0xFF
+    open(newest, 'wb').write(bytes(data))
+    with pytest.raises(CheckpointError, match="checksum"):
+        load_checkpoint(newest)
+    resumed = checkpointer.resume()
+    assert resumed.generation == 2
+    assert "skipping checkpoint" in capsys.readouterr().out
+    assert np.array_equal(resumed.grid[2, 1:4], [1, 1, 1])
+    assert Checkpointer(str(tmp_path / "empty")).resume() is None
+
+def test_checkpoints_rotate_by_write_order(tmp_path):
+    from .checkpoint import Checkpointer, save_checkpoint
+    stale = GameOfLife(6, 6)
+    for generation in [100, 110, 120]:
+        stale.generation = generation
+        path = Checkpointer(str(tmp_path)).path_for(generation)
+        save_checkpoint(stale, path)
+        os.utime(path, ns=(generation * 10**9, generation * 10**9))
+
+    game = GameOfLife(6, 6)
+    game.grid[2, 1:4] = 1
+    checkpointer = Checkpointer(str(tmp_path), every=10, keep=2)
+    game.run_simulation(10, checkpointer=checkpointer)
+    assert [gen for gen, _ in checkpointer.checkpoints()] == [120, 10]
+    assert checkpointer.resume().generation == 10
+    game.run_simulation(10, checkpointer=checkpointer)
+    assert [gen for gen, _ in checkpointer.checkpoints()] == [10, 20]
+
+# Test the command line runner
+def test_cli_resumes_from_checkpoint(tmp_path, capsys):
+    from .cli import main
+    pattern = tmp_path / "blinker.rle"
+    pattern.write_text("x = 3, y = 2\n$3o!\n")
+    arguments = ["--rows", "3", "--cols", "3", "--pattern", str(pattern), "--no-early-stop", "--quiet",
+                 "--checkpoint-dir", str(tmp_path / "ckpt"), "--checkpoint-every", "2"]
+    main(arguments + ["--generations", "5"])
+    assert sorted(path.name for path in (tmp_path / "ckpt").iterdir()) == [
+        "checkpoint_000000000002.golckpt", "checkpoint_000000000004.golckpt"]
+    main(arguments + ["--generations", "7", "--resume", "--snapshot-every", "1",
+                      "--snapshot-file", str(tmp_path / "run.golsnap")])
+    from .snapshot import SnapshotReader
+    with SnapshotReader(tmp_path / "run.golsnap") as reader:
+        assert list(reader.generations) == [4, 5, 6, 7]
+        assert reader.read(7)[:, 1].tolist() == [1, 1, 1]
+
+def test_cli_saves_files_in_the_background(tmp_path, capsys):
+    from .cli import main
+    pattern = tmp_path / "blinker.rle"
+    pattern.write_text("x = 3, y = 2\n$3o!\n")
+    main(["--rows", "3", "--cols", "3", "--pattern", str(pattern), "--generations", "5",
+          "--no-early-stop", "--quiet", "--save-every", "2", "--save-dir", str(tmp_path / "out")])
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [f"grid_state_gen{gen}.txt" for gen in (0, 2, 4)]
+    assert (tmp_path / "out" / "grid_state_gen2.txt").read_text() == "000\n111\n000\n"
+
+def test_cli_quiet_run_writes_snapshots(tmp_path, capsys):
+    from .cli import main
+    from .snapshot import SnapshotReader
+    pattern = tmp_path / "blinker.rle"
+    pattern.write_text("x = 3, y = 2\n$3o!\n")
+    snapshot_file = tmp_path / "run.golsnap"
+    assert main(["--rows", "5", "--cols", "5", "--pattern", str(pattern), "--generations", "7",
+                 "--engine", "bitboard", "--snapshot-every", "3", "--snapshot-file", str(snapshot_file),
+                 "--no-early-stop", "--quiet"]) == 0
+    assert capsys.readouterr().out == ""
+
+    with SnapshotReader(snapshot_file) as reader:
+        assert list(reader.generations) == [0, 3, 6]
+        expected = np.zeros((5, 5), dtype=int)
+        expected[0:3, 1] = 1
+        assert np.array_equal(reader.read(3), expected)
+
+def test_cli_stops_at_steady_state(tmp_path, capsys):
+    from .cli import build_parser, run
+    pattern = tmp_path / "block.txt"
+    pattern.write_text("(1,1) (1,2) (2,1) (2,2)")
+    args = build_parser().parse_args(["--rows", "4", "--cols", "4", "--pattern", str(pattern),
+                                      "--generations", "100"])
+    game = run(args)
+    assert game.generation == 1
+    assert "Steady state reached: still life" in capsys.readouterr().out
+
+def test_cli_quiet_run_checks_for_steady_state_between_fused_steps(tmp_path, monkeypatch):
+    from .cli import build_parser, run
+    pattern = tmp_path / "blinker.rle"
+    pattern.write_text("x = 3, y = 2\n$3o!\n")
+    steps = []
+    advance = GameOfLife.advance
+    def recording_advance(game, generations):
+        steps.append(generations)
+        advance(game, generations)
+    monkeypatch.setattr(GameOfLife, 'advance', recording_advance)
+
+    args = build_parser().parse_args(["--rows", "5", "--cols", "5", "--pattern", str(pattern), "--engine",
+                                      "bitboard", "--generations", "1000", "--cycle-check-every", "50", "--quiet"])
+    game = run(args)
+    # Generation 50 repeats generation 0; two single steps then find the period
+    assert steps == [50, 1, 1]
+    assert game.generation == 52
+    assert game.steady_state.period == 2
+
+def test_cli_picks_the_ltl_engine_for_larger_than_life_rules(tmp_path, capsys):
+    from .cli import build_parser, run
+    pattern = tmp_path / "block.txt"
+    pattern.write_text("(5,5) (5,6) (6,5) (6,6)")
+    arguments = ["--rows", "12", "--cols", "12", "--pattern", str(pattern), "--generations", "2", "--quiet"]
+    assert run(build_parser().parse_args(arguments + ["--rule", "bosco"])).engine_name == 'ltl'
+    assert run(build_parser().parse_args(arguments)).engine_name == 'numpy'
+    with pytest.raises(ValueError, match="radius-1"):
+        run(build_parser().parse_args(arguments + ["--rule", "bosco", "--engine", "bitboard"]))
+
+def test_gameoflife_quiet_mode(capsys):
+    game = GameOfLife(4, 4, verbose=False)
+    game.load_pattern_from_string("(1,1) (1,2)")
+    game.update_grid()
+    assert capsys.readouterr().out == ""
+
+# Test batched ensembles
+def test_ensemble_matches_individual_games():
+    from .ensemble import Ensemble
+    ensemble = Ensemble.random(24, 9, 11, density=0.4, seed=4, chunk_bytes=1000)
+    initial = ensemble.boards.copy()
+    assert ensemble.chunk_boards < len(ensemble)
+    results = ensemble.run(200).results()
+
+    for i in range(len(ensemble)):
+        game = GameOfLife(9, 11, engine='numpy')
+        game.grid = initial[i].astype(int)
+        detector = game.run_simulation(200, detect_cycles=True)
+        assert results['period'][i] == (detector.period or 0)
+        assert results['start'][i] == (-1 if detector.start is None else detector.start)
+        assert results['extinct'][i] == detector.extinct
+        if detector.period is None:
+            assert np.array_equal(ensemble.boards[i], game.grid)
+        assert results['population'][i] == ensemble.boards[i].sum()
+
+def test_ensemble_parallel_matches_serial():
+    from .ensemble import Ensemble
+    serial = Ensemble.random(10, 8, 8, seed=6, rule_set_name='highlife').run(60)
+    parallel = Ensemble.random(10, 8, 8, seed=6, rule_set_name='highlife').run(60, processes=2)
+    assert np.array_equal(serial.boards, parallel.boards)
+    for name in serial.results().dtype.names:
+        assert np.array_equal(serial.results()[name], parallel.results()[name])
+
+# Test rule-space exploration
+def test_rulestring_from_index_and_random_sample():
+    from .explore import random_rulestrings, rulestring_from_index
+    assert rulestring_from_index((1 << 3) | (1 << 11) | (1 << 12)) == 'B3/S23'
+    sample = random_rulestrings(50, seed=2)
+    assert len(set(sample)) == 50
+    assert sample == random_rulestrings(50, seed=2)
+    assert not any(rule.startswith('B0') for rule in sample)
+
+@pytest.mark.parametrize("rulestring", ['B/S', 'B3/S23', 'B36/S23'])
+def test_evaluate_rule_activity_matches_full_runs(rulestring):
+    from .ensemble import Ensemble
+    from .explore import evaluate_rule
+    settings = dict(soups=5, rows=10, cols=10, density=0.35, generations=40, seed=3)
+    result = evaluate_rule(rulestring, **settings)
+
+    # Step every soup for the whole run and count the cells that change
+    soups = Ensemble.random(5, 10, 10, density=0.35, seed=3).boards
+    changed = 0
+    for soup in soups:
+        game = GameOfLife(10, 10, rule_set_name=rulestring, engine='numpy')
+        game.grid = soup.astype(game.grid.dtype)
+        for _ in range(40):
+            old = game.grid
+            game.update_grid()
+            changed += np.count_nonzero(game.grid != old)
+    assert result['mean_activity'] == pytest.approx(changed / (5 * 100 * 40))
+
+def test_explore_ranks_and_resumes(tmp_path):
+    import csv
+    from .explore import explore, read_results
+    output = str(tmp_path / "rules.csv")
+    settings = dict(soups=6, rows=12, cols=12, generations=60)
+    rows = explore(['B3/S23', 'B1/S1'], output, **settings)
+    assert [float(row['score']) for row in rows] == sorted((float(row['score']) for row in rows), reverse=True)
+
+    # Resuming only evaluates the rules that are not in the table yet
+    with open(output, 'a', newline='') as f:
+        csv.writer(f).writerow(['B36/S23', '99'] + ['0'] * 9)
+    rows = explore(['S23/B3', 'B36/S23', 'B2/S'], output, processes=2, **settings)
+    assert len(rows) == 4
+    assert rows[0]['rule'] == 'B36/S23' and rows[0]['score'] == '99'
+    assert len(read_results(output)) == 4
+
+    # Rows cut short by a crash or with unparsable values are dropped, and
+    # their rules are evaluated again; new rows start on a fresh line
+    with open(output, newline='') as f:
+        text = f.read()
+    with open(output, 'w', newline='') as f:
+        f.write(text.replace('B2/S,', 'B2/S,x', 1) + 'B1/S12,0.5')
+    assert len(read_results(output)) == 3
+    rows = explore(['B2/S', 'B1/S12', 'B3/S'], output, **settings)
+    assert sorted(row['rule'] for row in rows) == ['B1/S1', 'B1/S12', 'B2/S', 'B3/S', 'B3/S23', 'B36/S23']
+    assert read_results(output) == rows
+
+# Test benchmarks and the cross-engine differential check
+def test_differential_check_all_engines_agree_with_reference():
+    from .bench import differential_check
+    assert differential_check(cases=12, generations=20, max_size=30, seed=2024) == []
+
+def test_benchmark_results_are_json_and_comparable():
+    import json
+    from .bench import compare_results, make_board, run_benchmarks
+    assert make_board('still', 9, 9).sum() == 4 * 4
+    report = run_benchmarks(engines=['numpy', 'bitboard'], sizes=[16], patterns=['soup', 'gliders'],
+                            densities=[0.3], generations=2, repeat=1)
+    report = json.loads(json.dumps(report))
+    assert len(report['results']) == 4
+    for result in report['results']:
+        assert result['cell_updates_per_second'] > 0
+        assert result['peak_memory_bytes'] >= 0
+    ratios = compare_results(report, report)
+    assert len(ratios) == 4 and all(ratio == 1.0 for *_, ratio in ratios)
+
+def test_benchmark_skips_engines_that_cannot_run_the_rule():
+    from .bench import benchmark_cases
+    cases = list(benchmark_cases(['numpy', 'ltl'], ['conway', 'bosco'], [16], ['soup'], [0.3]))
+    assert [(engine, rule) for engine, rule, *_ in cases] == [('numpy', 'conway'), ('ltl', 'conway'), ('ltl', 'bosco')]
+
+# Test the generation iterator and pipelines
+def test_generations_iterator_matches_engine_and_is_read_only():
+    game = GameOfLife(20, 23)
+    game.grid = _random_grid(20, 23, seed=12)
+    expected = GameOfLife(20, 23, engine='numpy')
+    expected.grid = game.grid.copy()
+
+    seen = []
+    for generation, board in game.generations(9, every=3):
+        expected.run_simulation(3)
+        assert np.array_equal(board, expected.grid)
+        assert not board.flags.writeable
+        seen.append(generation)
+    assert seen == [3, 6, 9]
+    assert game.generation == 9
+    assert game.grid.dtype == expected.grid.dtype
+    assert np.array_equal(game.grid, expected.grid)
+
+@pytest.mark.parametrize("engine, rule_name", [('bitboard', 'conway'), ('active', 'highlife'), ('ltl', 'bosco')])
+def test_generations_iterator_uses_the_selected_engine(engine, rule_name):
+    game = GameOfLife(40, 41, rule_set_name=rule_name, engine=engine)
+    game.grid = _random_grid(40, 41, density=0.4, seed=15)
+    game.generation = 5
+    expected = GameOfLife(40, 41, rule_set_name=rule_name, engine='ltl' if engine == 'ltl' else 'numpy')
+    expected.grid = game.grid.copy()
+
+    seen = []
+    for generation, board in game.generations(8, every=3):
+        expected.run_simulation(generation - 5 - expected.generation)
+        assert np.array_equal(board, expected.grid)
+        assert not board.flags.writeable
+        seen.append(generation)
+    # `every` counts absolute generations: the multiples of 3 in 6..13
+    assert seen == [6, 9, 12]
+    assert game.generation == 13
+
+def test_generations_iterator_does_not_allocate_per_generation():
+    import tracemalloc
+    game = GameOfLife(256, 256)
+    game.grid = _random_grid(256, 256, seed=13)
+    iterator = game.generations(200)
+    next(iterator)
+    tracemalloc.start()
+    for _ in iterator:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Only the final write-back to game.grid (8 bytes per cell) is allocated
+    assert peak < 256 * 256 * 8 + 65536
+
+def test_pipeline_stages_see_only_their_generations(tmp_path):
+    from .pipeline import Pipeline, PopulationTrace, SnapshotStage
+    from .snapshot import SnapshotReader, SnapshotWriter
+    game = GameOfLife(12, 12)
+    game.grid = _random_grid(12, 12, seed=14)
+    reference = GameOfLife(12, 12, engine='numpy')
+    reference.grid = game.grid.copy()
+
+    pipeline = Pipeline()
+    trace = pipeline.add(PopulationTrace(), every=2)
+    pipeline.add(SnapshotStage(SnapshotWriter(tmp_path / "run.golsnap", 12, 12)), every=5)
+    calls = []
+
+    @pipeline.stage(every=3)
+    def count(generation, board):
+        calls.append(generation)
+
+    pipeline.run(game, 10)
+    assert trace.generations == [2, 4, 6, 8, 10]
+    assert calls == [3, 6, 9]
+    reference.run_simulation(10)
+    assert trace.populations[-1] == reference.grid.sum()
+    with SnapshotReader(tmp_path / "run.golsnap") as reader:
+        assert list(reader.generations) == [5, 10]
+        assert np.array_equal(reader.read(10), reference.grid)
+
+# Test per-generation statistics
+@pytest.mark.parametrize("engine", ['python', 'numpy', 'active'])
+def test_stats_match_full_scans(engine):
+    from .stats import MemorySink, bounding_box
+    game = GameOfLife(18, 21, engine=engine)
+    game.grid = _random_grid(18, 21, density=0.3, seed=15)
+    sink = game.add_stats_sink(MemorySink())
+
+    previous = game.grid.copy()
+    for generation in range(1, 31):
+        game.update_grid()
+        current = np.asarray(game.grid).copy()
+        series = {field: values[-1] for field, values in sink.series.items()}
+        assert series['generation'] == generation
+        assert series['population'] == current.sum()
+        assert series['births'] == np.count_nonzero((current == 1) & (previous == 0))
+        assert series['deaths'] == np.count_nonzero((current == 0) & (previous == 1))
+        box = bounding_box(current)
+        assert (series['top'], series['left'], series['bottom'], series['right']) == (box or (None,) * 4)
+        assert series['seconds'] >= 0
+        previous = current
+    assert len(sink) == 30
+
+    game.remove_stats_sink(sink)
+    assert game.stats is None
+    game.update_grid()
+    assert len(sink) == 30
+
+def test_stats_sinks_write_csv_and_json_lines(tmp_path):
+    import csv
+    import json
+    from .stats import CSVSink, JSONLinesSink, MemorySink
+    game = GameOfLife(5, 5)
+    game.grid[2, 1:4] = 1
+    csv_sink = game.add_stats_sink(CSVSink(tmp_path / "stats.csv"))
+    json_sink = game.add_stats_sink(JSONLinesSink(tmp_path / "stats.jsonl"))
+    memory = game.add_stats_sink(MemorySink())
+    # Stats also follow the in-place generation iterator
+    for _ in game.generations(4):
+        pass
+    csv_sink.close()
+    json_sink.close()
+
+    rows = list(csv.DictReader(open(tmp_path / "stats.csv", newline='')))
+    lines = [json.loads(line) for line in open(tmp_path / "stats.jsonl")]
+    assert [row['population'] for row in rows] == ['3'] * 4
+    assert [line['births'] for line in lines] == [2] * 4
+    assert (lines[0]['top'], lines[0]['left'], lines[0]['bottom'], lines[0]['right']) == (1, 2, 3, 2)
+    assert list(memory.as_arrays()['generation']) == [1, 2, 3, 4]
@@ -1,10 +1,10 @@
 import re
 import os
-import glob
+import sys
 
-from gameoflife.rulesmanager import RULE_SETS
-from gameoflife.gol import GameOfLife
+from gameoflife.rulesmanager import RULE_SETS, is_life_like
 from gameoflife.rules import register_rule_set
+from gameoflife.cli import build_parser, main, run
 
 # Import new custom rule 'chaoslife' apart from the existing rules
 @register_rule_set('chaoslife')
@@ -21,59 +21,62 @@ def apply_chaos_life_rules(cell_state, live_neighbors):
         else:
             return 0
 
-# Read the dimension from the user in the format (row, column)
-user_input = input("Enter the dimension of the grid in the format '(row,column)', like as, (5,6): ")
-pattern = r'^\(\s*(\d+)\s*,\s*(\d+)\s*\)$'
-match = re.match(pattern, user_input)
-if not match:
-   # print("Invalid format. Enter range within braces eg (5,5)")
-    raise ValueError("Input must match the format (row,column), e.g., (3,5)")
-row, column = map(int, match.groups())
-    
-
-print("##################################")
-print("Available rules: ")
-index = 1
-rule_name = ''
-available_rules = []
-for rule in RULE_SETS:
-    print(index, '. ', rule)
-    available_rules.append(rule)
-    index = index + 1
-print("##################################")
+def interactive():
+    """
+    Prompts for the grid size, rule set and number of generations.
+    """
+    # Read the dimension from the user in the format (row, column)
+    user_input = input("Enter the dimension of the grid in the format '(row,column)', like as, (5,6): ")
+    pattern = r'^\(\s*(\d+)\s*,\s*(\d+)\s*\)$'
+    match = re.match(pattern, user_input)
+    if not match:
+       # print("Invalid format. Enter range within braces eg (5,5)")
+        raise ValueError("Input must match the format (row,column), e.g., (3,5)")
+    row, column = map(int, match.groups())
 
-rule_index = int(input("Enter the choice of the rule set that need to be applied': "))
-if rule_index > len(available_rules) or rule_index < 1:
-    print("Invalid. Specify range within 1-4.")
-   # raise ValueError(f"Rule specified with index - '{rule_index}' does not exist. "
-                    # f"Available rules: {', '.join(RULE_SETS.keys())}")
-    exit(1)
 
-rule_name = available_rules[rule_index - 1]
-print("Using the provided rule: ", rule_name)
-game = GameOfLife(row, column, rule_set_name=rule_name)
+    print("##################################")
+    print("Available rules: ")
+    index = 1
+    rule_name = ''
+    available_rules = []
+    for rule in RULE_SETS:
+        print(index, '. ', rule)
+        available_rules.append(rule)
+        index = index + 1
+    print("##################################")
 
-# Load pattern from file
-pattern_filename = "pattern.txt"
-if not os.path.isfile(pattern_filename):
-    raise FileNotFoundError(f"Pattern file not found: {pattern_filename}")
+    rule_index = int(input("Enter the choice of the rule set that need to be applied': "))
+    if rule_index > len(available_rules) or rule_index < 1:
+        print(f"Invalid. Specify range within 1-{len(available_rules)}.")
+       # raise ValueError(f"Rule specified with index - '{rule_index}' does not exist. "
+                        # f"Available rules: {', '.join(RULE_SETS.keys())}")
+        exit(1)
 
-game.load_pattern_from_file(pattern_filename)
+    rule_name = available_rules[rule_index - 1]
+    print("Using the provided rule: ", rule_name)
 
-print(f"Loaded the pattern file {pattern_filename}")
+    # Load pattern from file
+    pattern_filename = "pattern.txt"
+    if not os.path.isfile(pattern_filename):
+        raise FileNotFoundError(f"Pattern file not found: {pattern_filename}")
 
-max_generations = int(input("Enter the number of generations to update: "))
+    max_generations = int(input("Enter the number of generations to update: "))
 
-# Ensure output folder is clean
-current_dir = os.getcwd()
-pattern = os.path.join(os.getcwd(), f"grid_state_gen*.txt")
+    # The cell-by-cell python engine is far too slow for Larger than Life radii
+    engine = "python" if is_life_like(RULE_SETS[rule_name]) else "ltl"
 
-# Delete old matching files
-for f in glob.glob(pattern):
-    os.remove(f)
+    # Same run as the command line version, printing the grid every generation
+    # and saving every generation to one snapshot file
+    args = build_parser().parse_args([
+        "--rows", str(row), "--cols", str(column), "--rule", rule_name,
+        "--pattern", pattern_filename, "--generations", str(max_generations),
+        "--engine", engine, "--snapshot-every", "1", "--print-grid",
+    ])
+    run(args)
 
-for gen in range(1, max_generations + 1):
-    game.update_grid()
-    filename = f"grid_state_gen{gen}.txt"
-    game.save_grid_to_file(filename)
-    print(f"\nGrid State after {gen} update(s):\n", game.grid)
\ No newline at end of file
+if __name__ == "__main__":
+    # With arguments, run headless (see --help); without, ask interactively
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    interactive()
@@ -1,9 +1,11 @@
 # cli/menu.py
 # Command-line menu for CourierOptimizer with Pareto, plotting, and console totals.
 
-from CourierOptimizer.core.reader import read_deliveries
+from CourierOptimizer.core.ingest import read_deliveries_parallel
 from CourierOptimizer.core.optimizer import optimize
 from CourierOptimizer.core.transport import MODES
+from CourierOptimizer.core.timewindows import has_time_windows
+from CourierOptimizer.core.validator import parse_time
 from CourierOptimizer.utils.logger import Logger
 from CourierOptimizer.utils.plotter import plot_route
 
@@ -17,7 +19,7 @@ def run_cli():
     csv_path = input("Enter path to CSV file (e.g., C:/Users/.../sample.csv): ").strip()
 
     print("\nReading and validating deliveries...")
-    valid_rows, rejected_rows = read_deliveries(csv_path)
+    valid_rows, rejected_rows = read_deliveries_parallel(csv_path)
     print(f"Valid rows: {len(valid_rows)}")
     print(f"Rejected rows: {len(rejected_rows)}")
 
@@ -37,6 +39,16 @@ def run_cli():
 
     depot = {"lat": depot_lat, "lon": depot_lon}
 
+    # -----------------------------
+    # DEPARTURE TIME (only for delivery windows)
+    # -----------------------------
+    start_time = 0.0
+    if has_time_windows(valid_rows):
+        start_time = parse_time(input("\nDeparture time from depot (HH:MM): ").strip())
+        if start_time is None:
+            print("Invalid departure time. Exiting.")
+            return
+
     # -----------------------------
     # TRANSPORT MODE
     # -----------------------------
@@ -80,13 +92,31 @@ def run_cli():
         print("Invalid objective. Exiting.")
         return
 
+    # -----------------------------
+    # SOLVER
+    # -----------------------------
+    print("\nSelect solver:")
+    print("1. Greedy (any size)")
+    print("2. Exact (small manifests, falls back to greedy)")
+
+    solver_choice = input("Enter choice (1-2): ").strip()
+
+    if solver_choice == "1":
+        solver = "greedy"
+    elif solver_choice == "2":
+        solver = "exact"
+    else:
+        print("Invalid solver. Exiting.")
+        return
+
     print("\nRunning optimization...\n")
 
     # -----------------------------
     # RUN OPTIMIZER (ask for totals)
     # -----------------------------
     route, total_dist, total_time, total_cost, total_co2 = optimize(
-        valid_rows, depot, mode, objective, return_totals=True
+        valid_rows, depot, mode, objective, return_totals=True, solver=solver,
+        start_time=start_time
     )
 
     # -----------------------------
@@ -100,9 +130,15 @@ def run_cli():
     print("\n=== Optimization Complete ===")
     print("Summary of totals:")
     print(f"Total distance: {total_dist:.2f} km")
-    print(f"Total time: {total_time:.2f} hours")
+    print(f"Total time: {total_time:.2f} hours (travel)")
     print(f"Total cost: {total_cost:.2f} NOK")
-    print(f"Total CO2: {total_co2:.2f} g\n")
+    print(f"Total CO2: {total_co2:.2f} g")
+    if "lateness_hours" in route[0]:
+        print(f"Waiting for windows: {sum(stop['wait_hours'] for stop in route):.2f} hours "
+              f"(back at depot at {route[-1]['arrival_hours']:.2f} h)")
+        late = [stop for stop in route if stop["lateness_hours"] > 0]
+        print(f"Late stops: {len(late)} (total lateness {sum(stop['lateness_hours'] for stop in late):.2f} hours)")
+    print()
 
     print("Files saved in /output/:")
     print(" - route.csv")
@@ -0,0 +1,96 @@
+# cli/stream.py
+# Streaming dispatch: reads deliveries from stdin or a (tailed) JSONL/CSV file
+# and prints route deltas as JSON lines.
+
+import argparse
+import json
+import sys
+
+from CourierOptimizer.core.optimizer import build_route, write_route_csv
+from CourierOptimizer.core.streaming import (
+    StreamingDispatcher,
+    detect_format,
+    follow,
+    iter_csv,
+    iter_jsonl,
+)
+from CourierOptimizer.core.transport import MODES
+from CourierOptimizer.utils.logger import Logger
+
+OBJECTIVES = ["fastest", "lowest_cost", "lowest_co2", "pareto"]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Insert deliveries into a live route as they arrive."
+    )
+    parser.add_argument("--input", default="-",
+                        help="JSONL/CSV file to read, or '-' for stdin (default)")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        help="record format (default: from file extension, jsonl for stdin)")
+    parser.add_argument("--follow", action="store_true",
+                        help="keep reading as the file grows, like tail -f")
+    parser.add_argument("--idle-timeout", type=float, default=None,
+                        help="with --follow, stop after this many seconds without new data")
+    parser.add_argument("--depot-lat", type=float, required=True)
+    parser.add_argument("--depot-lon", type=float, required=True)
+    parser.add_argument("--mode", choices=sorted(MODES), default="car")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="fastest")
+    parser.add_argument("--batch-size", type=int, default=200,
+                        help="re-optimise after this many new orders")
+    parser.add_argument("--batch-seconds", type=float, default=5.0,
+                        help="re-optimise after this many seconds")
+    return parser
+
+
+def emit_json(event):
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def run_stream(argv=None):
+    args = build_parser().parse_args(argv)
+
+    depot = {"lat": args.depot_lat, "lon": args.depot_lon}
+    dispatcher = StreamingDispatcher(
+        depot,
+        MODES[args.mode],
+        args.objective,
+        batch_size=args.batch_size,
+        batch_seconds=args.batch_seconds,
+        emit=emit_json,
+    )
+
+    if args.input == "-":
+        lines = sys.stdin
+        fmt = args.format or "jsonl"
+    else:
+        fmt = args.format or detect_format(args.input)
+        if args.follow:
+            lines = follow(args.input, idle_timeout=args.idle_timeout)
+        else:
+            lines = open(args.input, newline="", encoding="utf-8")
+
+    records = iter_csv(lines) if fmt == "csv" else iter_jsonl(lines)
+
+    try:
+        dispatcher.run(records)
+    except KeyboardInterrupt:
+        dispatcher.reoptimize()
+    finally:
+        if lines is not sys.stdin and hasattr(lines, "close"):
+            lines.close()
+
+    logger = Logger("run.log")
+    logger.log("=== Streaming Dispatch Finished ===")
+    logger.log(f"Accepted: {dispatcher.accepted}, rejected: {dispatcher.rejected}")
+    logger.log(f"Max insertion latency: {dispatcher.max_latency * 1000:.2f} ms")
+
+    if dispatcher.stops:
+        write_route_csv(build_route(dispatcher.stops, depot, MODES[args.mode]), "route_stream.csv")
+
+    return dispatcher
+
+
+if __name__ == "__main__":
+    run_stream()
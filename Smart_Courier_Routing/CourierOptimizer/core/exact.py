@@ -0,0 +1,134 @@
+# core/exact.py
+# Exact Held-Karp solver for small manifests (dynamic programming over subsets).
+
+import time
+
+import numpy as np
+
+from CourierOptimizer.core.haversine import haversine_matrix
+from CourierOptimizer.core.scoring import (
+    objective_score,
+    priority_factor,
+    stop_weight,
+    max_weight_of,
+)
+
+# Default guards: above these the optimizer falls back to the greedy heuristic
+EXACT_MAX_STOPS = 18
+EXACT_MAX_BYTES = 512 * 1024 * 1024
+EXACT_TIME_LIMIT = 10.0
+
+
+class ExactSolverLimit(Exception):
+    """
+    Raised when the exact solver would exceed its memory or time guard.
+    """
+
+
+def objective_cost_matrices(deliveries, depot, mode, objective):
+    """
+    Builds the objective costs used by the exact solver.
+
+    Returns:
+        start (n,)   : depot -> stop j
+        legs  (n, n) : stop i -> stop j (diagonal is inf)
+        back  (n,)   : stop i -> depot
+
+    Visiting a stop is scored exactly like the greedy optimizer scores it
+    (priority- and weight-adjusted). The return leg has no stop attached,
+    so it is scored with a neutral priority and zero weight.
+    """
+    max_weight = max_weight_of(deliveries)
+
+    lats = np.array([stop["lat"] for stop in deliveries], dtype=float)
+    lons = np.array([stop["lon"] for stop in deliveries], dtype=float)
+    priorities = np.array([priority_factor(stop) for stop in deliveries], dtype=float)
+    weight_norms = np.array([stop_weight(stop) for stop in deliveries], dtype=float) / max_weight
+
+    dist = haversine_matrix(lats, lons, lats, lons)
+    from_depot = haversine_matrix([depot["lat"]], [depot["lon"]], lats, lons)[0]
+    to_depot = haversine_matrix(lats, lons, [depot["lat"]], [depot["lon"]])[:, 0]
+
+    legs = objective_score(dist, priorities[None, :], weight_norms[None, :], mode, objective)
+    legs = np.asarray(legs, dtype=float)
+    np.fill_diagonal(legs, np.inf)
+
+    start = np.asarray(objective_score(from_depot, priorities, weight_norms, mode, objective), dtype=float)
+    back = np.asarray(objective_score(to_depot, 1.0, 0.0, mode, objective), dtype=float)
+
+    return start, legs, back
+
+
+def held_karp_order(deliveries, depot, mode, objective,
+                    max_bytes=EXACT_MAX_BYTES, time_limit=EXACT_TIME_LIMIT):
+    """
+    Returns the visiting order (list of delivery dicts) that minimises the
+    summed objective cost of the closed tour depot -> ... -> depot.
+
+    The DP table dp[mask, j] holds the cheapest cost of visiting the stops
+    in `mask` and ending at stop j. Masks are processed one popcount layer
+    at a time; within a layer, all masks ending at j are relaxed together
+    with one NumPy min over their predecessors.
+
+    Raises ExactSolverLimit if the DP tables would exceed `max_bytes` or the
+    solve takes longer than `time_limit` seconds.
+    """
+    n = len(deliveries)
+    if n == 0:
+        return []
+    if n == 1:
+        return [deliveries[0]]
+
+    size = 1 << n
+    # dp (float64) + parent (int8) per (mask, stop), plus mask/popcount arrays
+    needed = size * n * 9 + size * 16
+    if needed > max_bytes:
+        raise ExactSolverLimit(
+            f"{n} stops need about {needed / 2**20:.0f} MB, limit is {max_bytes / 2**20:.0f} MB"
+        )
+
+    started = time.time()
+    start, legs, back = objective_cost_matrices(deliveries, depot, mode, objective)
+
+    masks = np.arange(size, dtype=np.int64)
+    popcount = np.zeros(size, dtype=np.int8)
+    for b in range(n):
+        popcount += ((masks >> b) & 1).astype(np.int8)
+
+    dp = np.full((size, n), np.inf)
+    parent = np.full((size, n), -1, dtype=np.int8)
+
+    singles = np.arange(n)
+    dp[1 << singles, singles] = start
+
+    for layer in range(2, n + 1):
+        if time.time() - started > time_limit:
+            raise ExactSolverLimit(f"time limit of {time_limit:.1f} s reached at layer {layer}/{n}")
+
+        layer_masks = masks[popcount == layer]
+        for j in range(n):
+            sel = layer_masks[((layer_masks >> j) & 1) == 1]
+            prev = sel ^ (1 << j)
+
+            # Predecessors not in `prev` are still inf, so they never win
+            candidates = dp[prev] + legs[:, j]
+            best = candidates.argmin(axis=1)
+
+            dp[sel, j] = candidates[np.arange(len(sel)), best]
+            parent[sel, j] = best
+
+    full = size - 1
+    last = int(np.argmin(dp[full] + back))
+
+    # Walk the parent pointers back from the full set
+    order = []
+    mask = full
+    j = last
+    while j >= 0:
+        order.append(j)
+        prev_j = int(parent[mask, j])
+        mask ^= 1 << j
+        j = prev_j
+    order.reverse()
+
+    return [deliveries[i] for i in order]
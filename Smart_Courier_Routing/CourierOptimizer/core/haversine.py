@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
     Computes the Haversine distance between two coordinates.
@@ -28,3 +30,49 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
     return R * c
+
+
+def haversine_matrix(lats1, lons1, lats2, lons2):
+    """
+    Vectorised Haversine distance between every point of the first set
+    and every point of the second set.
+    Result: NumPy array of shape (len(lats1), len(lats2)) in kilometers.
+    """
+    R = 6371  # Earth radius in km
+
+    lat1 = np.radians(np.asarray(lats1, dtype=float))[:, None]
+    lon1 = np.radians(np.asarray(lons1, dtype=float))[:, None]
+    lat2 = np.radians(np.asarray(lats2, dtype=float))[None, :]
+    lon2 = np.radians(np.asarray(lons2, dtype=float))[None, :]
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return R * c
+
+
+def haversine_pairwise(lats1, lons1, lats2, lons2):
+    """
+    Vectorised Haversine distance between matching points of two sets
+    (point i of the first set to point i of the second set).
+    Result: NumPy array of shape (len(lats1),) in kilometers.
+    """
+    R = 6371  # Earth radius in km
+
+    lat1 = np.radians(np.asarray(lats1, dtype=float))
+    lon1 = np.radians(np.asarray(lons1, dtype=float))
+    lat2 = np.radians(np.asarray(lats2, dtype=float))
+    lon2 = np.radians(np.asarray(lons2, dtype=float))
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return R * c
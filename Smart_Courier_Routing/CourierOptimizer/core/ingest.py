@@ -0,0 +1,292 @@
+# core/ingest.py
+# Parallel CSV ingestion: byte ranges of one manifest parsed and validated in worker processes.
+
+import csv
+import io
+import math
+import multiprocessing
+import os
+import re
+
+import numpy as np
+
+from CourierOptimizer.core.reader import parse_delivery
+
+# Bytes read at a time while counting quotes and looking for record ends
+BLOCK_SIZE = 1 << 22
+
+# Ranges per worker, so that uneven ranges still keep every worker busy
+RANGES_PER_WORKER = 4
+
+# Below this size the file is parsed in this process
+MIN_PARALLEL_BYTES = 1 << 20
+
+COLUMNS = ("row", "customer", "lat", "lon", "priority", "weight", "window_start", "window_end")
+
+_QUOTE_OR_NEWLINE = re.compile(rb'["\n]')
+
+
+# --------------------------------------------------------------
+# SPLITTING
+# --------------------------------------------------------------
+def _header_end(f):
+    """
+    Offset just after the header record (which may itself contain quoted newlines).
+    """
+    f.seek(0)
+    in_quotes = False
+    offset = 0
+    while True:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            return offset
+        for match in _QUOTE_OR_NEWLINE.finditer(block):
+            if match.group() == b'"':
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                return offset + match.end()
+        offset += len(block)
+
+
+def _next_record_start(f, offset, in_quotes, size):
+    """
+    Offset just after the first newline at or after `offset` that is not
+    inside a quoted field, given whether `offset` itself is inside quotes.
+    """
+    f.seek(offset)
+    while offset < size:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            break
+        for match in _QUOTE_OR_NEWLINE.finditer(block):
+            if match.group() == b'"':
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                return offset + match.end()
+        offset += len(block)
+    return size
+
+
+def split_byte_ranges(filepath, parts):
+    """
+    Splits the data records of a CSV file into at most `parts` byte ranges
+    that each start and end on a record boundary.
+
+    A newline ends a record only outside quoted fields, i.e. after an even
+    number of quote characters since the start of the data ('""' escapes
+    count twice, so they keep the parity). One sequential pass counts the
+    quotes up to each nominal split point; from there the split moves to
+    the next newline with even parity. As in RFC 4180 CSV, quote characters
+    are expected only around and inside quoted fields.
+
+    Returns (header_end, [(start, end), ...]).
+    """
+    size = os.path.getsize(filepath)
+    with open(filepath, "rb") as f:
+        start = _header_end(f)
+        if start >= size:
+            return start, []
+
+        targets = [start + (size - start) * i // parts for i in range(1, parts)]
+        boundaries = [start]
+        position = start
+        quotes = 0
+        f.seek(start)
+        for target in targets:
+            if target <= boundaries[-1]:
+                continue
+            # Count quotes from the last position up to the nominal split point
+            f.seek(position)
+            while position < target:
+                block = f.read(min(BLOCK_SIZE, target - position))
+                quotes += block.count(b'"')
+                position += len(block)
+            boundary = _next_record_start(f, target, quotes % 2 == 1, size)
+            if boundary >= size:
+                break
+            # Bring the count up to the new boundary for the next split
+            f.seek(target)
+            quotes += f.read(boundary - target).count(b'"')
+            position = boundary
+            boundaries.append(boundary)
+        boundaries.append(size)
+
+    return start, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+# --------------------------------------------------------------
+# WORKERS
+# --------------------------------------------------------------
+def _window_value(delivery, key):
+    """
+    Window side as a float column value; NaN when open or not given.
+    """
+    value = delivery.get(key)
+    return float("nan") if value is None else value
+
+
+def parse_range(job):
+    """
+    Parses and validates the records in one byte range.
+
+    Returns (record count, valid columns, rejected rows): the columns hold
+    the valid deliveries (with "row", the record number within the range)
+    as NumPy arrays and lists; rejected rows are (row, raw record) pairs.
+    """
+    filepath, fieldnames, start, end = job
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+
+    rows = []
+    customers = []
+    lats = []
+    lons = []
+    priorities = []
+    weights = []
+    window_starts = []
+    window_ends = []
+    rejected = []
+
+    reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames)
+    count = 0
+    for count, row in enumerate(reader, start=1):
+        delivery = parse_delivery(row)
+        if delivery is None:
+            rejected.append((count - 1, row))
+            continue
+        rows.append(count - 1)
+        customers.append(delivery["customer"])
+        lats.append(delivery["lat"])
+        lons.append(delivery["lon"])
+        priorities.append(delivery["priority"])
+        weights.append(delivery["weight"])
+        window_starts.append(_window_value(delivery, "window_start"))
+        window_ends.append(_window_value(delivery, "window_end"))
+
+    columns = {
+        "row": np.array(rows, dtype=np.int64),
+        "customer": customers,
+        "lat": np.array(lats, dtype=float),
+        "lon": np.array(lons, dtype=float),
+        "priority": priorities,
+        "weight": np.array(weights, dtype=float),
+        "window_start": np.array(window_starts, dtype=float),
+        "window_end": np.array(window_ends, dtype=float),
+    }
+    return count, columns, rejected
+
+
+# --------------------------------------------------------------
+# MERGING
+# --------------------------------------------------------------
+def _merge(results):
+    """
+    Concatenates per-range results in range order; row numbers become
+    record numbers within the whole file.
+    """
+    offset = 0
+    rows = []
+    customers = []
+    lats = []
+    lons = []
+    priorities = []
+    weights = []
+    window_starts = []
+    window_ends = []
+    rejected = []
+    for count, columns, range_rejected in results:
+        rows.append(columns["row"] + offset)
+        customers.extend(columns["customer"])
+        lats.append(columns["lat"])
+        lons.append(columns["lon"])
+        priorities.extend(columns["priority"])
+        weights.append(columns["weight"])
+        window_starts.append(columns["window_start"])
+        window_ends.append(columns["window_end"])
+        rejected.extend(row for _, row in range_rejected)
+        offset += count
+
+    def joined(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    columns = {
+        "row": joined(rows, np.int64),
+        "customer": customers,
+        "lat": joined(lats, float),
+        "lon": joined(lons, float),
+        "priority": priorities,
+        "weight": joined(weights, float),
+        "window_start": joined(window_starts, float),
+        "window_end": joined(window_ends, float),
+    }
+    return columns, rejected
+
+
+def columns_to_deliveries(columns):
+    """
+    Turns merged columns back into the delivery dicts read_deliveries returns.
+    """
+    deliveries = []
+    for customer, lat, lon, priority, weight, window_start, window_end in zip(
+        columns["customer"],
+        columns["lat"].tolist(),
+        columns["lon"].tolist(),
+        columns["priority"],
+        columns["weight"].tolist(),
+        columns["window_start"].tolist(),
+        columns["window_end"].tolist(),
+    ):
+        delivery = {"customer": customer, "lat": lat, "lon": lon, "priority": priority, "weight": weight}
+        window_start = None if math.isnan(window_start) else window_start
+        window_end = None if math.isnan(window_end) else window_end
+        if window_start is not None or window_end is not None:
+            delivery["window_start"] = window_start
+            delivery["window_end"] = window_end
+        deliveries.append(delivery)
+    return deliveries
+
+
+def read_deliveries_parallel(filepath, workers=None, columnar=False):
+    """
+    Parallel version of read_deliveries for large manifests.
+
+    The file is split into byte ranges on record boundaries (quoted
+    newlines included); worker processes parse and validate the ranges
+    with the same rules as read_deliveries, and the results are merged in
+    the original row order. Small files are read in this process.
+
+    Returns:
+        valid_rows (list of dict), or with columnar=True a dict of columns
+        (COLUMNS: "row" is the record number in the file, window sides
+        without a value are NaN) that skips
+        building one dict per delivery
+        rejected_rows (list of dict)
+    """
+    workers = workers or os.cpu_count() or 1
+    try:
+        size = os.path.getsize(filepath)
+        with open(filepath, newline="", encoding="utf-8") as f:
+            fieldnames = next(csv.reader(f), None)
+    except FileNotFoundError:
+        print("File not found. Please check your CSV path.")
+        return ({column: [] for column in COLUMNS} if columnar else []), []
+
+    if fieldnames is None:
+        results = []
+    else:
+        parts = workers * RANGES_PER_WORKER if workers > 1 and size >= MIN_PARALLEL_BYTES else 1
+        _, ranges = split_byte_ranges(filepath, parts)
+        jobs = [(filepath, fieldnames, start, end) for start, end in ranges]
+        if len(jobs) > 1:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+            with context.Pool(min(workers, len(jobs))) as pool:
+                results = pool.map(parse_range, jobs, chunksize=1)
+        else:
+            results = [parse_range(job) for job in jobs]
+
+    columns, rejected = _merge(results)
+    if columnar:
+        return columns, rejected
+    return columns_to_deliveries(columns), rejected
@@ -4,6 +4,8 @@
 import os
 import csv
 
+import numpy as np
+
 
 def write_metrics_csv(metrics, filename="metrics.csv"):
     """
@@ -32,3 +34,147 @@ def write_metrics_csv(metrics, filename="metrics.csv"):
         writer.writerows(metrics)
 
     print(f"Metrics saved to: {full_path}")
+
+
+# --------------------------------------------------------------
+# COLUMN-BASED METRICS (large runs)
+# --------------------------------------------------------------
+METRIC_COLUMNS = (
+    "iteration",
+    "selected_customer",
+    "raw_distance",
+    "weighted_score",
+    "cumulative_distance",
+    "cumulative_time",
+    "cumulative_cost",
+    "cumulative_co2",
+)
+
+# Rows formatted per write() call; bounds the size of the text buffer
+WRITE_BLOCK_ROWS = 65536
+
+
+class MetricsRecorder:
+    """
+    Per-iteration metrics kept in preallocated NumPy columns instead of one
+    dict per iteration.
+
+    sample_every:
+        keep every n-th iteration (1 = all). The last iteration is always kept,
+        so the final cumulative totals are never lost.
+    summary_only:
+        keep only the last iteration (one summary row).
+    """
+
+    def __init__(self, capacity, sample_every=1, summary_only=False):
+        if sample_every < 1:
+            raise ValueError("sample_every must be a positive integer.")
+
+        self.sample_every = sample_every
+        self.summary_only = summary_only
+
+        # +1 leaves room for the final iteration when it falls between samples
+        size = 1 if summary_only else (max(capacity, 0) + sample_every - 1) // sample_every + 1
+
+        self.iteration = np.zeros(size, dtype=np.int64)
+        self.selected_customer = np.empty(size, dtype=object)
+        self.raw_distance = np.zeros(size)
+        self.weighted_score = np.zeros(size)
+        self.cumulative_distance = np.zeros(size)
+        self.cumulative_time = np.zeros(size)
+        self.cumulative_cost = np.zeros(size)
+        self.cumulative_co2 = np.zeros(size)
+
+        self.size = 0
+        self._last = None
+
+    def record(self, iteration, customer, raw_distance, weighted_score,
+               cumulative_distance, cumulative_time, cumulative_cost, cumulative_co2):
+        """
+        Records one iteration (1-based), subject to the sampling settings.
+        """
+        values = (iteration, customer, raw_distance, weighted_score,
+                  cumulative_distance, cumulative_time, cumulative_cost, cumulative_co2)
+
+        if self.summary_only or (iteration - 1) % self.sample_every:
+            # Not sampled: remember it in case it turns out to be the last one
+            self._last = values
+            return
+
+        self._store(values)
+        self._last = None
+
+    def finish(self):
+        """
+        Makes sure the final iteration is stored. Call once after the loop.
+        """
+        if self._last is not None:
+            self._store(self._last)
+            self._last = None
+
+    def _store(self, values):
+        i = self.size
+        for name, value in zip(METRIC_COLUMNS, values):
+            getattr(self, name)[i] = value
+        self.size += 1
+
+    def __len__(self):
+        return self.size
+
+    def columns(self):
+        """
+        Dict of column name -> NumPy array (trimmed to the recorded rows).
+        """
+        return {name: getattr(self, name)[:self.size] for name in METRIC_COLUMNS}
+
+    def rows(self):
+        """
+        Recorded metrics as a list of dicts (same shape as the old metrics list).
+        """
+        cols = self.columns()
+        return [
+            {name: cols[name][i].item() if name != "selected_customer" else cols[name][i]
+             for name in METRIC_COLUMNS}
+            for i in range(self.size)
+        ]
+
+
+def _csv_quote(value):
+    """
+    Quotes a text field the way csv.writer (QUOTE_MINIMAL) does.
+    """
+    value = str(value)
+    if any(ch in value for ch in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_metrics_columns(recorder, filename="metrics.csv"):
+    """
+    Bulk writer for a MetricsRecorder: every column is formatted in one
+    NumPy call per block of rows, then whole blocks are written at once.
+    The file has the same columns and formatting as write_metrics_csv.
+    """
+    output_dir = os.path.join(os.getcwd(), "output")
+    os.makedirs(output_dir, exist_ok=True)
+    full_path = os.path.join(output_dir, filename)
+
+    if not len(recorder):
+        print("No metrics to write.")
+        return
+
+    cols = recorder.columns()
+
+    with open(full_path, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(METRIC_COLUMNS) + "\r\n")
+
+        for start in range(0, len(recorder), WRITE_BLOCK_ROWS):
+            block = slice(start, start + WRITE_BLOCK_ROWS)
+            text_cols = [
+                [_csv_quote(v) for v in cols[name][block]] if name == "selected_customer"
+                else cols[name][block].astype(str).tolist()
+                for name in METRIC_COLUMNS
+            ]
+            f.write("\r\n".join(map(",".join, zip(*text_cols))) + "\r\n")
+
+    print(f"Metrics saved to: {full_path}")
@@ -8,18 +8,59 @@ from math import inf
 from CourierOptimizer.core.haversine import haversine_distance
 from CourierOptimizer.utils.logger import Logger
 from CourierOptimizer.utils.decorators import timing_decorator
-from CourierOptimizer.core.metrics_writer import write_metrics_csv
+from CourierOptimizer.core.metrics_writer import MetricsRecorder, write_metrics_columns
+from CourierOptimizer.core.scoring import (
+    objective_score,
+    priority_factor,
+    stop_weight,
+    max_weight_of,
+)
+from CourierOptimizer.core.exact import (
+    EXACT_MAX_STOPS,
+    ExactSolverLimit,
+    held_karp_order,
+)
+from CourierOptimizer.core.timewindows import (
+    arrive,
+    has_time_windows,
+    plan_with_windows,
+)
+
+SOLVERS = ("greedy", "exact")
+
+
+def _segment(current_lat, current_lon, stop, max_weight, mode, objective):
+    """
+    Scores travelling from the current location to `stop`.
+    Returns (score, distance, time_hours, cost, co2).
+    """
+    # Distance from current location to candidate stop
+    dist = haversine_distance(
+        current_lat,
+        current_lon,
+        stop["lat"],
+        stop["lon"],
+    )
+
+    # Normalised weight in [0, 1]
+    weight_norm = stop_weight(stop) / max_weight if max_weight > 0 else 0.0
 
-# Priority effect: lower weight = more important (High < Medium < Low)
-PRIORITY_WEIGHTS = {
-    "High": 0.6,
-    "Medium": 1.0,
-    "Low": 1.2,
-}
+    score = objective_score(dist, priority_factor(stop), weight_norm, mode, objective)
+
+    return (
+        score,
+        dist,
+        dist / mode.speed_kmh,
+        dist * mode.cost_per_km,
+        dist * mode.co2_per_km,
+    )
 
 
 @timing_decorator
-def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
+def optimize(deliveries, depot, mode, objective, return_totals: bool = False,
+             solver: str = "greedy", exact_max_stops: int = EXACT_MAX_STOPS,
+             metrics_every: int = 1, metrics_summary_only: bool = False,
+             start_time: float = 0.0):
     """
     Main optimisation function using a greedy, nearest-best approach.
 
@@ -29,36 +70,75 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
       - 'lowest_co2'   : minimise emissions (with priority penalty)
       - 'pareto'       : simple multi-objective combination of time, cost, and CO2
 
+    solver:
+        'greedy' → nearest-best heuristic (default)
+        'exact'  → Held-Karp optimum of the same objective costs for
+                   manifests of at most `exact_max_stops` stops; larger
+                   manifests, or solves that hit the memory/time guards,
+                   fall back to 'greedy' automatically
+
+    Delivery windows (window_start / window_end, in hours):
+        if any stop has one, the order comes from plan_with_windows, which
+        only picks stops it can still reach before their window closes
+        (leaving the depot at `start_time`); the exact solver does not model
+        windows and is not used then. ETAs come from mode.speed_kmh, early
+        arrivals wait for the window to open, and route.csv gets the
+        arrival, window, wait and lateness of every stop. The returned
+        total time stays travel time; waiting is logged separately.
+
+    metrics_every / metrics_summary_only:
+        metrics.csv keeps every n-th iteration (the last one is always kept),
+        or only one summary row. route.csv always has every stop.
+
     return_totals:
         False → return only route (pytest expects this)
         True  → return route + totals (CLI uses this)
     """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver: {solver}. Available solvers: {list(SOLVERS)}")
+
     logger = Logger("run.log")
     logger.log("=== Optimization Run Started ===")
     logger.log(f"Depot: {depot}")
     logger.log(f"Mode: {mode.name}")
     logger.log(f"Objective: {objective}")
+    logger.log(f"Solver: {solver}")
 
     # Copy list to avoid modifying original
     unvisited = deliveries.copy()
 
     # Pre-compute a max weight for normalisation (avoid division by zero)
-    weight_values = []
-    for stop in deliveries:
-        try:
-            w = float(stop.get("weight", 0))
-            if w > 0:
-                weight_values.append(w)
-        except (TypeError, ValueError):
-            continue
-    max_weight = max(weight_values) if weight_values else 1.0
+    max_weight = max_weight_of(deliveries)
+
+    # Windowed or exact mode: fix the whole visiting order up front
+    planned = None
+    windowed = has_time_windows(deliveries)
+    if windowed:
+        if solver == "exact":
+            logger.log("Delivery windows present; the exact solver ignores them, using the window-aware greedy.")
+        planned = plan_with_windows(deliveries, depot, mode, objective, start_time)
+    elif solver == "exact":
+        if len(deliveries) > exact_max_stops:
+            logger.log(
+                f"{len(deliveries)} stops exceed exact_max_stops={exact_max_stops}; "
+                "falling back to greedy."
+            )
+        else:
+            try:
+                planned = held_karp_order(deliveries, depot, mode, objective)
+            except ExactSolverLimit as e:
+                logger.log(f"Exact solver stopped ({e}); falling back to greedy.")
 
     # Start at depot
     current_lat = depot["lat"]
     current_lon = depot["lon"]
 
     route = []
-    metrics = []
+    clock = start_time
+    late_stops = 0
+    total_lateness = 0.0
+    total_wait = 0.0
+    metrics = MetricsRecorder(len(deliveries), metrics_every, metrics_summary_only)
     iteration = 1
 
     # Running totals
@@ -67,94 +147,43 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
     total_cost = 0.0
     total_co2 = 0.0
 
-    # Weights used in Pareto scoring (can be tuned)
-    w_time = 0.5
-    w_cost = 0.3
-    w_co2 = 0.2
-
     # --------------------------------------------------------------
     # MAIN LOOP
     # --------------------------------------------------------------
-    while unvisited:
-
-        best_stop = None
-        best_score = inf
-        best_distance = 0.0
-        best_time = 0.0
-        best_cost = 0.0
-        best_co2 = 0.0
-
-        for stop in unvisited:
-            # Distance from current location to candidate stop
-            dist = haversine_distance(
-                current_lat,
-                current_lon,
-                stop["lat"],
-                stop["lon"],
-            )
+    while iteration <= len(deliveries):
 
-            # Priority factor (defensive default = 1.0)
-            priority_factor = PRIORITY_WEIGHTS.get(stop.get("priority", "Medium"), 1.0)
-
-            # Weight in kilograms (defensive parsing)
-            try:
-                weight_kg = float(stop.get("weight", 0.0))
-            except (TypeError, ValueError):
-                weight_kg = 0.0
-
-            # Normalised weight in [0, 1]
-            weight_norm = weight_kg / max_weight if max_weight > 0 else 0.0
-
-            # Base travel metrics for this segment
-            time_hours = dist / mode.speed_kmh
-            cost_units = dist * mode.cost_per_km
-            co2_units = dist * mode.co2_per_km
-
-            # Slightly different interpretations per objective so that
-            # routes can actually change depending on the goal.
-            if objective == "fastest":
-                # Pure time, but still slightly influenced by priority
-                score = time_hours * priority_factor
-
-            elif objective == "lowest_cost":
-                # Heavier parcels increase effective cost penalty
-                cost_with_weight = cost_units * (1.0 + 0.4 * weight_norm)
-                score = cost_with_weight * priority_factor
-
-            elif objective == "lowest_co2":
-                # Low-priority stops are penalised more for emissions
-                co2_with_priority = co2_units * (1.0 + 0.3 * (priority_factor - 1.0))
-                score = co2_with_priority
-
-            elif objective == "pareto":
-                # Simple multi-objective weighted sum
-                # Time (hours), cost, and CO2 scaled into one score
-                cost_with_weight = cost_units * (1.0 + 0.4 * weight_norm)
-                co2_with_priority = co2_units * (1.0 + 0.3 * (priority_factor - 1.0))
-
-                score = priority_factor * (
-                    w_time * time_hours +
-                    w_cost * cost_with_weight +
-                    w_co2 * co2_with_priority
+        if planned is not None:
+            # Next stop of the planned order (exact tour or window-aware plan)
+            best_stop = planned[iteration - 1]
+            best_score, best_distance, best_time, best_cost, best_co2 = _segment(
+                current_lat, current_lon, best_stop, max_weight, mode, objective
+            )
+        else:
+            best_stop = None
+            best_score = inf
+            best_distance = 0.0
+            best_time = 0.0
+            best_cost = 0.0
+            best_co2 = 0.0
+
+            for stop in unvisited:
+                score, dist, time_hours, cost_units, co2_units = _segment(
+                    current_lat, current_lon, stop, max_weight, mode, objective
                 )
 
-            else:
-                # Default fallback: fastest
-                score = time_hours * priority_factor
-
-            # Greedy choice: keep the best-scoring stop
-            if score < best_score:
-                best_score = score
-                best_stop = stop
-                best_distance = dist
-                best_time = time_hours
-                best_cost = cost_units
-                best_co2 = co2_units
+                # Greedy choice: keep the best-scoring stop
+                if score < best_score:
+                    best_score = score
+                    best_stop = stop
+                    best_distance = dist
+                    best_time = time_hours
+                    best_cost = cost_units
+                    best_co2 = co2_units
 
         # ------------- After choosing the best stop for this step -------------
 
         # Add chosen stop to route
-        route.append({
+        row = {
             "customer": best_stop["customer"],
             "lat": best_stop["lat"],
             "lon": best_stop["lon"],
@@ -164,19 +193,27 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
             "eta_hours": best_time,
             "cost": best_cost,
             "co2": best_co2,
-        })
+        }
+        if windowed:
+            arrival, wait, lateness, clock = arrive(clock, best_time, best_stop)
+            _add_schedule(row, arrival, best_stop, wait, lateness)
+            total_wait += wait
+            if lateness > 0:
+                late_stops += 1
+                total_lateness += lateness
+        route.append(row)
 
         # Save metrics row
-        metrics.append({
-            "iteration": iteration,
-            "selected_customer": best_stop["customer"],
-            "raw_distance": best_distance,
-            "weighted_score": best_score,
-            "cumulative_distance": total_distance + best_distance,
-            "cumulative_time": total_time + best_time,
-            "cumulative_cost": total_cost + best_cost,
-            "cumulative_co2": total_co2 + best_co2,
-        })
+        metrics.record(
+            iteration,
+            best_stop["customer"],
+            best_distance,
+            best_score,
+            total_distance + best_distance,
+            total_time + best_time,
+            total_cost + best_cost,
+            total_co2 + best_co2,
+        )
         iteration += 1
 
         # Update totals
@@ -189,8 +226,9 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
         current_lat = best_stop["lat"]
         current_lon = best_stop["lon"]
 
-        # Mark stop as visited
-        unvisited.remove(best_stop)
+        # Mark stop as visited (a planned order is simply followed)
+        if planned is None:
+            unvisited.remove(best_stop)
 
     # --------------------------------------------------------------
     # RETURN TO DEPOT
@@ -200,7 +238,7 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
     rcost = rdist * mode.cost_per_km
     rco2 = rdist * mode.co2_per_km
 
-    route.append({
+    row = {
         "customer": "RETURN_TO_DEPOT",
         "lat": depot["lat"],
         "lon": depot["lon"],
@@ -210,7 +248,10 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
         "eta_hours": rtime,
         "cost": rcost,
         "co2": rco2,
-    })
+    }
+    if windowed:
+        _add_schedule(row, clock + rtime, {}, 0.0, 0.0)
+    route.append(row)
 
     # Update totals
     total_distance += rdist
@@ -220,10 +261,15 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
 
     # Log totals
     logger.log_totals(total_distance, total_time, total_cost, total_co2)
+    if windowed:
+        # Total time is travel only; waiting for windows is reported beside it
+        logger.log(f"Waiting for windows: {total_wait:.3f} hours (route ends at {clock + rtime:.3f} h)")
+        logger.log(f"Late stops: {late_stops} of {len(deliveries)}, total lateness {total_lateness:.3f} hours")
 
     # Write output files
     write_route_csv(route)
-    write_metrics_csv(metrics)
+    metrics.finish()
+    write_metrics_columns(metrics)
 
     # Return format depends on caller
     if return_totals:
@@ -232,6 +278,58 @@ def optimize(deliveries, depot, mode, objective, return_totals: bool = False):
         return route
 
 
+def _add_schedule(row, arrival, stop, wait, lateness):
+    """
+    Adds the time-window columns to a route row (open window sides are blank).
+    """
+    window_start = stop.get("window_start")
+    window_end = stop.get("window_end")
+    row["arrival_hours"] = arrival
+    row["window_start"] = "" if window_start is None else window_start
+    row["window_end"] = "" if window_end is None else window_end
+    row["wait_hours"] = wait
+    row["lateness_hours"] = lateness
+
+
+# --------------------------------------------------------------
+# ROUTE FOR A FIXED ORDER
+# --------------------------------------------------------------
+def build_route(order, depot, mode):
+    """
+    Builds route rows (same columns as optimize) for a visiting order that
+    was decided elsewhere, e.g. by the streaming dispatcher.
+    The last row is RETURN_TO_DEPOT.
+    """
+    route = []
+    total_distance = 0.0
+    current_lat = depot["lat"]
+    current_lon = depot["lon"]
+
+    for stop in list(order) + [None]:
+        if stop is None:
+            stop = {"customer": "RETURN_TO_DEPOT", "lat": depot["lat"], "lon": depot["lon"]}
+
+        dist = haversine_distance(current_lat, current_lon, stop["lat"], stop["lon"])
+        total_distance += dist
+
+        route.append({
+            "customer": stop["customer"],
+            "lat": stop["lat"],
+            "lon": stop["lon"],
+            "priority": stop.get("priority", "-"),
+            "distance_from_prev": dist,
+            "cumulative_distance": total_distance,
+            "eta_hours": dist / mode.speed_kmh,
+            "cost": dist * mode.cost_per_km,
+            "co2": dist * mode.co2_per_km,
+        })
+
+        current_lat = stop["lat"]
+        current_lon = stop["lon"]
+
+    return route
+
+
 # --------------------------------------------------------------
 # ROUTE CSV WRITER
 # --------------------------------------------------------------
@@ -7,9 +7,67 @@ from CourierOptimizer.core.validator import (
     is_valid_lon,
     is_valid_priority,
     is_valid_weight,
+    is_valid_window,
+    parse_time,
 )
 
 
+def _field(row, key):
+    """
+    Returns a stripped string value from a raw record (CSV or JSON).
+    """
+    value = row.get(key, "")
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def parse_delivery(row):
+    """
+    Validates one raw record (CSV columns: customer, latitude, longitude,
+    priority, weight_kg, and optionally window_start, window_end).
+
+    A delivery with a window gets "window_start" and "window_end" keys in
+    hours (None for an open side); deliveries without one have neither.
+
+    Returns:
+        delivery dict if the record is valid, otherwise None
+    """
+    customer = _field(row, "customer")
+    lat = _field(row, "latitude")
+    lon = _field(row, "longitude")
+    priority = _field(row, "priority")
+    weight = _field(row, "weight_kg")
+    window_start = _field(row, "window_start")
+    window_end = _field(row, "window_end")
+
+    valid = (
+        is_valid_name(customer)
+        and is_valid_lat(lat)
+        and is_valid_lon(lon)
+        and is_valid_priority(priority)
+        and is_valid_weight(weight)
+        and is_valid_window(window_start, window_end)
+    )
+
+    if not valid:
+        return None
+
+    delivery = {
+        "customer": customer,
+        "lat": float(lat),
+        "lon": float(lon),
+        "priority": priority,
+        "weight": float(weight),
+    }
+
+    if window_start or window_end:
+        delivery["window_start"] = parse_time(window_start) if window_start else None
+        delivery["window_end"] = parse_time(window_end) if window_end else None
+
+    return delivery
+
+
 def read_deliveries(filepath):
     """
     Reads a CSV file and validates each row.
@@ -27,28 +85,10 @@ def read_deliveries(filepath):
             reader = csv.DictReader(f)
 
             for row in reader:
-                customer = row.get("customer", "").strip()
-                lat = row.get("latitude", "").strip()
-                lon = row.get("longitude", "").strip()
-                priority = row.get("priority", "").strip()
-                weight = row.get("weight_kg", "").strip()
-
-                valid = (
-                    is_valid_name(customer)
-                    and is_valid_lat(lat)
-                    and is_valid_lon(lon)
-                    and is_valid_priority(priority)
-                    and is_valid_weight(weight)
-                )
-
-                if valid:
-                    valid_rows.append({
-                        "customer": customer,
-                        "lat": float(lat),
-                        "lon": float(lon),
-                        "priority": priority,
-                        "weight": float(weight),
-                    })
+                delivery = parse_delivery(row)
+
+                if delivery is not None:
+                    valid_rows.append(delivery)
                 else:
                     rejected_rows.append(row)
 
@@ -0,0 +1,82 @@
+# core/scoring.py
+# Objective scores shared by the greedy and exact route builders.
+
+# Priority effect: lower weight = more important (High < Medium < Low)
+PRIORITY_WEIGHTS = {
+    "High": 0.6,
+    "Medium": 1.0,
+    "Low": 1.2,
+}
+
+# Weights used in Pareto scoring (can be tuned)
+PARETO_WEIGHTS = {
+    "time": 0.5,
+    "cost": 0.3,
+    "co2": 0.2,
+}
+
+
+def priority_factor(stop):
+    """
+    Priority factor of a stop (defensive default = 1.0).
+    """
+    return PRIORITY_WEIGHTS.get(stop.get("priority", "Medium"), 1.0)
+
+
+def stop_weight(stop):
+    """
+    Weight of a stop in kilograms (defensive parsing, default = 0.0).
+    """
+    try:
+        return float(stop.get("weight", 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def max_weight_of(deliveries):
+    """
+    Largest positive weight in the manifest, used for normalisation.
+    Returns 1.0 when no stop has a positive weight (avoid division by zero).
+    """
+    weight_values = [w for w in (stop_weight(stop) for stop in deliveries) if w > 0]
+    return max(weight_values) if weight_values else 1.0
+
+
+def objective_score(dist, priority, weight_norm, mode, objective):
+    """
+    Score of travelling `dist` km to a stop with the given priority factor
+    and normalised weight. Lower is better.
+
+    Only plain arithmetic is used, so the arguments may be floats or
+    NumPy arrays (the exact solver scores a whole cost matrix at once).
+    """
+    # Base travel metrics for this segment
+    time_hours = dist / mode.speed_kmh
+    cost_units = dist * mode.cost_per_km
+    co2_units = dist * mode.co2_per_km
+
+    # Slightly different interpretations per objective so that
+    # routes can actually change depending on the goal.
+    if objective == "lowest_cost":
+        # Heavier parcels increase effective cost penalty
+        cost_with_weight = cost_units * (1.0 + 0.4 * weight_norm)
+        return cost_with_weight * priority
+
+    if objective == "lowest_co2":
+        # Low-priority stops are penalised more for emissions
+        return co2_units * (1.0 + 0.3 * (priority - 1.0))
+
+    if objective == "pareto":
+        # Simple multi-objective weighted sum
+        # Time (hours), cost, and CO2 scaled into one score
+        cost_with_weight = cost_units * (1.0 + 0.4 * weight_norm)
+        co2_with_priority = co2_units * (1.0 + 0.3 * (priority - 1.0))
+
+        return priority * (
+            PARETO_WEIGHTS["time"] * time_hours +
+            PARETO_WEIGHTS["cost"] * cost_with_weight +
+            PARETO_WEIGHTS["co2"] * co2_with_priority
+        )
+
+    # 'fastest' and default fallback: pure time, slightly influenced by priority
+    return time_hours * priority
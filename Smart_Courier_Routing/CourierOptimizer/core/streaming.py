@@ -0,0 +1,287 @@
+# core/streaming.py
+# Online dispatch: inserts deliveries into a live route as they arrive.
+
+import csv
+import json
+import os
+import time
+
+import numpy as np
+
+from CourierOptimizer.core.haversine import haversine_matrix, haversine_pairwise
+from CourierOptimizer.core.reader import parse_delivery
+from CourierOptimizer.core.scoring import objective_score, priority_factor, stop_weight
+
+
+class StreamingDispatcher:
+    """
+    Keeps a live route (depot -> stops -> depot) and inserts every incoming
+    delivery at the position with the cheapest objective increase.
+
+    All insertion positions are scored in one vectorised pass, so the cost of
+    one order is O(route length) in NumPy, not in Python. Every
+    `batch_size` orders (or `batch_seconds` seconds) the stops inserted since
+    the last batch are removed and re-inserted once more, which repairs
+    choices that later orders made worse.
+
+    Every change is reported through `emit(event_dict)` as it happens.
+    """
+
+    def __init__(self, depot, mode, objective, batch_size=200, batch_seconds=5.0, emit=None):
+        self.depot = depot
+        self.mode = mode
+        self.objective = objective
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.emit = emit if emit is not None else (lambda event: None)
+
+        # Route in visiting order, plus parallel NumPy columns for scoring
+        self.stops = []
+        self.lats = np.empty(0)
+        self.lons = np.empty(0)
+        self.priorities = np.empty(0)
+        self.weights = np.empty(0)
+
+        # leg_scores[i] is the score of the leg arriving at position i;
+        # the last entry is the return leg to the depot.
+        self.leg_scores = np.zeros(1)
+        self.max_weight = 1.0
+
+        self.pending = []
+        self.last_batch = time.time()
+
+        self.accepted = 0
+        self.rejected = 0
+        self.max_latency = 0.0
+
+    # --------------------------------------------------------------
+    # SCORING HELPERS
+    # --------------------------------------------------------------
+    def _leg_scores_to(self, lat, lon, priority, weight_norm):
+        """
+        Score of arriving at (lat, lon) from the depot and from every stop.
+        Entry i is "from the point before position i".
+        """
+        prev_lats = np.concatenate(([self.depot["lat"]], self.lats))
+        prev_lons = np.concatenate(([self.depot["lon"]], self.lons))
+        dist = haversine_matrix(prev_lats, prev_lons, [lat], [lon])[:, 0]
+        return objective_score(dist, priority, weight_norm, self.mode, self.objective)
+
+    def _leg_scores_from(self, lat, lon):
+        """
+        Score of leaving (lat, lon) towards every stop and finally the depot.
+        Entry i is "to the point currently at position i".
+        """
+        next_lats = np.concatenate((self.lats, [self.depot["lat"]]))
+        next_lons = np.concatenate((self.lons, [self.depot["lon"]]))
+        next_priorities = np.concatenate((self.priorities, [1.0]))
+        next_norms = np.concatenate((self.weights / self.max_weight, [0.0]))
+        dist = haversine_matrix([lat], [lon], next_lats, next_lons)[0]
+        return objective_score(dist, next_priorities, next_norms, self.mode, self.objective)
+
+    def _rescore_legs(self):
+        """
+        Recomputes every leg score, e.g. after the weight normalisation changed.
+        """
+        prev_lats = np.concatenate(([self.depot["lat"]], self.lats))
+        prev_lons = np.concatenate(([self.depot["lon"]], self.lons))
+        next_lats = np.concatenate((self.lats, [self.depot["lat"]]))
+        next_lons = np.concatenate((self.lons, [self.depot["lon"]]))
+        next_priorities = np.concatenate((self.priorities, [1.0]))
+        next_norms = np.concatenate((self.weights / self.max_weight, [0.0]))
+        dist = haversine_pairwise(prev_lats, prev_lons, next_lats, next_lons)
+        self.leg_scores = np.asarray(
+            objective_score(dist, next_priorities, next_norms, self.mode, self.objective), dtype=float
+        )
+
+    def _insertion_costs(self, stop):
+        """
+        Returns (delta per position, score into stop, score out of stop).
+        """
+        weight_norm = stop_weight(stop) / self.max_weight
+        into = self._leg_scores_to(stop["lat"], stop["lon"], priority_factor(stop), weight_norm)
+        out = self._leg_scores_from(stop["lat"], stop["lon"])
+        return into + out - self.leg_scores, into, out
+
+    # --------------------------------------------------------------
+    # ROUTE EDITS
+    # --------------------------------------------------------------
+    def _insert_at(self, stop, position, into, out):
+        self.stops.insert(position, stop)
+        self.lats = np.insert(self.lats, position, stop["lat"])
+        self.lons = np.insert(self.lons, position, stop["lon"])
+        self.priorities = np.insert(self.priorities, position, priority_factor(stop))
+        self.weights = np.insert(self.weights, position, stop_weight(stop))
+
+        # Leg "prev -> next" becomes "prev -> stop" and "stop -> next"
+        self.leg_scores[position] = out
+        self.leg_scores = np.insert(self.leg_scores, position, into)
+
+    def _remove_at(self, position):
+        stop = self.stops.pop(position)
+        self.lats = np.delete(self.lats, position)
+        self.lons = np.delete(self.lons, position)
+        self.priorities = np.delete(self.priorities, position)
+        self.weights = np.delete(self.weights, position)
+        self.leg_scores = np.delete(self.leg_scores, position)
+
+        # Re-score the leg that now closes the gap
+        if position < len(self.stops):
+            nxt = self.stops[position]
+            norm = stop_weight(nxt) / self.max_weight
+            lat, lon, priority = nxt["lat"], nxt["lon"], priority_factor(nxt)
+        else:
+            norm = 0.0
+            lat, lon, priority = self.depot["lat"], self.depot["lon"], 1.0
+        self.leg_scores[position] = self._leg_scores_to(lat, lon, priority, norm)[position]
+
+        return stop
+
+    def _insert_best(self, stop):
+        deltas, into, out = self._insertion_costs(stop)
+        position = int(np.argmin(deltas))
+        self._insert_at(stop, position, into[position], out[position])
+        return position, float(deltas[position])
+
+    # --------------------------------------------------------------
+    # PUBLIC API
+    # --------------------------------------------------------------
+    def add(self, record):
+        """
+        Validates a raw record and inserts it into the live route.
+        Returns the delivery dict, or None if the record was rejected.
+        """
+        started = time.perf_counter()
+
+        stop = parse_delivery(record)
+        if stop is None:
+            self.rejected += 1
+            self.emit({"event": "rejected", "record": record})
+            return None
+
+        # Weights are normalised by the heaviest parcel seen so far; when
+        # that changes, the legs already in the route are re-scored so that
+        # all scores stay on the same scale.
+        if stop["weight"] > self.max_weight:
+            self.max_weight = stop["weight"]
+            self._rescore_legs()
+        position, delta = self._insert_best(stop)
+        self.pending.append(stop)
+        self.accepted += 1
+
+        latency = time.perf_counter() - started
+        self.max_latency = max(self.max_latency, latency)
+        self.emit({
+            "event": "insert",
+            "customer": stop["customer"],
+            "position": position,
+            "delta_score": delta,
+            "route_length": len(self.stops),
+            "latency_ms": latency * 1000.0,
+        })
+
+        if len(self.pending) >= self.batch_size or time.time() - self.last_batch >= self.batch_seconds:
+            self.reoptimize()
+
+        return stop
+
+    def reoptimize(self):
+        """
+        Micro-batch repair: re-inserts every stop added since the last batch
+        at its currently cheapest position.
+        """
+        before = self.total_score()
+        moves = 0
+
+        for stop in self.pending:
+            position = next(i for i, s in enumerate(self.stops) if s is stop)
+            self._remove_at(position)
+            new_position, _ = self._insert_best(stop)
+            if new_position != position:
+                moves += 1
+
+        batch = len(self.pending)
+        self.pending = []
+        self.last_batch = time.time()
+
+        if batch:
+            self.emit({
+                "event": "reoptimize",
+                "batch": batch,
+                "moves": moves,
+                "improvement": before - self.total_score(),
+            })
+
+    def total_score(self):
+        """
+        Summed objective score of the live route, including the return leg.
+        """
+        return float(self.leg_scores.sum())
+
+    def run(self, records):
+        """
+        Consumes an iterable of raw records, then flushes the last batch.
+        """
+        for record in records:
+            self.add(record)
+        self.reoptimize()
+
+
+# --------------------------------------------------------------
+# RECORD SOURCES
+# --------------------------------------------------------------
+def follow(filepath, poll_interval=0.2, idle_timeout=None):
+    """
+    Yields complete lines of a growing file, like `tail -f`.
+    Stops after `idle_timeout` seconds without new data (None = forever).
+    """
+    with open(filepath, newline="", encoding="utf-8") as f:
+        buffer = ""
+        idle_since = time.time()
+        while True:
+            chunk = f.readline()
+            if chunk:
+                buffer += chunk
+                if buffer.endswith("\n"):
+                    yield buffer
+                    buffer = ""
+                idle_since = time.time()
+                continue
+
+            if idle_timeout is not None and time.time() - idle_since >= idle_timeout:
+                if buffer:
+                    yield buffer
+                return
+            time.sleep(poll_interval)
+
+
+def iter_jsonl(lines):
+    """
+    Yields one record per JSON line. Malformed lines are passed on as
+    {"raw": line} so that validation rejects them instead of stopping the stream.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = {"raw": line}
+        if not isinstance(record, dict):
+            record = {"raw": line}
+        yield record
+
+
+def iter_csv(lines):
+    """
+    Yields one record per CSV row; the first line is the header.
+    """
+    yield from csv.DictReader(lines)
+
+
+def detect_format(filepath):
+    """
+    'csv' for .csv files, otherwise 'jsonl'.
+    """
+    return "csv" if os.path.splitext(filepath)[1].lower() == ".csv" else "jsonl"
@@ -0,0 +1,160 @@
+# core/timewindows.py
+# Delivery time windows: arrival times along a route and a window-aware greedy planner.
+
+import math
+from math import inf
+
+import numpy as np
+
+from CourierOptimizer.core.haversine import haversine_matrix
+from CourierOptimizer.core.scoring import (
+    objective_score,
+    priority_factor,
+    stop_weight,
+    max_weight_of,
+)
+
+# Great-circle kilometres per degree of latitude (same Earth radius as haversine.py)
+KM_PER_DEGREE_LAT = 6371 * math.pi / 180
+
+# Keeps rounding in the lower bound from pruning a stop that is exactly on time
+BOUND_SLACK = 1e-9
+
+
+def has_time_windows(deliveries):
+    """
+    True if any delivery has a window_start or window_end.
+    """
+    return any("window_start" in stop or "window_end" in stop for stop in deliveries)
+
+
+def window_of(stop):
+    """
+    (start, end) of a stop's window in hours; open sides are -inf and inf.
+    """
+    start = stop.get("window_start")
+    end = stop.get("window_end")
+    return (-inf if start is None else start, inf if end is None else end)
+
+
+def arrive(clock, travel_hours, stop):
+    """
+    Arrival at `stop` when leaving the previous stop at `clock`.
+    Arriving before the window opens means waiting for it.
+
+    Returns:
+        (arrival, wait_hours, lateness_hours, departure)
+    """
+    arrival = clock + travel_hours
+    start, end = window_of(stop)
+    wait = max(0.0, start - arrival)
+    lateness = max(0.0, arrival - end)
+    return arrival, wait, lateness, arrival + wait
+
+
+# --------------------------------------------------------------
+# WINDOW-AWARE GREEDY PLANNER
+# --------------------------------------------------------------
+def plan_with_windows(deliveries, depot, mode, objective, start_time=0.0):
+    """
+    Greedy visiting order that respects delivery windows.
+
+    From the current location and clock, the next stop is the best-scoring
+    stop that can still be reached before its window closes. Waiting for a
+    window to open is scored as the distance that could have been driven
+    in that time, so a near stop that opens much later does not win.
+
+    A stop that cannot be reached in time now never can be later (the clock
+    only moves forward and distances obey the triangle inequality), so it
+    moves to the late pool for good. Candidates are kept in an index sorted
+    by window close time:
+      - stops whose window closed before the clock are cut off the front
+        with one binary search;
+      - stops that miss their window even at the north-south distance (a
+        lower bound of the great-circle distance) are dropped before the
+        full Haversine distance is computed.
+    Once no stop can be served on time, the late pool is visited best score
+    first. Every step is vectorised, O(remaining stops) in NumPy.
+
+    Returns:
+        deliveries in visiting order
+    """
+    if not deliveries:
+        return []
+
+    max_weight = max_weight_of(deliveries)
+    speed = mode.speed_kmh
+
+    lats = np.array([stop["lat"] for stop in deliveries], dtype=float)
+    lons = np.array([stop["lon"] for stop in deliveries], dtype=float)
+    priorities = np.array([priority_factor(stop) for stop in deliveries], dtype=float)
+    weight_norms = np.array([stop_weight(stop) for stop in deliveries], dtype=float) / max_weight
+    windows = np.array([window_of(stop) for stop in deliveries], dtype=float).reshape(-1, 2)
+    starts = windows[:, 0]
+    ends = windows[:, 1]
+
+    # Index of stops still reachable on time, sorted by window close time
+    pending = np.argsort(ends, kind="stable")
+    pending_ends = ends[pending]
+    late = np.empty(0, dtype=pending.dtype)
+
+    order = []
+    clock = start_time
+    current_lat = depot["lat"]
+    current_lon = depot["lon"]
+
+    while pending.size or late.size:
+        chosen = None
+
+        if pending.size:
+            # Windows already closed
+            closed = np.searchsorted(pending_ends, clock, side="left")
+            if closed:
+                late = np.concatenate((late, pending[:closed]))
+                pending = pending[closed:]
+                pending_ends = pending_ends[closed:]
+
+            # Lower bound: north-south distance only
+            bound = np.abs(lats[pending] - current_lat) * (KM_PER_DEGREE_LAT * (1 - BOUND_SLACK))
+            keep = clock + bound / speed <= pending_ends
+
+            # Exact arrival times for the rest
+            candidates = np.flatnonzero(keep)
+            stops = pending[candidates]
+            dist = haversine_matrix([current_lat], [current_lon], lats[stops], lons[stops])[0]
+            arrival = clock + dist / speed
+            on_time = arrival <= pending_ends[candidates]
+            keep[candidates[~on_time]] = False
+
+            dropped = pending[~keep]
+            if dropped.size:
+                late = np.concatenate((late, dropped))
+                pending = pending[keep]
+                pending_ends = pending_ends[keep]
+
+            if pending.size:
+                stops = stops[on_time]
+                dist = dist[on_time]
+                wait = np.maximum(starts[stops] - arrival[on_time], 0.0)
+                scores = objective_score(dist + wait * speed, priorities[stops], weight_norms[stops], mode, objective)
+                best = int(np.argmin(scores))
+                chosen = int(stops[best])
+                clock += dist[best] / speed + wait[best]
+                position = int(np.flatnonzero(pending == chosen)[0])
+                pending = np.delete(pending, position)
+                pending_ends = np.delete(pending_ends, position)
+
+        if chosen is None:
+            # Nothing can be served on time any more: best-scoring late stop first
+            dist = haversine_matrix([current_lat], [current_lon], lats[late], lons[late])[0]
+            scores = objective_score(dist, priorities[late], weight_norms[late], mode, objective)
+            best = int(np.argmin(scores))
+            chosen = int(late[best])
+            clock += dist[best] / speed
+            late = np.delete(late, best)
+
+        order.append(deliveries[chosen])
+        current_lat = lats[chosen]
+        current_lon = lons[chosen]
+
+    return order
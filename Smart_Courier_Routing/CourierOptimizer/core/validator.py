@@ -50,3 +50,45 @@ def is_valid_weight(w):
         return num >= 0
     except:
         return False
+
+
+def parse_time(value):
+    """
+    Clock time in hours: "HH:MM" (minutes 0-59, hours past 24 run into the
+    next day) or a plain number of hours >= 0.
+    Returns None if the value is not a valid time.
+    """
+    text = str(value).strip()
+    try:
+        if ":" in text:
+            hours, minutes = text.split(":")
+            hours = int(hours)
+            minutes = int(minutes)
+            if hours < 0 or not 0 <= minutes < 60:
+                return None
+            return hours + minutes / 60
+        num = float(text)
+        return num if 0 <= num < float("inf") else None
+    except:
+        return None
+
+
+def is_valid_time(value):
+    """
+    Time must be "HH:MM" or a number of hours >= 0.
+    """
+    return parse_time(value) is not None
+
+
+def is_valid_window(start, end):
+    """
+    Delivery window is optional: either side may be empty (open-ended),
+    given sides must be valid times, and start may not be after end.
+    """
+    if start and not is_valid_time(start):
+        return False
+    if end and not is_valid_time(end):
+        return False
+    if start and end:
+        return parse_time(start) <= parse_time(end)
+    return True
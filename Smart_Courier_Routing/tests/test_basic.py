@@ -3,14 +3,21 @@
 
 import os
 import math
+
+import pytest
+
 from CourierOptimizer.core.validator import (
     is_valid_name, is_valid_lat, is_valid_lon,
-    is_valid_priority, is_valid_weight
+    is_valid_priority, is_valid_weight,
+    is_valid_window, parse_time
 )
 from CourierOptimizer.core.haversine import haversine_distance
 from CourierOptimizer.core.reader import read_deliveries
+from CourierOptimizer.core import ingest
+from CourierOptimizer.core.ingest import read_deliveries_parallel
 from CourierOptimizer.core.transport import MODES
 from CourierOptimizer.core.optimizer import optimize
+from CourierOptimizer.core.timewindows import plan_with_windows
 
 
 # -----------------------------------------------------------------------------
@@ -32,6 +39,13 @@ def test_validators():
     assert is_valid_weight("4")
     assert not is_valid_weight("-3")            # negative invalid
 
+    assert parse_time("09:30") == 9.5
+    assert parse_time("14") == 14.0
+    assert parse_time("9:75") is None           # invalid minutes
+    assert is_valid_window("", "")              # window is optional
+    assert is_valid_window("08:00", "")         # open-ended
+    assert not is_valid_window("12:00", "10:00")
+
 
 # -----------------------------------------------------------------------------
 # HAVERSINE TEST
@@ -58,6 +72,71 @@ def test_reader_reads_valid_rows(tmp_path):
     assert len(rejected) == 1
 
 
+def test_reader_reads_time_windows(tmp_path):
+    sample = tmp_path / "windows.csv"
+    sample.write_text(
+        "customer,latitude,longitude,priority,weight_kg,window_start,window_end\n"
+        "Slot,59.91,10.75,High,2,09:00,10:30\n"
+        "Open,59.92,10.76,Low,1,,\n"
+        "Until,59.93,10.77,Low,1,,12\n"
+        "Reversed,59.93,10.77,Low,1,12:00,10:00\n"
+    )
+
+    valid, rejected = read_deliveries(str(sample))
+    assert [row["customer"] for row in rejected] == ["Reversed"]
+    assert (valid[0]["window_start"], valid[0]["window_end"]) == (9.0, 10.5)
+    assert "window_start" not in valid[1]
+    assert (valid[2]["window_start"], valid[2]["window_end"]) == (None, 12.0)
+    assert read_deliveries_parallel(str(sample)) == (valid, rejected)
+
+
+# -----------------------------------------------------------------------------
+# PARALLEL INGESTION TESTS
+# -----------------------------------------------------------------------------
+def _tricky_manifest(path, count):
+    lines = ["customer,latitude,longitude,priority,weight_kg"]
+    for i in range(count):
+        if i % 7 == 0:
+            lines.append(f'"Multi\nLine {i}",59.9,10.7,High,1')     # quoted newline, rejected
+        elif i % 7 == 1:
+            lines.append(f'"Quote ""{i}"" AS",59.9,10.7,Low,2')      # escaped quotes
+        elif i % 7 == 2:
+            lines.append(f'"Comma, {i}",59.9,10.7,Medium,3')
+        elif i % 7 == 3:
+            lines.append(f"Bad{i},200,10,High,1")
+        else:
+            lines.append(f"C{i},59.{i % 100:02d},10.{i % 90:02d},High,{i % 10}")
+    path.write_text("\r\n".join(lines) + "\r\n", newline="")
+
+
+def test_split_byte_ranges_respects_quoted_newlines(tmp_path):
+    sample = tmp_path / "tricky.csv"
+    _tricky_manifest(sample, 500)
+    data = sample.read_bytes()
+
+    header_end, ranges = ingest.split_byte_ranges(str(sample), 9)
+    assert len(ranges) > 1
+    assert ranges[0][0] == header_end and ranges[-1][1] == len(data)
+    for start, end in ranges:
+        chunk = data[start:end]
+        assert chunk.endswith(b"\n")
+        assert chunk.count(b'"') % 2 == 0       # never split inside a quoted field
+
+
+def test_parallel_reader_matches_read_deliveries(tmp_path, monkeypatch):
+    sample = tmp_path / "tricky.csv"
+    _tricky_manifest(sample, 500)
+    monkeypatch.setattr(ingest, "MIN_PARALLEL_BYTES", 0)
+
+    expected = read_deliveries(str(sample))
+    assert read_deliveries_parallel(str(sample), workers=3) == expected
+
+    columns, rejected = read_deliveries_parallel(str(sample), workers=3, columnar=True)
+    assert rejected == expected[1]
+    assert columns["customer"] == [row["customer"] for row in expected[0]]
+    assert columns["row"][:3].tolist() == [1, 2, 4]
+
+
 # -----------------------------------------------------------------------------
 # OPTIMIZER TEST
 # -----------------------------------------------------------------------------
@@ -96,3 +175,244 @@ def test_optimizer_objectives():
     for obj in objectives:
         route = optimize(deliveries.copy(), depot, mode, obj)
         assert route[-1]["customer"] == "RETURN_TO_DEPOT"
+
+
+# -----------------------------------------------------------------------------
+# TIME WINDOW TESTS
+# -----------------------------------------------------------------------------
+def test_optimizer_respects_time_windows():
+    deliveries = [
+        # Nearest stop, but its window opens late
+        {"customer": "Near", "lat": 59.91, "lon": 10.70, "priority": "High", "weight": 1,
+         "window_start": 12.0, "window_end": 13.0},
+        {"customer": "Early", "lat": 59.95, "lon": 10.80, "priority": "Low", "weight": 1,
+         "window_start": None, "window_end": 8.5},
+        {"customer": "Free", "lat": 59.93, "lon": 10.75, "priority": "Medium", "weight": 1},
+    ]
+    depot = {"lat": 59.90, "lon": 10.70}
+
+    route = optimize(deliveries, depot, MODES["car"], "fastest", start_time=8.0)
+
+    # Waiting four hours for Near scores like four hours of driving: served last
+    assert [stop["customer"] for stop in route][-2:] == ["Near", "RETURN_TO_DEPOT"]
+    assert route[-2]["arrival_hours"] + route[-2]["wait_hours"] == 12.0
+    assert all(stop["lateness_hours"] == 0 for stop in route)
+
+    # Totals are travel time; waiting is reported per stop beside them
+    _, _, total_time, _, _ = optimize(deliveries, depot, MODES["car"], "fastest",
+                                      return_totals=True, start_time=8.0)
+    waited = sum(stop["wait_hours"] for stop in route)
+    assert math.isclose(route[-1]["arrival_hours"], 8.0 + total_time + waited)
+
+
+def test_window_planner_reports_unavoidable_lateness():
+    deliveries = [
+        {"customer": f"S{i}", "lat": 59.90 + 0.01 * i, "lon": 10.70, "priority": "High", "weight": 1,
+         "window_start": 8.0, "window_end": 8.0 + 0.01 * i}
+        for i in range(1, 30)
+    ]
+    depot = {"lat": 59.90, "lon": 10.70}
+
+    order = plan_with_windows(deliveries, depot, MODES["walk"], "fastest", start_time=8.0)
+    assert sorted(stop["customer"] for stop in order) == sorted(stop["customer"] for stop in deliveries)
+
+    route = optimize(deliveries, depot, MODES["walk"], "fastest", start_time=8.0)
+    late = [stop for stop in route if stop["lateness_hours"] > 0]
+    assert late                                 # walking cannot keep up
+    assert all(stop["arrival_hours"] > stop["window_end"] for stop in late)
+
+
+# -----------------------------------------------------------------------------
+# EXACT SOLVER TESTS
+# -----------------------------------------------------------------------------
+def _small_manifest(n, seed=7):
+    import random
+    rng = random.Random(seed)
+    priorities = ["High", "Medium", "Low"]
+    return [
+        {
+            "customer": f"C{i}",
+            "lat": 59.90 + rng.uniform(-0.05, 0.05),
+            "lon": 10.70 + rng.uniform(-0.05, 0.05),
+            "priority": rng.choice(priorities),
+            "weight": rng.uniform(0.5, 10),
+        }
+        for i in range(n)
+    ]
+
+
+def _tour_cost(order, depot, mode, objective, deliveries):
+    from CourierOptimizer.core.exact import objective_cost_matrices
+    start, legs, back = objective_cost_matrices(deliveries, depot, mode, objective)
+    names = [stop["customer"] for stop in deliveries]
+    index = [names.index(stop["customer"]) for stop in order]
+    cost = start[index[0]] + back[index[-1]]
+    for a, b in zip(index, index[1:]):
+        cost += legs[a, b]
+    return cost
+
+
+def test_exact_matches_brute_force():
+    import itertools
+    from CourierOptimizer.core.exact import held_karp_order
+
+    deliveries = _small_manifest(6)
+    depot = {"lat": 59.90, "lon": 10.70}
+
+    for obj in ["fastest", "lowest_cost", "lowest_co2", "pareto"]:
+        mode = MODES["car"]
+        order = held_karp_order(deliveries, depot, mode, obj)
+        best = min(
+            _tour_cost(list(p), depot, mode, obj, deliveries)
+            for p in itertools.permutations(deliveries)
+        )
+        assert math.isclose(_tour_cost(order, depot, mode, obj, deliveries), best, rel_tol=1e-9)
+
+
+def test_exact_solver_route_output():
+    deliveries = _small_manifest(10)
+    depot = {"lat": 59.90, "lon": 10.70}
+    mode = MODES["bicycle"]
+
+    greedy = optimize(deliveries, depot, mode, "fastest", return_totals=True)
+    exact = optimize(deliveries, depot, mode, "fastest", return_totals=True, solver="exact")
+
+    route = exact[0]
+    assert len(route) == 11
+    assert route[-1]["customer"] == "RETURN_TO_DEPOT"
+    assert sorted(stop["customer"] for stop in route[:-1]) == sorted(d["customer"] for d in deliveries)
+    # Exact tour can never be worse than greedy on the same objective costs
+    assert (_tour_cost(route[:-1], depot, mode, "fastest", deliveries)
+            <= _tour_cost(greedy[0][:-1], depot, mode, "fastest", deliveries) + 1e-12)
+
+
+def test_exact_solver_falls_back_to_greedy():
+    from CourierOptimizer.core.exact import ExactSolverLimit, held_karp_order
+
+    deliveries = _small_manifest(8)
+    depot = {"lat": 59.90, "lon": 10.70}
+    mode = MODES["car"]
+
+    greedy = optimize(deliveries, depot, mode, "pareto")
+    fallback = optimize(deliveries, depot, mode, "pareto", solver="exact", exact_max_stops=5)
+    assert [s["customer"] for s in fallback] == [s["customer"] for s in greedy]
+
+    with pytest.raises(ExactSolverLimit):
+        held_karp_order(deliveries, depot, mode, "pareto", max_bytes=1024)
+
+
+# -----------------------------------------------------------------------------
+# STREAMING DISPATCH TESTS
+# -----------------------------------------------------------------------------
+def test_streaming_dispatch_from_jsonl_file(tmp_path):
+    import json
+    from CourierOptimizer.core.streaming import StreamingDispatcher, follow, iter_jsonl
+
+    feed = tmp_path / "orders.jsonl"
+    records = [
+        {"customer": f"C{i}", "latitude": 59.90 + 0.001 * (i % 17),
+         "longitude": 10.70 + 0.002 * (i % 11), "priority": "Medium", "weight_kg": 1}
+        for i in range(60)
+    ]
+    lines = [json.dumps(r) for r in records]
+    lines.insert(10, "not json")
+    lines.insert(20, json.dumps({"customer": "Bad", "latitude": 500, "longitude": 10,
+                                 "priority": "High", "weight_kg": 1}))
+    feed.write_text("\n".join(lines) + "\n")
+
+    events = []
+    depot = {"lat": 59.90, "lon": 10.70}
+    dispatcher = StreamingDispatcher(depot, MODES["car"], "pareto", batch_size=16, emit=events.append)
+    dispatcher.run(iter_jsonl(follow(str(feed), poll_interval=0.01, idle_timeout=0.05)))
+
+    assert dispatcher.accepted == 60
+    assert dispatcher.rejected == 2
+    assert sorted(s["customer"] for s in dispatcher.stops) == sorted(r["customer"] for r in records)
+    assert sum(e["event"] == "insert" for e in events) == 60
+    assert any(e["event"] == "reoptimize" for e in events)
+
+    # The incrementally maintained leg scores must equal a from-scratch rescore
+    from CourierOptimizer.core.exact import objective_cost_matrices
+    start, legs, back = objective_cost_matrices(dispatcher.stops, depot, MODES["car"], "pareto")
+    n = len(dispatcher.stops)
+    expected = start[0] + back[n - 1] + sum(legs[i, i + 1] for i in range(n - 1))
+    assert math.isclose(dispatcher.total_score(), expected, rel_tol=1e-9)
+
+
+def test_streaming_scores_stay_consistent_with_mixed_weights():
+    from CourierOptimizer.core.streaming import StreamingDispatcher
+    from CourierOptimizer.core.exact import objective_cost_matrices
+
+    depot = {"lat": 59.90, "lon": 10.70}
+    dispatcher = StreamingDispatcher(depot, MODES["car"], "lowest_cost", batch_size=1000)
+
+    def rescored():
+        stops = dispatcher.stops
+        start, legs, back = objective_cost_matrices(stops, depot, MODES["car"], "lowest_cost")
+        n = len(stops)
+        return start[0] + back[n - 1] + sum(legs[i, i + 1] for i in range(n - 1))
+
+    for i in range(20):
+        # A 40 kg parcel arrives mid-stream and changes the weight normalisation
+        weight = 40 if i == 10 else 1 + i % 5
+        dispatcher.add({"customer": f"C{i}", "latitude": 59.90 + 0.003 * (i % 7),
+                        "longitude": 10.70 + 0.004 * (i % 5), "priority": "Medium", "weight_kg": weight})
+        assert math.isclose(dispatcher.total_score(), rescored(), rel_tol=1e-9)
+
+    dispatcher.reoptimize()
+    assert math.isclose(dispatcher.total_score(), rescored(), rel_tol=1e-9)
+
+
+def test_streaming_cli_writes_route(tmp_path, monkeypatch, capsys):
+    from CourierOptimizer.cli.stream import run_stream
+
+    feed = tmp_path / "orders.csv"
+    feed.write_text(
+        "customer,latitude,longitude,priority,weight_kg\n"
+        "A,59.91,10.75,High,2\n"
+        "B,59.92,10.70,Low,1\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    run_stream(["--input", str(feed), "--depot-lat", "59.9", "--depot-lon", "10.7"])
+
+    out = capsys.readouterr().out
+    assert out.count('"event": "insert"') == 2
+    assert (tmp_path / "output" / "route_stream.csv").exists()
+
+
+# -----------------------------------------------------------------------------
+# METRICS TESTS
+# -----------------------------------------------------------------------------
+def test_metrics_columns_match_dict_writer(tmp_path, monkeypatch):
+    from CourierOptimizer.core.metrics_writer import (
+        MetricsRecorder, write_metrics_columns, write_metrics_csv
+    )
+
+    monkeypatch.chdir(tmp_path)
+    recorder = MetricsRecorder(5)
+    for i in range(1, 6):
+        recorder.record(i, f"Cust, {i}" if i == 2 else f"C{i}", i * 0.1, i / 3,
+                        i * 1.5, i * 1e-5, float(i), i * 120.0)
+    recorder.finish()
+
+    write_metrics_csv(recorder.rows(), "dicts.csv")
+    write_metrics_columns(recorder, "columns.csv")
+
+    output = tmp_path / "output"
+    assert (output / "columns.csv").read_bytes() == (output / "dicts.csv").read_bytes()
+
+
+def test_metrics_sampling_and_summary():
+    from CourierOptimizer.core.metrics_writer import MetricsRecorder
+
+    sampled = MetricsRecorder(10, sample_every=4)
+    summary = MetricsRecorder(10, summary_only=True)
+    for i in range(1, 11):
+        for recorder in (sampled, summary):
+            recorder.record(i, f"C{i}", 1.0, 1.0, float(i), 0.0, 0.0, 0.0)
+    sampled.finish()
+    summary.finish()
+
+    assert list(sampled.columns()["iteration"]) == [1, 5, 9, 10]
+    assert list(summary.columns()["iteration"]) == [10]
+    assert summary.columns()["cumulative_distance"][0] == 10.0